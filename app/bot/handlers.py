@@ -283,7 +283,9 @@ async def cmd_report(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
 
         # Send equity curve chart if available
         if settings.equity_curve_enabled and report.equity_points and len(report.equity_points) >= 2:
-            chart_image = telegram_service.generate_equity_curve_image(
+            # Rendering is CPU-bound; keep it off the event loop
+            chart_image = await asyncio.to_thread(
+                telegram_service.generate_equity_curve_image,
                 report.equity_points, report.date, report.chart_stats
             )
             if chart_image:
@@ -902,11 +904,7 @@ async def cmd_setfee(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
             return
 
         # Save to settings table
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            (f"fee_{exchange}_taker", str(rate), datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting(f"fee_{exchange}_taker", str(rate))
 
         await update.message.reply_text(f"✅ Updated {exchange} taker fee to {rate}%")
 
@@ -937,11 +935,7 @@ async def cmd_timezone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         tz_str = context.args[0]
         pytz.timezone(tz_str)  # Validate timezone
 
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            ("timezone", tz_str, datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting("timezone", tz_str)
 
         # Get current report time from DB to reschedule with new timezone
         cursor = await db.connection.execute(
@@ -982,11 +976,7 @@ async def cmd_reporttime(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         # Validate format
         datetime.strptime(time_str, "%H:%M")
 
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            ("daily_report_time", time_str, datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting("daily_report_time", time_str)
 
         # Apply immediately by rescheduling
         await report_service.reschedule_daily_report(time_str)
@@ -1030,10 +1020,7 @@ async def cmd_signals_channel(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         # Handle disable
         if channel_id.lower() in ("off", "disable", "none", "clear"):
-            await db.connection.execute(
-                "DELETE FROM settings WHERE key = 'signals_channel_id'"
-            )
-            await db.connection.commit()
+            await db.delete_setting("signals_channel_id")
             await update.message.reply_text("✅ Signals channel disabled")
             return
 
@@ -1059,11 +1046,7 @@ async def cmd_signals_channel(update: Update, context: ContextTypes.DEFAULT_TYPE
             return
 
         # Save to database
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            ("signals_channel_id", channel_id, datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting("signals_channel_id", channel_id)
 
         await update.message.reply_text(f"✅ Signals channel set to: {channel_id}")
 
@@ -1188,11 +1171,7 @@ async def cmd_set_capital(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 async def cmd_pause(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Pause signal processing."""
     try:
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            ("paused", "true", datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting("paused", "true")
         await update.message.reply_text("⏸️ Signal processing paused")
     except Exception as e:
         logger.error(f"Error in /pause: {e}")
@@ -1203,11 +1182,7 @@ async def cmd_pause(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 async def cmd_resume(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Resume signal processing."""
     try:
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            ("paused", "false", datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting("paused", "false")
         await update.message.reply_text("▶️ Signal processing resumed")
     except Exception as e:
         logger.error(f"Error in /resume: {e}")
@@ -1236,11 +1211,7 @@ async def cmd_ignore(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
         if pair not in ignored:
             ignored.append(pair)
 
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            ("ignored_pairs", ",".join(ignored), datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting("ignored_pairs", ",".join(ignored))
 
         await update.message.reply_text(f"🔇 Now ignoring signals for {pair}")
 
@@ -1270,11 +1241,7 @@ async def cmd_unignore(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         if pair in ignored:
             ignored.remove(pair)
 
-        await db.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            ("ignored_pairs", ",".join(ignored), datetime.now(UTC).isoformat())
-        )
-        await db.connection.commit()
+        await db.set_setting("ignored_pairs", ",".join(ignored))
 
         await update.message.reply_text(f"🔊 Resumed signals for {pair}")
 
@@ -1564,11 +1531,7 @@ async def cmd_cleanup_pyramids(update: Update, context: ContextTypes.DEFAULT_TYP
                 return
 
             # Close the trade manually (mark as closed without exit price)
-            await db.connection.execute(
-                "UPDATE trades SET status = 'closed' WHERE id = ?",
-                (trade["id"],),
-            )
-            await db.connection.commit()
+            await db.force_close_trade(trade["id"])
 
             await update.message.reply_text(
                 f"✅ Closed trade: {group_id}\n\n"
@@ -435,16 +435,11 @@ async def menu_callback_handler(update: Update, context: ContextTypes.DEFAULT_TY
             from ..database import db
             from ..config import settings
             from ..services.report_service import report_service
-            from datetime import datetime, UTC
 
             new_time = data.replace("reporttime_", "")
 
             # Save to database
-            await db.connection.execute(
-                "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-                ("daily_report_time", new_time, datetime.now(UTC).isoformat())
-            )
-            await db.connection.commit()
+            await db.set_setting("daily_report_time", new_time)
 
             # Apply immediately
             await report_service.reschedule_daily_report(new_time)
@@ -461,16 +456,11 @@ async def menu_callback_handler(update: Update, context: ContextTypes.DEFAULT_TY
             from ..database import db
             from ..config import settings
             from ..services.report_service import report_service
-            from datetime import datetime, UTC
 
             new_tz = data.replace("timezone_", "")
 
             # Save to database
-            await db.connection.execute(
-                "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-                ("timezone", new_tz, datetime.now(UTC).isoformat())
-            )
-            await db.connection.commit()
+            await db.set_setting("timezone", new_tz)
 
             # Get current report time to reschedule with new timezone
             cursor = await db.connection.execute(
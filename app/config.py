@@ -1,4 +1,5 @@
 import os
+import time
 from pathlib import Path
 from typing import Literal
 
@@ -6,6 +7,12 @@ import yaml
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+try:
+    # libyaml-backed loader, same safe subset as yaml.safe_load
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class ExchangeFees:
     """Exchange fee configuration."""
@@ -59,12 +66,20 @@ class Settings(BaseSettings):
     )
 
 
+# Quantity precisions are per-symbol constants; refresh them occasionally
+QTY_PRECISION_TTL_SECONDS = 3600
+
+
 class ExchangeConfig:
     """Exchange configuration loaded from config.yaml."""
 
     def __init__(self, config_path: str = "config.yaml"):
         self.exchanges: dict[str, ExchangeFees] = {}
         self.default_fee_type: str = "taker"
+        # (exchange, base, quote) -> (monotonic time stored, qty precision)
+        self.precisions: dict[tuple[str, str, str], tuple[float, int]] = {}
+        # (exchange, fee_type) -> fee rate, filled once the config is loaded
+        self._fee_rates: dict[tuple[str, str], float] = {}
         self._load_config(config_path)
 
     def _load_config(self, config_path: str) -> None:
@@ -74,7 +89,7 @@ class ExchangeConfig:
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
         with open(path, "r") as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YamlLoader)
 
         self.default_fee_type = config.get("default_fee_type", "taker")
 
@@ -84,18 +99,46 @@ class ExchangeConfig:
                 taker_fee=fees.get("taker_fee", 0.1),
             )
 
+        # Fees are fixed once the config is loaded, so precompute the lookups
+        self._fee_rates = {
+            (exchange_name, fee_type): fees.get_fee(fee_type)
+            for exchange_name, fees in self.exchanges.items()
+            for fee_type in ("maker", "taker")
+        }
+
     def get_exchange_fees(self, exchange: str) -> ExchangeFees | None:
         """Get fee configuration for an exchange."""
         return self.exchanges.get(exchange.lower())
 
     def get_fee_rate(self, exchange: str, fee_type: str | None = None) -> float:
         """Get fee rate for an exchange."""
+        rate = self._fee_rates.get((exchange.lower(), fee_type or self.default_fee_type))
+        if rate is not None:
+            return rate
+
         fees = self.get_exchange_fees(exchange)
         if not fees:
             return 0.001  # Default 0.1% if exchange not found
 
         return fees.get_fee(fee_type or self.default_fee_type)
 
+    def get_qty_precision(self, exchange: str, base: str, quote: str) -> int | None:
+        """Get the known quantity precision for a symbol, or None if not known yet."""
+        entry = self.precisions.get((exchange.lower(), base.upper(), quote.upper()))
+        return entry[1] if entry else None
+
+    def set_qty_precision(
+        self, exchange: str, base: str, quote: str, precision: int
+    ) -> None:
+        """Remember the quantity precision for a symbol."""
+        key = (exchange.lower(), base.upper(), quote.upper())
+        self.precisions[key] = (time.monotonic(), precision)
+
+    def is_qty_precision_stale(self, exchange: str, base: str, quote: str) -> bool:
+        """Check whether a known quantity precision is due for a refresh."""
+        entry = self.precisions.get((exchange.lower(), base.upper(), quote.upper()))
+        return entry is None or time.monotonic() - entry[0] >= QTY_PRECISION_TTL_SECONDS
+
 
 # Global instances
 settings = Settings()
@@ -1,6 +1,9 @@
+import asyncio
+
 import aiosqlite
 import pytz
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, UTC, timedelta
 from typing import AsyncGenerator
 
@@ -150,6 +153,10 @@ CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status);
 CREATE INDEX IF NOT EXISTS idx_trades_exchange ON trades(exchange);
 CREATE INDEX IF NOT EXISTS idx_trades_group_id ON trades(group_id);
 CREATE INDEX IF NOT EXISTS idx_trades_timeframe ON trades(timeframe);
+-- Covers the closed-trade period queries (PnL sums, best/worst pairs) so they
+-- never touch the table rows
+CREATE INDEX IF NOT EXISTS idx_trades_closed_period
+ON trades(status, closed_at, base, quote, total_pnl_usdt);
 CREATE INDEX IF NOT EXISTS idx_pyramids_trade_id ON pyramids(trade_id);
 CREATE INDEX IF NOT EXISTS idx_symbol_rules_exchange ON symbol_rules(exchange);
 
@@ -176,18 +183,77 @@ ALTER TABLE exits ADD COLUMN received_timestamp TEXT;
 """
 
 
+# Statements on the per-signal webhook path. Kept as fixed strings so the
+# connection's statement cache (keyed on SQL text) reuses the compiled plan.
+_STMTS = {
+    "mark_alert_processed": (
+        "INSERT OR IGNORE INTO processed_alerts (alert_id, processed_at) VALUES (?, ?)"
+    ),
+    "close_trade": """
+        UPDATE trades
+        SET status = 'closed', closed_at = ?, total_pnl_usdt = ?, total_pnl_percent = ?
+        WHERE id = ?
+    """,
+    "add_pyramid": """
+        INSERT INTO pyramids
+        (id, trade_id, pyramid_index, entry_price, position_size, capital_usdt,
+         entry_time, fee_rate, fee_usdt, exchange_timestamp, received_timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "get_pyramids_for_trade": (
+        "SELECT * FROM pyramids WHERE trade_id = ? ORDER BY pyramid_index"
+    ),
+    "update_pyramid_pnl": "UPDATE pyramids SET pnl_usdt = ?, pnl_percent = ? WHERE id = ?",
+    "add_exit": """
+        INSERT OR IGNORE INTO exits (id, trade_id, exit_price, exit_time, fee_usdt,
+                           exchange_timestamp, received_timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "get_open_trade_with_pyramid_count": """
+        SELECT t.*,
+               (SELECT COUNT(*) FROM pyramids p WHERE p.trade_id = t.id) AS pyramid_count
+        FROM trades t
+        WHERE t.exchange = ? AND t.base = ? AND t.quote = ? AND t.timeframe = ?
+          AND t.status = 'open'
+        ORDER BY t.created_at DESC LIMIT 1
+    """,
+}
+
+# Per-connection compiled statement cache size (sqlite3 default is 128)
+_STATEMENT_CACHE_SIZE = 256
+
+# Max period aggregate results kept between writes
+_QUERY_CACHE_SIZE = 128
+
+# Database whose write lock the current task holds. Task-local, so a write
+# from one task never joins another task's open transaction.
+_lock_holder: ContextVar["Database | None"] = ContextVar("db_lock_holder", default=None)
+
+
 class Database:
     """Async SQLite database handler."""
 
     def __init__(self, db_path: str | None = None):
         self.db_path = db_path or settings.database_path
         self._connection: aiosqlite.Connection | None = None
+        self._tx_lock = asyncio.Lock()
+        # Period aggregate results, valid while total_changes is unchanged
+        self._query_cache: dict[tuple, object] = {}
+        self._query_cache_version = -1
 
     async def connect(self) -> None:
         """Connect to the database and initialize schema."""
-        ensure_data_directory()
-        self._connection = await aiosqlite.connect(self.db_path)
+        # In-memory databases have no file, so no directory to create
+        if self.db_path != ":memory:":
+            ensure_data_directory()
+        self._connection = await aiosqlite.connect(
+            self.db_path, cached_statements=_STATEMENT_CACHE_SIZE
+        )
         self._connection.row_factory = aiosqlite.Row
+        # WAL lets readers run during writes; NORMAL skips the per-commit fsync
+        # of the WAL (still durable across application crashes)
+        await self._connection.execute("PRAGMA journal_mode=WAL")
+        await self._connection.execute("PRAGMA synchronous=NORMAL")
         await self._connection.executescript(SCHEMA)
         await self._connection.commit()
         # Run migrations for existing databases
@@ -264,13 +330,77 @@ class Database:
 
     @asynccontextmanager
     async def transaction(self) -> AsyncGenerator[aiosqlite.Connection, None]:
-        """Context manager for database transactions."""
-        try:
+        """
+        Context manager for database transactions.
+
+        Opens one BEGIN IMMEDIATE transaction under the write lock; Database
+        write methods called from the same task join it, so everything commits
+        (or rolls back) together at the end of the block. Nested blocks in the
+        same task join the outer transaction.
+        """
+        if _lock_holder.get() is self:
             yield self.connection
-            await self.connection.commit()
-        except Exception:
-            await self.connection.rollback()
-            raise
+            return
+        async with self._tx_lock:
+            token = _lock_holder.set(self)
+            try:
+                if not self.connection.in_transaction:
+                    await self.connection.execute("BEGIN IMMEDIATE")
+                yield self.connection
+                await self.connection.commit()
+            except BaseException:
+                await self.connection.rollback()
+                raise
+            finally:
+                _lock_holder.reset(token)
+
+    @asynccontextmanager
+    async def _write(self) -> AsyncGenerator[None, None]:
+        """
+        Run a write method's statements under the write lock and commit them.
+
+        Inside this task's transaction() block the statements join that
+        transaction instead, and it commits for us.
+        """
+        if _lock_holder.get() is self:
+            yield
+            return
+        async with self._tx_lock:
+            token = _lock_holder.set(self)
+            try:
+                yield
+                await self.connection.commit()
+            except BaseException:
+                await self.connection.rollback()
+                raise
+            finally:
+                _lock_holder.reset(token)
+
+    def _cache_get(self, key: tuple):
+        """
+        Return a cached period aggregate, or None on a miss.
+
+        Entries are tied to the connection's total_changes counter, which every
+        INSERT/UPDATE/DELETE on this connection bumps (including writes issued
+        directly on db.connection), so any write empties the cache. Reads inside
+        an open transaction bypass it, since a rollback could undo what they saw.
+        """
+        if self.connection.in_transaction:
+            return None
+        version = self.connection.total_changes
+        if version != self._query_cache_version:
+            self._query_cache.clear()
+            self._query_cache_version = version
+            return None
+        return self._query_cache.get(key)
+
+    def _cache_put(self, key: tuple, value) -> None:
+        """Remember a period aggregate read outside any transaction."""
+        if self.connection.in_transaction:
+            return
+        if len(self._query_cache) >= _QUERY_CACHE_SIZE:
+            self._query_cache.clear()
+        self._query_cache[key] = value
 
     # Alert idempotency methods
     async def is_alert_processed(self, alert_id: str) -> bool:
@@ -282,11 +412,20 @@ class Database:
 
     async def mark_alert_processed(self, alert_id: str) -> None:
         """Mark an alert as processed."""
-        await self.connection.execute(
-            "INSERT OR IGNORE INTO processed_alerts (alert_id, processed_at) VALUES (?, ?)",
-            (alert_id, datetime.now(UTC).isoformat()),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                _STMTS["mark_alert_processed"],
+                (alert_id, datetime.now(UTC).isoformat()),
+            )
+
+    async def mark_alerts_processed(self, alert_ids: list[str]) -> None:
+        """Mark several alerts as processed in one statement batch."""
+        processed_at = datetime.now(UTC).isoformat()
+        async with self._write():
+            await self.connection.executemany(
+                _STMTS["mark_alert_processed"],
+                [(alert_id, processed_at) for alert_id in alert_ids],
+            )
 
     # Trade methods
     async def get_open_trade(self, exchange: str, base: str, quote: str) -> dict | None:
@@ -306,28 +445,31 @@ class Database:
         self, trade_id: str, exchange: str, base: str, quote: str
     ) -> None:
         """Create a new trade."""
-        await self.connection.execute(
-            """
-            INSERT INTO trades (id, exchange, base, quote, status, created_at)
-            VALUES (?, ?, ?, ?, 'open', ?)
-            """,
-            (trade_id, exchange, base, quote, datetime.now(UTC).isoformat()),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                """
+                INSERT INTO trades (id, exchange, base, quote, status, created_at)
+                VALUES (?, ?, ?, ?, 'open', ?)
+                """,
+                (trade_id, exchange, base, quote, datetime.now(UTC).isoformat()),
+            )
 
     async def close_trade(
         self, trade_id: str, total_pnl_usdt: float, total_pnl_percent: float
     ) -> None:
         """Close a trade with final PnL."""
-        await self.connection.execute(
-            """
-            UPDATE trades
-            SET status = 'closed', closed_at = ?, total_pnl_usdt = ?, total_pnl_percent = ?
-            WHERE id = ?
-            """,
-            (datetime.now(UTC).isoformat(), total_pnl_usdt, total_pnl_percent, trade_id),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                _STMTS["close_trade"],
+                (datetime.now(UTC).isoformat(), total_pnl_usdt, total_pnl_percent, trade_id),
+            )
+
+    async def force_close_trade(self, trade_id: str) -> None:
+        """Mark a trade closed without recording an exit or PnL."""
+        async with self._write():
+            await self.connection.execute(
+                "UPDATE trades SET status = 'closed' WHERE id = ?", (trade_id,)
+            )
 
     async def get_trade_with_pyramids(self, trade_id: str) -> dict | None:
         """Get a trade with all its pyramids."""
@@ -339,8 +481,7 @@ class Database:
             return None
 
         cursor = await self.connection.execute(
-            "SELECT * FROM pyramids WHERE trade_id = ? ORDER BY pyramid_index",
-            (trade_id,),
+            _STMTS["get_pyramids_for_trade"], (trade_id,)
         )
         pyramids = await cursor.fetchall()
 
@@ -370,34 +511,48 @@ class Database:
         received_timestamp: str | None = None,
     ) -> None:
         """Add a pyramid to a trade."""
-        await self.connection.execute(
-            """
-            INSERT INTO pyramids
-            (id, trade_id, pyramid_index, entry_price, position_size, capital_usdt,
-             entry_time, fee_rate, fee_usdt, exchange_timestamp, received_timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                pyramid_id,
-                trade_id,
-                pyramid_index,
-                entry_price,
-                position_size,
-                capital_usdt,
-                datetime.now(UTC).isoformat(),
-                fee_rate,
-                fee_usdt,
-                exchange_timestamp,
-                received_timestamp or datetime.now(UTC).isoformat(),
-            ),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                _STMTS["add_pyramid"],
+                (
+                    pyramid_id,
+                    trade_id,
+                    pyramid_index,
+                    entry_price,
+                    position_size,
+                    capital_usdt,
+                    datetime.now(UTC).isoformat(),
+                    fee_rate,
+                    fee_usdt,
+                    exchange_timestamp,
+                    received_timestamp or datetime.now(UTC).isoformat(),
+                ),
+            )
+
+    async def add_pyramids_bulk(
+        self, rows: list[tuple[str, str, int, float, float, float, float, float]]
+    ) -> None:
+        """
+        Add several pyramids in one transaction.
+
+        Args:
+            rows: (pyramid_id, trade_id, pyramid_index, entry_price,
+                position_size, capital_usdt, fee_rate, fee_usdt) tuples
+        """
+        now = datetime.now(UTC).isoformat()
+        async with self._write():
+            await self.connection.executemany(
+                _STMTS["add_pyramid"],
+                [
+                    (pid, tid, idx, price, size, capital, now, rate, fee, None, now)
+                    for pid, tid, idx, price, size, capital, rate, fee in rows
+                ],
+            )
 
     async def get_pyramids_for_trade(self, trade_id: str) -> list[dict]:
         """Get all pyramids for a trade."""
         cursor = await self.connection.execute(
-            "SELECT * FROM pyramids WHERE trade_id = ? ORDER BY pyramid_index",
-            (trade_id,),
+            _STMTS["get_pyramids_for_trade"], (trade_id,)
         )
         rows = await cursor.fetchall()
         return [dict(row) for row in rows]
@@ -406,11 +561,22 @@ class Database:
         self, pyramid_id: str, pnl_usdt: float, pnl_percent: float
     ) -> None:
         """Update pyramid PnL after exit."""
-        await self.connection.execute(
-            "UPDATE pyramids SET pnl_usdt = ?, pnl_percent = ? WHERE id = ?",
-            (pnl_usdt, pnl_percent, pyramid_id),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                _STMTS["update_pyramid_pnl"], (pnl_usdt, pnl_percent, pyramid_id)
+            )
+
+    async def update_pyramid_pnl_bulk(
+        self, rows: list[tuple[float, float, str]]
+    ) -> None:
+        """
+        Update PnL for several pyramids in one transaction.
+
+        Args:
+            rows: (pnl_usdt, pnl_percent, pyramid_id) tuples
+        """
+        async with self._write():
+            await self.connection.executemany(_STMTS["update_pyramid_pnl"], rows)
 
     # Exit methods
     async def has_exit(self, trade_id: str) -> bool:
@@ -435,23 +601,19 @@ class Database:
         Returns True if exit was added, False if it already existed (race condition).
         Uses INSERT OR IGNORE to handle concurrent requests atomically.
         """
-        cursor = await self.connection.execute(
-            """
-            INSERT OR IGNORE INTO exits (id, trade_id, exit_price, exit_time, fee_usdt,
-                               exchange_timestamp, received_timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                exit_id,
-                trade_id,
-                exit_price,
-                datetime.now(UTC).isoformat(),
-                fee_usdt,
-                exchange_timestamp,
-                received_timestamp or datetime.now(UTC).isoformat(),
-            ),
-        )
-        await self.connection.commit()
+        async with self._write():
+            cursor = await self.connection.execute(
+                _STMTS["add_exit"],
+                (
+                    exit_id,
+                    trade_id,
+                    exit_price,
+                    datetime.now(UTC).isoformat(),
+                    fee_usdt,
+                    exchange_timestamp,
+                    received_timestamp or datetime.now(UTC).isoformat(),
+                ),
+            )
         # rowcount is 0 if INSERT was ignored (exit already existed)
         return cursor.rowcount > 0
 
@@ -482,26 +644,26 @@ class Database:
         tick_size: float,
     ) -> None:
         """Insert or update symbol rules."""
-        await self.connection.execute(
-            """
-            INSERT OR REPLACE INTO symbol_rules
-            (exchange, base, quote, price_precision, qty_precision, min_qty,
-             min_notional, tick_size, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                exchange,
-                base,
-                quote,
-                price_precision,
-                qty_precision,
-                min_qty,
-                min_notional,
-                tick_size,
-                datetime.now(UTC).isoformat(),
-            ),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                """
+                INSERT OR REPLACE INTO symbol_rules
+                (exchange, base, quote, price_precision, qty_precision, min_qty,
+                 min_notional, tick_size, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    exchange,
+                    base,
+                    quote,
+                    price_precision,
+                    qty_precision,
+                    min_qty,
+                    min_notional,
+                    tick_size,
+                    datetime.now(UTC).isoformat(),
+                ),
+            )
 
     # Report methods
     async def get_trades_for_date(self, date: str) -> list[dict]:
@@ -665,38 +827,74 @@ class Database:
 
     # =========== Period-Based Query Methods ===========
 
-    async def get_realized_pnl_for_period(
+    async def get_period_aggregates(
         self, start_date: str | None, end_date: str | None
-    ) -> tuple[float, int]:
+    ) -> dict:
         """
-        Get realized PnL and trade count for a date range (in configured timezone).
+        Get closed-trade PnL aggregates for a date range in a single scan.
 
         Args:
             start_date: Start date (YYYY-MM-DD) or None for all-time
             end_date: End date (YYYY-MM-DD) or None for all-time
 
         Returns:
-            Tuple of (total_pnl, trade_count)
+            Dict with total_pnl, total_trades, win_count, loss_count,
+            win_sum, loss_sum, best_trade and worst_trade
         """
-        if start_date and end_date:
-            start_utc, end_utc = get_period_boundaries(start_date, end_date)
+        bounds = (
+            get_period_boundaries(start_date, end_date)
+            if start_date and end_date
+            else None
+        )
+        key = ("aggregates", bounds)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return dict(cached)
+
+        # A NULL PnL counts as a flat (0) trade, so every aggregate sees the
+        # same rows as COUNT(*)
+        columns = """
+            SELECT COALESCE(SUM(pnl), 0.0) as total_pnl,
+                   COUNT(*) as total_trades,
+                   COALESCE(SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END), 0) as win_count,
+                   COALESCE(SUM(CASE WHEN pnl < 0 THEN 1 ELSE 0 END), 0) as loss_count,
+                   COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl END), 0.0) as win_sum,
+                   COALESCE(SUM(CASE WHEN pnl < 0 THEN pnl END), 0.0) as loss_sum,
+                   COALESCE(MAX(pnl), 0.0) as best_trade,
+                   COALESCE(MIN(pnl), 0.0) as worst_trade
+            FROM (SELECT COALESCE(total_pnl_usdt, 0.0) as pnl FROM trades
+        """
+        if bounds:
             cursor = await self.connection.execute(
-                """
-                SELECT COALESCE(SUM(total_pnl_usdt), 0) as pnl, COUNT(*) as count
-                FROM trades
-                WHERE status = 'closed' AND closed_at >= ? AND closed_at < ?
-                """,
-                (start_utc, end_utc),
+                columns
+                + "WHERE status = 'closed' AND closed_at >= ? AND closed_at < ?)",
+                bounds,
             )
         else:
             cursor = await self.connection.execute(
-                """
-                SELECT COALESCE(SUM(total_pnl_usdt), 0) as pnl, COUNT(*) as count
-                FROM trades WHERE status = 'closed'
-                """
+                columns + "WHERE status = 'closed')"
             )
         row = await cursor.fetchone()
-        return (row["pnl"] or 0.0, row["count"] or 0) if row else (0.0, 0)
+        aggregates = dict(row)
+
+        self._cache_put(key, aggregates)
+        return dict(aggregates)
+
+    async def get_realized_pnl_for_period(
+        self, start_date: str | None, end_date: str | None
+    ) -> tuple[float, int]:
+        """
+        Get realized PnL and trade count for a date range (in configured timezone).
+
+        Args:
+            start_date: Start date (YYYY-MM-DD) or None for all-time
+            end_date: End date (YYYY-MM-DD) or None for all-time
+
+        Returns:
+            Tuple of (total_pnl, trade_count)
+        """
+        agg = await self.get_period_aggregates(start_date, end_date)
+        return agg["total_pnl"], agg["total_trades"]
 
     async def get_statistics_for_period(
         self, start_date: str | None, end_date: str | None
@@ -711,24 +909,10 @@ class Database:
         Returns:
             Dict with statistics: total_trades, win_rate, total_pnl, etc.
         """
-        if start_date and end_date:
-            start_utc, end_utc = get_period_boundaries(start_date, end_date)
-            cursor = await self.connection.execute(
-                """
-                SELECT total_pnl_usdt FROM trades
-                WHERE status = 'closed' AND closed_at >= ? AND closed_at < ?
-                """,
-                (start_utc, end_utc),
-            )
-        else:
-            cursor = await self.connection.execute(
-                "SELECT total_pnl_usdt FROM trades WHERE status = 'closed'"
-            )
+        agg = await self.get_period_aggregates(start_date, end_date)
+        total_trades = agg["total_trades"]
 
-        rows = await cursor.fetchall()
-        pnls = [row["total_pnl_usdt"] or 0 for row in rows]
-
-        if not pnls:
+        if not total_trades:
             return {
                 "total_trades": 0,
                 "win_rate": 0.0,
@@ -741,29 +925,38 @@ class Database:
                 "avg_trade": 0.0,
             }
 
-        wins = [p for p in pnls if p > 0]
-        losses = [p for p in pnls if p < 0]
-        total_wins = sum(wins) if wins else 0
-        total_losses = abs(sum(losses)) if losses else 0
+        wins = agg["win_count"]
+        losses = agg["loss_count"]
+        total_wins = agg["win_sum"]
+        total_losses = abs(agg["loss_sum"])
 
         return {
-            "total_trades": len(pnls),
-            "win_rate": (len(wins) / len(pnls) * 100) if pnls else 0,
-            "total_pnl": sum(pnls),
-            "avg_win": (total_wins / len(wins)) if wins else 0,
-            "avg_loss": (sum(losses) / len(losses)) if losses else 0,
-            "best_trade": max(pnls) if pnls else 0,
-            "worst_trade": min(pnls) if pnls else 0,
+            "total_trades": total_trades,
+            "win_rate": wins / total_trades * 100,
+            "total_pnl": agg["total_pnl"],
+            "avg_win": (total_wins / wins) if wins else 0,
+            "avg_loss": (agg["loss_sum"] / losses) if losses else 0,
+            "best_trade": agg["best_trade"],
+            "worst_trade": agg["worst_trade"],
             "profit_factor": (total_wins / total_losses) if total_losses > 0 else total_wins,
-            "avg_trade": (sum(pnls) / len(pnls)) if pnls else 0,
+            "avg_trade": agg["total_pnl"] / total_trades,
         }
 
     async def get_best_pairs_for_period(
         self, start_date: str | None, end_date: str | None, limit: int = 5
     ) -> list[dict]:
         """Get top profitable pairs for a date range (in configured timezone)."""
-        if start_date and end_date:
-            start_utc, end_utc = get_period_boundaries(start_date, end_date)
+        bounds = (
+            get_period_boundaries(start_date, end_date)
+            if start_date and end_date
+            else None
+        )
+        key = ("best_pairs", bounds, limit)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return [dict(pair) for pair in cached]
+
+        if bounds:
             cursor = await self.connection.execute(
                 """
                 SELECT base || '/' || quote as pair,
@@ -775,7 +968,7 @@ class Database:
                 ORDER BY pnl DESC
                 LIMIT ?
                 """,
-                (start_utc, end_utc, limit),
+                (*bounds, limit),
             )
         else:
             cursor = await self.connection.execute(
@@ -791,14 +984,25 @@ class Database:
                 (limit,),
             )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        pairs = [dict(row) for row in rows]
+        self._cache_put(key, pairs)
+        return [dict(pair) for pair in pairs]
 
     async def get_worst_pairs_for_period(
         self, start_date: str | None, end_date: str | None, limit: int = 5
     ) -> list[dict]:
         """Get top losing pairs for a date range (in configured timezone)."""
-        if start_date and end_date:
-            start_utc, end_utc = get_period_boundaries(start_date, end_date)
+        bounds = (
+            get_period_boundaries(start_date, end_date)
+            if start_date and end_date
+            else None
+        )
+        key = ("worst_pairs", bounds, limit)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return [dict(pair) for pair in cached]
+
+        if bounds:
             cursor = await self.connection.execute(
                 """
                 SELECT base || '/' || quote as pair,
@@ -810,7 +1014,7 @@ class Database:
                 ORDER BY pnl ASC
                 LIMIT ?
                 """,
-                (start_utc, end_utc, limit),
+                (*bounds, limit),
             )
         else:
             cursor = await self.connection.execute(
@@ -826,7 +1030,9 @@ class Database:
                 (limit,),
             )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        pairs = [dict(row) for row in rows]
+        self._cache_put(key, pairs)
+        return [dict(pair) for pair in pairs]
 
     async def get_trades_for_period(
         self, start_date: str | None, end_date: str | None, limit: int = 50
@@ -1084,22 +1290,22 @@ class Database:
         report_json: str,
     ) -> None:
         """Save daily report."""
-        await self.connection.execute(
-            """
-            INSERT OR REPLACE INTO daily_reports
-            (date, total_trades, total_pyramids, total_pnl_usdt, report_json, sent_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                date,
-                total_trades,
-                total_pyramids,
-                total_pnl_usdt,
-                report_json,
-                datetime.now(UTC).isoformat(),
-            ),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                """
+                INSERT OR REPLACE INTO daily_reports
+                (date, total_trades, total_pyramids, total_pnl_usdt, report_json, sent_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    date,
+                    total_trades,
+                    total_pyramids,
+                    total_pnl_usdt,
+                    report_json,
+                    datetime.now(UTC).isoformat(),
+                ),
+            )
 
     # Utility methods
     async def get_recent_trades(self, limit: int = 50) -> list[dict]:
@@ -1121,11 +1327,16 @@ class Database:
 
     async def set_setting(self, key: str, value: str) -> None:
         """Set a setting value."""
-        await self.connection.execute(
-            "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-            (key, value, datetime.now(UTC).isoformat()),
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, value, datetime.now(UTC).isoformat()),
+            )
+
+    async def delete_setting(self, key: str) -> None:
+        """Remove a setting."""
+        async with self._write():
+            await self.connection.execute("DELETE FROM settings WHERE key = ?", (key,))
 
     async def is_paused(self) -> bool:
         """Check if signal processing is paused."""
@@ -1145,38 +1356,37 @@ class Database:
         self, base: str, exchange: str, timeframe: str
     ) -> int:
         """Get and increment the next sequence number for a pyramid group."""
-        cursor = await self.connection.execute(
-            """
-            SELECT next_sequence FROM pyramid_group_sequences
-            WHERE base = ? AND exchange = ? AND timeframe = ?
-            """,
-            (base, exchange, timeframe),
-        )
-        row = await cursor.fetchone()
-
-        if row:
-            seq = row["next_sequence"]
-            # Increment for next use
-            await self.connection.execute(
+        async with self._write():
+            cursor = await self.connection.execute(
                 """
-                UPDATE pyramid_group_sequences
-                SET next_sequence = ?, updated_at = ?
+                SELECT next_sequence FROM pyramid_group_sequences
                 WHERE base = ? AND exchange = ? AND timeframe = ?
                 """,
-                (seq + 1, datetime.now(UTC).isoformat(), base, exchange, timeframe),
+                (base, exchange, timeframe),
             )
-        else:
-            seq = 1
-            await self.connection.execute(
-                """
-                INSERT INTO pyramid_group_sequences
-                (base, exchange, timeframe, next_sequence, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (base, exchange, timeframe, 2, datetime.now(UTC).isoformat()),
-            )
-
-        await self.connection.commit()
+            row = await cursor.fetchone()
+
+            if row:
+                seq = row["next_sequence"]
+                # Increment for next use
+                await self.connection.execute(
+                    """
+                    UPDATE pyramid_group_sequences
+                    SET next_sequence = ?, updated_at = ?
+                    WHERE base = ? AND exchange = ? AND timeframe = ?
+                    """,
+                    (seq + 1, datetime.now(UTC).isoformat(), base, exchange, timeframe),
+                )
+            else:
+                seq = 1
+                await self.connection.execute(
+                    """
+                    INSERT INTO pyramid_group_sequences
+                    (base, exchange, timeframe, next_sequence, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (base, exchange, timeframe, 2, datetime.now(UTC).isoformat()),
+                )
         return seq
 
     async def get_open_trade_by_group(
@@ -1194,6 +1404,17 @@ class Database:
         row = await cursor.fetchone()
         return dict(row) if row else None
 
+    async def get_open_trade_with_pyramid_count(
+        self, exchange: str, base: str, quote: str, timeframe: str
+    ) -> dict | None:
+        """Get an open trade by exchange, symbol, and timeframe, with its pyramid_count."""
+        cursor = await self.connection.execute(
+            _STMTS["get_open_trade_with_pyramid_count"],
+            (exchange, base, quote, timeframe),
+        )
+        row = await cursor.fetchone()
+        return dict(row) if row else None
+
     async def create_trade_with_group(
         self,
         trade_id: str,
@@ -1203,26 +1424,35 @@ class Database:
         quote: str,
         timeframe: str,
         position_side: str = "long",
-    ) -> None:
-        """Create a new trade with group ID and timeframe."""
-        await self.connection.execute(
-            """
-            INSERT INTO trades (id, group_id, exchange, base, quote, timeframe,
-                                position_side, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, 'open', ?)
-            """,
-            (
-                trade_id,
-                group_id,
-                exchange,
-                base,
-                quote,
-                timeframe,
-                position_side,
-                datetime.now(UTC).isoformat(),
-            ),
-        )
-        await self.connection.commit()
+    ) -> bool:
+        """
+        Create a new trade with group ID and timeframe.
+
+        Returns True if the trade was created, False if an open trade for the
+        same exchange/pair/timeframe already exists (race condition).
+        """
+        async with self._write():
+            cursor = await self.connection.execute(
+                """
+                INSERT INTO trades (id, group_id, exchange, base, quote, timeframe,
+                                    position_side, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'open', ?)
+                ON CONFLICT (exchange, base, quote, timeframe) WHERE status = 'open'
+                DO NOTHING
+                """,
+                (
+                    trade_id,
+                    group_id,
+                    exchange,
+                    base,
+                    quote,
+                    timeframe,
+                    position_side,
+                    datetime.now(UTC).isoformat(),
+                ),
+            )
+        # rowcount is 0 if the open-trade unique index swallowed the INSERT
+        return cursor.rowcount > 0
 
     # Capital setting methods (per exchange/pair/timeframe/pyramid)
     # Global default capital when no specific setting exists
@@ -1292,86 +1522,87 @@ class Database:
 
         key = self._make_capital_key(exchange, base, quote, timeframe, pyramid_index)
 
-        value = await self.get_setting("pyramid_capitals")
-        if value:
-            try:
-                capitals = json.loads(value)
-            except json.JSONDecodeError:
+        # Hold the write lock across the read-modify-write of the JSON blob
+        async with self._write():
+            value = await self.get_setting("pyramid_capitals")
+            if value:
+                try:
+                    capitals = json.loads(value)
+                except json.JSONDecodeError:
+                    capitals = {}
+            else:
                 capitals = {}
-        else:
-            capitals = {}
 
-        if capital is None:
-            capitals.pop(key, None)
-        else:
-            capitals[key] = capital
+            if capital is None:
+                capitals.pop(key, None)
+            else:
+                capitals[key] = capital
 
-        if capitals:
-            await self.set_setting("pyramid_capitals", json.dumps(capitals))
-        else:
-            await self.connection.execute(
-                "DELETE FROM settings WHERE key = 'pyramid_capitals'"
-            )
-            await self.connection.commit()
+            if capitals:
+                await self.set_setting("pyramid_capitals", json.dumps(capitals))
+            else:
+                await self.connection.execute(
+                    "DELETE FROM settings WHERE key = 'pyramid_capitals'"
+                )
 
         return key
 
     async def clear_all_pyramid_capitals(self) -> None:
         """Clear all pyramid capital settings."""
-        await self.connection.execute(
-            "DELETE FROM settings WHERE key = 'pyramid_capitals'"
-        )
-        await self.connection.commit()
+        async with self._write():
+            await self.connection.execute(
+                "DELETE FROM settings WHERE key = 'pyramid_capitals'"
+            )
 
     # =========== Data Reset Methods ===========
 
     async def reset_trades(self) -> dict:
         """Clear all trade data (trades, pyramids, exits, sequences)."""
-        counts = {}
+        async with self._write():
+            counts = {}
 
-        # Count before deletion
-        cursor = await self.connection.execute("SELECT COUNT(*) FROM trades")
-        counts["trades"] = (await cursor.fetchone())[0]
+            # Count before deletion
+            cursor = await self.connection.execute("SELECT COUNT(*) FROM trades")
+            counts["trades"] = (await cursor.fetchone())[0]
 
-        cursor = await self.connection.execute("SELECT COUNT(*) FROM pyramids")
-        counts["pyramids"] = (await cursor.fetchone())[0]
+            cursor = await self.connection.execute("SELECT COUNT(*) FROM pyramids")
+            counts["pyramids"] = (await cursor.fetchone())[0]
 
-        cursor = await self.connection.execute("SELECT COUNT(*) FROM exits")
-        counts["exits"] = (await cursor.fetchone())[0]
+            cursor = await self.connection.execute("SELECT COUNT(*) FROM exits")
+            counts["exits"] = (await cursor.fetchone())[0]
 
-        # Delete in order (child tables first)
-        await self.connection.execute("DELETE FROM pyramids")
-        await self.connection.execute("DELETE FROM exits")
-        await self.connection.execute("DELETE FROM trades")
-        await self.connection.execute("DELETE FROM pyramid_group_sequences")
-        await self.connection.execute("DELETE FROM processed_alerts")
-        await self.connection.commit()
+            # Delete in order (child tables first)
+            await self.connection.execute("DELETE FROM pyramids")
+            await self.connection.execute("DELETE FROM exits")
+            await self.connection.execute("DELETE FROM trades")
+            await self.connection.execute("DELETE FROM pyramid_group_sequences")
+            await self.connection.execute("DELETE FROM processed_alerts")
 
         return counts
 
     async def reset_settings(self) -> dict:
         """Clear all settings (capital configs, etc.)."""
-        cursor = await self.connection.execute("SELECT COUNT(*) FROM settings")
-        count = (await cursor.fetchone())[0]
+        async with self._write():
+            cursor = await self.connection.execute("SELECT COUNT(*) FROM settings")
+            count = (await cursor.fetchone())[0]
 
-        await self.connection.execute("DELETE FROM settings")
-        await self.connection.commit()
+            await self.connection.execute("DELETE FROM settings")
 
         return {"settings": count}
 
     async def reset_cache(self) -> dict:
         """Clear cached data (symbol rules, daily reports)."""
-        counts = {}
+        async with self._write():
+            counts = {}
 
-        cursor = await self.connection.execute("SELECT COUNT(*) FROM symbol_rules")
-        counts["symbol_rules"] = (await cursor.fetchone())[0]
+            cursor = await self.connection.execute("SELECT COUNT(*) FROM symbol_rules")
+            counts["symbol_rules"] = (await cursor.fetchone())[0]
 
-        cursor = await self.connection.execute("SELECT COUNT(*) FROM daily_reports")
-        counts["daily_reports"] = (await cursor.fetchone())[0]
+            cursor = await self.connection.execute("SELECT COUNT(*) FROM daily_reports")
+            counts["daily_reports"] = (await cursor.fetchone())[0]
 
-        await self.connection.execute("DELETE FROM symbol_rules")
-        await self.connection.execute("DELETE FROM daily_reports")
-        await self.connection.commit()
+            await self.connection.execute("DELETE FROM symbol_rules")
+            await self.connection.execute("DELETE FROM daily_reports")
 
         return counts
 
@@ -1390,28 +1621,28 @@ class Database:
         These occur when validation fails after trade creation.
         Returns the number of deleted trades.
         """
-        # Find orphan trade IDs (open trades with no pyramids)
-        cursor = await self.connection.execute(
-            """
-            SELECT t.id FROM trades t
-            LEFT JOIN pyramids p ON t.id = p.trade_id
-            WHERE t.status = 'open'
-            GROUP BY t.id
-            HAVING COUNT(p.id) = 0
-            """
-        )
-        orphan_ids = [row[0] for row in await cursor.fetchall()]
+        async with self._write():
+            # Find orphan trade IDs (open trades with no pyramids)
+            cursor = await self.connection.execute(
+                """
+                SELECT t.id FROM trades t
+                LEFT JOIN pyramids p ON t.id = p.trade_id
+                WHERE t.status = 'open'
+                GROUP BY t.id
+                HAVING COUNT(p.id) = 0
+                """
+            )
+            orphan_ids = [row[0] for row in await cursor.fetchall()]
 
-        if not orphan_ids:
-            return 0
+            if not orphan_ids:
+                return 0
 
-        # Delete orphan trades
-        placeholders = ",".join("?" * len(orphan_ids))
-        await self.connection.execute(
-            f"DELETE FROM trades WHERE id IN ({placeholders})",
-            orphan_ids
-        )
-        await self.connection.commit()
+            # Delete orphan trades
+            placeholders = ",".join("?" * len(orphan_ids))
+            await self.connection.execute(
+                f"DELETE FROM trades WHERE id IN ({placeholders})",
+                orphan_ids
+            )
 
         return len(orphan_ids)
 
@@ -3,6 +3,12 @@ from typing import Literal
 
 from pydantic import BaseModel, Field, field_validator
 
+try:
+    # C parser, handles the trailing "Z" natively
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    _parse_iso_datetime = datetime.fromisoformat
+
 
 class TradingViewAlert(BaseModel):
     """New unified webhook payload from TradingView strategy alerts."""
@@ -135,6 +141,21 @@ class TradeClosedData(BaseModel):
     exchange_timestamp: str
     received_timestamp: datetime
 
+    @field_validator("pyramids")
+    @classmethod
+    def parse_entry_times(cls, v: list[dict]) -> list[dict]:
+        """Parse ISO entry_time strings into datetimes once, at construction."""
+        parsed = []
+        for pyramid in v:
+            entry_time = pyramid.get("entry_time")
+            if isinstance(entry_time, str):
+                try:
+                    pyramid = {**pyramid, "entry_time": _parse_iso_datetime(entry_time)}
+                except ValueError:
+                    pass  # Not ISO; keep the raw string for display
+            parsed.append(pyramid)
+        return parsed
+
 
 class TradeHistoryItem(BaseModel):
     """Single trade in daily report history."""
@@ -5,7 +5,9 @@ Unified interface for interacting with all supported exchanges.
 Handles price fetching, symbol info caching, and validation.
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 
 from ..database import db
@@ -24,10 +26,24 @@ logger = logging.getLogger(__name__)
 # Cache expiry for symbol rules (24 hours)
 CACHE_EXPIRY_HOURS = 24
 
+# In-process symbol info cache lifetime, in front of the DB cache (5 minutes)
+SYMBOL_INFO_TTL_SECONDS = 300
+
+# How long a fetched price is reused for repeat lookups of the same pair
+PRICE_TTL_SECONDS = 1.0
+
 
 class ExchangeService:
     """Service for fetching prices and symbol info from exchanges."""
 
+    # (exchange, base, quote) -> (monotonic time stored, SymbolInfo)
+    _symbol_info_cache: dict[tuple[str, str, str], tuple[float, SymbolInfo]] = {}
+
+    # (exchange, base, quote) -> (monotonic time fetched, PriceData)
+    _price_cache: dict[tuple[str, str, str], tuple[float, PriceData]] = {}
+    # (exchange, base, quote) -> fetch shared by concurrent callers
+    _price_inflight: dict[tuple[str, str, str], asyncio.Task] = {}
+
     @staticmethod
     def get_exchange_adapter(exchange: str) -> type[BaseExchange]:
         """
@@ -70,6 +86,37 @@ class ExchangeService:
             SymbolNotFoundError: If symbol doesn't exist
             ExchangeAPIError: If API returns an error
         """
+        cache_key = (normalize_exchange(exchange), base.upper(), quote.upper())
+
+        cached = cls._price_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < PRICE_TTL_SECONDS:
+            return cached[1]
+
+        # Concurrent callers for the same pair share one in-flight request
+        task = cls._price_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(cls._fetch_price(exchange, base, quote))
+            cls._price_inflight[cache_key] = task
+            task.add_done_callback(lambda t: cls._price_fetch_done(cache_key, t))
+
+        # Shield so one cancelled caller doesn't cancel the fetch for the rest
+        return await asyncio.shield(task)
+
+    @classmethod
+    def _price_fetch_done(cls, cache_key: tuple[str, str, str], task: asyncio.Task) -> None:
+        """
+        Forget a finished shared price fetch.
+
+        Reads the exception so a fetch that fails after every caller was
+        cancelled doesn't log "Task exception was never retrieved".
+        """
+        cls._price_inflight.pop(cache_key, None)
+        if not task.cancelled():
+            task.exception()
+
+    @classmethod
+    async def _fetch_price(cls, exchange: str, base: str, quote: str) -> PriceData:
+        """Fetch a price from the exchange and remember it for PRICE_TTL_SECONDS."""
         adapter_class = cls.get_exchange_adapter(exchange)
 
         async with adapter_class() as adapter:
@@ -77,7 +124,10 @@ class ExchangeService:
             logger.info(
                 f"Fetched price for {base}/{quote} on {exchange}: {price_data.price}"
             )
-            return price_data
+
+        cache_key = (normalize_exchange(exchange), base.upper(), quote.upper())
+        cls._price_cache[cache_key] = (time.monotonic(), price_data)
+        return price_data
 
     @classmethod
     async def get_symbol_info(
@@ -98,9 +148,14 @@ class ExchangeService:
         normalized_exchange = normalize_exchange(exchange)
         base = base.upper()
         quote = quote.upper()
+        cache_key = (normalized_exchange, base, quote)
 
-        # Check cache first
+        # Check cache first: in-process, then DB
         if use_cache:
+            memo = cls._symbol_info_cache.get(cache_key)
+            if memo and time.monotonic() - memo[0] < SYMBOL_INFO_TTL_SECONDS:
+                return memo[1]
+
             try:
                 cached = await db.get_symbol_rules(normalized_exchange, base, quote)
                 if cached:
@@ -111,7 +166,7 @@ class ExchangeService:
                         updated_at = updated_at.replace(tzinfo=timezone.utc)
                     if datetime.now(timezone.utc) - updated_at < timedelta(hours=CACHE_EXPIRY_HOURS):
                         logger.debug(f"Using cached symbol info for {base}/{quote} on {exchange}")
-                        return SymbolInfo(
+                        symbol_info = SymbolInfo(
                             base=cached["base"],
                             quote=cached["quote"],
                             price_precision=cached["price_precision"],
@@ -120,6 +175,8 @@ class ExchangeService:
                             min_notional=cached["min_notional"],
                             tick_size=cached["tick_size"],
                         )
+                        cls._symbol_info_cache[cache_key] = (time.monotonic(), symbol_info)
+                        return symbol_info
             except (TypeError, ValueError, KeyError) as e:
                 # Cache data is corrupt or incompatible - fetch fresh data
                 logger.warning(f"Cache error for {base}/{quote} on {exchange}, refreshing: {e}")
@@ -141,6 +198,8 @@ class ExchangeService:
             tick_size=symbol_info.tick_size,
         )
 
+        cls._symbol_info_cache[cache_key] = (time.monotonic(), symbol_info)
+
         logger.info(f"Fetched and cached symbol info for {base}/{quote} on {exchange}")
         return symbol_info
 
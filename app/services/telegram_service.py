@@ -5,36 +5,213 @@ Handles sending trade notifications and daily reports to Telegram.
 """
 
 import asyncio
+import heapq
 import io
 import logging
+import os
 import re
-from datetime import datetime, UTC
+import threading
+from datetime import datetime, timedelta, timezone, UTC
+from functools import lru_cache
+from typing import IO
 
+import numpy as np
 import pytz
 from telegram import Bot
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 
 from ..config import settings
 from ..models import TradeClosedData, DailyReportData, PyramidEntryData, EquityPoint, ChartStats
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    _HTTP_VERSION = "2.0"
+except ImportError:
+    _HTTP_VERSION = "1.1"
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")  # Headless server: never pick up a GUI backend
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.ticker import FuncFormatter
+    from matplotlib.patches import FancyBboxPatch
+    import matplotlib.gridspec as gridspec
+    from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+except ImportError:
+    plt = None
+
 logger = logging.getLogger(__name__)
 
+# Concurrent Bot API calls allowed per event loop (Telegram caps bots at ~30 msg/s)
+_MAX_CONCURRENT_SENDS = 25
+
+# Daily report lists only this many pairs, largest absolute PnL first
+_PAIR_REPORT_LIMIT = 20
+
+# pyplot keeps global state, so chart renders from worker threads take turns
+_CHART_LOCK = threading.Lock()
+
+# Rendering settings applied on top of the dark theme: simplify long curves
+# to within a pixel and rasterize them in chunks
+_CHART_RC = {
+    "text.usetex": False,
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000,
+}
+
+# Logo drawn in the chart header, at the repository root
+_LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logo.jpg')
+
+# Chart figures reused across renders, keyed by whether the stats footer is drawn.
+# Cleared and laid out afresh on each render; guarded by _CHART_LOCK.
+_FIGURE_POOL: dict[bool, "plt.Figure"] = {}
+
+# Fixed message fragments, shared by every call
+_SEPARATOR = "- - - - - - - - - - - - - - - - - - "
+_PYRAMID_HEADER = ("📥 Trade Entry", _SEPARATOR)
+_PYRAMID_DETAILS_HEADER = (_SEPARATOR, "📥 Entry Details")
+_PYRAMID_TIMESTAMPS_HEADER = (_SEPARATOR, "⏱ System Timestamps")
+_TRADE_CLOSED_HEADER = ("📊 Trade Closed", _SEPARATOR)
+_ENTRIES_HEADER = (_SEPARATOR, "📥 Entries:", "")
+_EXIT_HEADER = (_SEPARATOR, "📤 Exit:")
+_RESULTS_HEADER = (_SEPARATOR, "📉 Results:")
+_CLOSED_TRADES_HEADER = ("", "Closed Trades:")
+_BY_EXCHANGE_HEADER = ("", "By Exchange:")
+_BY_TIMEFRAME_HEADER = ("", "By Timeframe:")
+_BY_PAIR_HEADER = ("", "By Pair:")
+_SINGLE_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Display names for known exchanges; others fall back to capitalize()
+_EXCHANGE_NAMES = {
+    "binance": "Binance",
+    "bybit": "Bybit",
+    "okx": "OKX",
+    "gateio": "Gate.io",
+    "kucoin": "KuCoin",
+    "mexc": "MEXC",
+}
+
+# Per-row message templates, filled with a single format call each
+_ENTRY_BLOCK = "* Entry %s\n💰 Price: %s\n⏰ Time: %s\n📦 QTY: %s\n"
+_TRADE_ROW = "{p} {g}: {pnl} ({pct})\n{d} {ex} | {pair} | {tf} | {n}P"
+_BREAKDOWN_ROW = "{p} {name}: {pnl} ({n} trades)"
+_PAIR_ROW = "{p} {pair}: {pnl}"
+
+# Exchange timestamps: YYYY-MM-DD[[T ]HH:MM[:SS[.fff]][Z|+HH:MM]]
+_ISO_RE = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?"
+    r"(?:(Z)|([+-])(\d{2}):?(\d{2}))?)?$"
+)
+
+
+@lru_cache(maxsize=2048)
+def _format_price(price: float) -> str:
+    """Format price for display."""
+    if price >= 1000:
+        return f"${price:,.2f}"
+    elif price >= 1:
+        return f"${price:.4f}"
+    else:
+        return f"${price:.8f}"
+
+
+@lru_cache(maxsize=2048)
+def _format_pnl(pnl: float) -> str:
+    """Format PnL with + or - prefix."""
+    sign = "+" if pnl >= 0 else ""
+    return f"{sign}${pnl:.2f}"
+
+
+@lru_cache(maxsize=2048)
+def _format_percent(percent: float) -> str:
+    """Format percentage with + or - prefix."""
+    sign = "+" if percent >= 0 else ""
+    return f"{sign}{percent:.2f}%"
+
+
+@lru_cache(maxsize=2048)
+def _format_quantity(qty: float) -> str:
+    """Format quantity, removing unnecessary trailing zeros."""
+    # Format with enough precision, then strip trailing zeros and a bare
+    # trailing dot in one pass (the fraction always has 8 digits)
+    formatted = f"{qty:.8f}".rstrip('0')
+    if formatted[-1] == '.':
+        formatted = formatted[:-1]
+    return formatted if formatted != '-0' else '0'
+
+
+def _exchange_name(exchange: str) -> str:
+    """Return the display name for an exchange id."""
+    return _EXCHANGE_NAMES.get(exchange) or exchange.capitalize()
+
+
+@lru_cache(maxsize=8)
+def _load_logo(path: str, mtime: float):
+    """Open the chart logo shrunk to header size; mtime in the key picks up edits."""
+    from PIL import Image
+
+    logo_img = Image.open(path)
+    logo_img.thumbnail((120, 120), Image.Resampling.LANCZOS)
+    return logo_img
+
+
+def _format_currency_tick(x: float, pos: int | None = None) -> str:
+    """Format a chart y-axis tick as signed whole dollars, e.g. +$1,250 / -$300."""
+    return ("+$%s" if x >= 0 else "-$%s") % format(abs(x), ",.0f")
+
+
+def _top_pairs_by_abs_pnl(by_pair: dict[str, float]) -> list[tuple[str, float]]:
+    """Return the top (pair, pnl) items by absolute PnL, largest first, ties in order."""
+    return heapq.nlargest(_PAIR_REPORT_LIMIT, by_pair.items(), key=lambda kv: abs(kv[1]))
+
 
 class TelegramService:
     """Service for sending Telegram notifications."""
 
     def __init__(self):
         self._bot: Bot | None = None
+        self._send_sem: asyncio.Semaphore | None = None
+        self._send_sem_loop: asyncio.AbstractEventLoop | None = None
+        self._tz_suffix = f"({settings.timezone})"
+        # Build the bot up front so every send reuses one HTTP connection pool
+        if settings.telegram_bot_token:
+            try:
+                self._bot = self._create_bot()
+            except Exception as e:
+                logger.warning(f"Could not create Telegram bot at startup: {e}")
 
     @property
     def bot(self) -> Bot:
-        """Get or create Telegram bot instance."""
+        """Get the Telegram bot instance, creating it if not built at startup."""
         if not self._bot:
             if not settings.telegram_bot_token:
                 raise ValueError("Telegram bot token not configured")
-            self._bot = Bot(token=settings.telegram_bot_token)
+            self._bot = self._create_bot()
         return self._bot
 
+    def _create_bot(self) -> Bot:
+        """Create a Bot whose sends multiplex over one HTTP/2 connection."""
+        # Keep PTB's default pool: on the HTTP/1.1 fallback every concurrent
+        # send needs its own connection
+        request = HTTPXRequest(http_version=_HTTP_VERSION)
+        return Bot(
+            token=settings.telegram_bot_token,
+            request=request,
+            get_updates_request=request,
+        )
+
+    def _send_limiter(self) -> asyncio.Semaphore:
+        """Get the send semaphore for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._send_sem is None or self._send_sem_loop is not loop:
+            self._send_sem = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
+            self._send_sem_loop = loop
+        return self._send_sem
+
     @property
     def is_enabled(self) -> bool:
         """Check if Telegram notifications are enabled."""
@@ -72,7 +249,7 @@ class TelegramService:
         if utc_time is None:
             utc_time = datetime.now(UTC)
         if utc_time.tzinfo is None:
-            utc_time = pytz.utc.localize(utc_time)
+            utc_time = utc_time.replace(tzinfo=UTC)
         return utc_time.astimezone(tz)
 
     def _format_time(self, dt: datetime) -> str:
@@ -85,40 +262,44 @@ class TelegramService:
         local_dt = self._get_local_time(dt)
         return local_dt.strftime("%Y-%m-%d")
 
-    def _format_price(self, price: float) -> str:
-        """Format price for display."""
-        if price >= 1000:
-            return f"${price:,.2f}"
-        elif price >= 1:
-            return f"${price:.4f}"
-        else:
-            return f"${price:.8f}"
-
-    def _format_pnl(self, pnl: float) -> str:
-        """Format PnL with + or - prefix."""
-        sign = "+" if pnl >= 0 else ""
-        return f"{sign}${pnl:.2f}"
-
-    def _format_percent(self, percent: float) -> str:
-        """Format percentage with + or - prefix."""
-        sign = "+" if percent >= 0 else ""
-        return f"{sign}{percent:.2f}%"
-
-    def _format_quantity(self, qty: float) -> str:
-        """Format quantity, removing unnecessary trailing zeros."""
-        # Format with enough precision, then strip trailing zeros
-        formatted = f"{qty:.8f}".rstrip('0').rstrip('.')
-        return formatted
+    # Pure formatters live at module level so they can be memoized
+    _format_price = staticmethod(_format_price)
+    _format_pnl = staticmethod(_format_pnl)
+    _format_percent = staticmethod(_format_percent)
+    _format_quantity = staticmethod(_format_quantity)
 
     def _parse_exchange_timestamp(self, timestamp: str) -> str:
         """Parse exchange timestamp and format it for display."""
+        if not isinstance(timestamp, str) or not timestamp:
+            return "N/A"
+        m = _ISO_RE.match(timestamp)
+        if not m:
+            # Return as-is if not an ISO timestamp
+            return timestamp
+
         try:
-            # Try ISO format (YYYY-MM-DDTHH:MM:SSZ)
-            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-            return self._format_time(dt)
-        except (ValueError, AttributeError):
-            # Return as-is if parsing fails
-            return timestamp or "N/A"
+            if m.group(8):
+                offset = timedelta(hours=int(m.group(9)), minutes=int(m.group(10)))
+                tzinfo = timezone(-offset if m.group(8) == "-" else offset)
+            else:
+                # Trailing Z or no offset at all: exchange times are UTC
+                tzinfo = UTC
+            # Missing time fields (date-only, or HH:MM) default to zero
+            dt = datetime(
+                int(m.group(1)), int(m.group(2)), int(m.group(3)),
+                int(m.group(4) or 0), int(m.group(5) or 0), int(m.group(6) or 0),
+                tzinfo=tzinfo,
+            )
+        except ValueError:
+            # Out-of-range field (e.g. month 13 or a +99:00 offset)
+            return timestamp
+        return self._format_time(dt)
+
+    def _format_entry_time(self, entry_time: datetime | str) -> str:
+        """Format a pyramid entry time; strings left by the model are shown as-is."""
+        if isinstance(entry_time, datetime):
+            return self._format_time(entry_time)
+        return entry_time
 
     def _format_quantity_with_commas(self, qty: float, symbol: str) -> str:
         """Format quantity with thousand separators."""
@@ -141,30 +322,24 @@ class TelegramService:
         """
         exchange_time_str = self._parse_exchange_timestamp(data.exchange_timestamp)
         received_time_str = self._format_time(data.received_timestamp)
-        separator = "- - - - - - - - - - - - - - - - - - "
 
-        lines = [
-            "📥 Trade Entry",
-            separator,
+        return "\n".join((
+            *_PYRAMID_HEADER,
             f"📌 Group: {data.group_id}",
             f"🧱 Entry: #{data.pyramid_index}",
-            separator,
-            f"🏦 Exchange: {data.exchange.capitalize()}",
+            _SEPARATOR,
+            f"🏦 Exchange: {_exchange_name(data.exchange)}",
             f"💱 Pair: {data.base}/{data.quote}",
             f"⏱ Timeframe: {data.timeframe}",
-            separator,
-            "📥 Entry Details",
+            *_PYRAMID_DETAILS_HEADER,
             f"⏰ Entry Time: {exchange_time_str}",
-            f"💰 Entry Price: {self._format_price(data.entry_price)}",
+            f"💰 Entry Price: {_format_price(data.entry_price)}",
             f"📦 Size: {self._format_quantity_with_commas(data.position_size, data.base)}",
             f"💵 Capital: ${data.capital_usdt:,.2f}",
-            separator,
-            "⏱ System Timestamps",
+            *_PYRAMID_TIMESTAMPS_HEADER,
             f"🕒 Exchange Time: {exchange_time_str}",
-            f"📍 Received: {received_time_str} ({settings.timezone})",
-        ]
-
-        return "\n".join(lines)
+            f"📍 Received: {received_time_str} {self._tz_suffix}",
+        ))
 
     def format_trade_closed_message(self, data: TradeClosedData) -> str:
         """
@@ -178,64 +353,48 @@ class TelegramService:
         """
         # Parse timestamps
         exchange_time_str = self._parse_exchange_timestamp(data.exchange_timestamp)
-        received_time_str = self._format_time(data.received_timestamp)
-        separator = "- - - - - - - - - - - - - - - - - - "
+        # Convert once; time and date are both read off the same local datetime
+        local_received = self._get_local_time(data.received_timestamp)
+        received_time_str = local_received.strftime("%H:%M:%S")
 
-        lines = [
-            "📊 Trade Closed",
-            separator,
+        header = (
+            *_TRADE_CLOSED_HEADER,
             f"📌 Group: {data.group_id}",
             f"⏱ Timeframe: {data.timeframe}",
-            f"📅 Date: {self._format_date(data.received_timestamp)}",
-            separator,
-            f"🏦 Exchange: {data.exchange.capitalize()}",
+            f"📅 Date: {local_received.strftime('%Y-%m-%d')}",
+            _SEPARATOR,
+            f"🏦 Exchange: {_exchange_name(data.exchange)}",
             f"💱 Pair: {data.base}/{data.quote}",
-            separator,
-            "📥 Entries:",
-            "",
-        ]
+            *_ENTRIES_HEADER,
+        )
 
-        # Add pyramid entries with their exchange timestamps
-        for i, pyramid in enumerate(data.pyramids):
-            entry_time = pyramid.get("entry_time", "")
-            if isinstance(entry_time, str):
-                try:
-                    entry_dt = datetime.fromisoformat(entry_time)
-                    entry_time_str = self._format_time(entry_dt)
-                except ValueError:
-                    entry_time_str = entry_time
-            else:
-                entry_time_str = self._format_time(entry_time)
-
-            price_str = self._format_price(pyramid["entry_price"])
-            qty_str = self._format_quantity_with_commas(pyramid['size'], data.base)
-
-            lines.extend([
-                f"* Entry {pyramid['index']}",
-                f"💰 Price: {price_str}",
-                f"⏰ Time: {entry_time_str}",
-                f"📦 QTY: {qty_str}",
-                "",
-            ])
-
-        # Add exit with dual timestamps
-        lines.extend([
-            separator,
-            "📤 Exit:",
-            f"💰 Exit Price: {self._format_price(data.exit_price)}",
-            f"⏰ Exchange Time: {exchange_time_str}",
-            f"📍 Confirmed: {received_time_str} ({settings.timezone})",
-            separator,
-            "📉 Results:",
-            f"💵 Gross PnL: {self._format_pnl(data.gross_pnl)}",
-            f"💸 Fees: -${data.total_fees:.2f}",
-        ])
+        # Pyramid entries with their exchange timestamps, one block each
+        entry_lines = [
+            _ENTRY_BLOCK % (
+                pyramid["index"],
+                _format_price(pyramid["entry_price"]),
+                self._format_entry_time(pyramid.get("entry_time", "")),
+                self._format_quantity_with_commas(pyramid["size"], data.base),
+            )
+            for pyramid in data.pyramids
+        ]
 
         # Use 🟢 for positive, 🔻 for negative net PnL
         pnl_emoji = "🟢" if data.net_pnl >= 0 else "🔻"
-        lines.append(f"{pnl_emoji} Net PnL: {self._format_pnl(data.net_pnl)} ({self._format_percent(data.net_pnl_percent)})")
 
-        return "\n".join(lines)
+        # Exit with dual timestamps
+        footer = (
+            *_EXIT_HEADER,
+            f"💰 Exit Price: {_format_price(data.exit_price)}",
+            f"⏰ Exchange Time: {exchange_time_str}",
+            f"📍 Confirmed: {received_time_str} {self._tz_suffix}",
+            *_RESULTS_HEADER,
+            f"💵 Gross PnL: {_format_pnl(data.gross_pnl)}",
+            f"💸 Fees: -${data.total_fees:.2f}",
+            f"{pnl_emoji} Net PnL: {_format_pnl(data.net_pnl)} ({_format_percent(data.net_pnl_percent)})",
+        )
+
+        return "\n".join((*header, *entry_lines, *footer))
 
     def format_daily_report_message(self, data: DailyReportData) -> str:
         """
@@ -248,7 +407,7 @@ class TelegramService:
             Formatted message string
         """
         # Use "Daily Report" for single dates, "Performance Report" for periods
-        is_single_date = bool(re.match(r"^\d{4}-\d{2}-\d{2}$", data.date))
+        is_single_date = bool(_SINGLE_DATE_RE.match(data.date))
         report_title = "Daily Report" if is_single_date else "Performance Report"
 
         lines = [
@@ -257,63 +416,65 @@ class TelegramService:
             "Summary:",
             f"├─ Total Trades: {data.total_trades}",
             f"├─ Total Pyramids: {data.total_pyramids}",
-            f"└─ Net PnL: {self._format_pnl(data.total_pnl_usdt)} ({self._format_percent(data.total_pnl_percent)})",
+            f"└─ Net PnL: {_format_pnl(data.total_pnl_usdt)} ({_format_percent(data.total_pnl_percent)})",
         ]
 
-        # Trade history with group_id
+        # Trade history with group_id, details on the line below each trade
         if data.trades:
-            lines.extend(["", "Closed Trades:"])
-            for i, trade in enumerate(data.trades):
-                is_last = i == len(data.trades) - 1
-                prefix = "└─" if is_last else "├─"
-                pnl_str = self._format_pnl(trade.pnl_usdt)
-                pct_str = self._format_percent(trade.pnl_percent)
-                lines.append(
-                    f"{prefix} {trade.group_id}: {pnl_str} ({pct_str})"
-                )
-                # Show details on next line
-                detail_prefix = "   " if is_last else "│  "
-                lines.append(
-                    f"{detail_prefix} {trade.exchange.capitalize()} | {trade.pair} | {trade.timeframe} | {trade.pyramids_count}P"
+            lines += _CLOSED_TRADES_HEADER
+            last_idx = len(data.trades) - 1
+            lines += [
+                _TRADE_ROW.format(
+                    p="└─" if i == last_idx else "├─",
+                    g=trade.group_id,
+                    pnl=_format_pnl(trade.pnl_usdt),
+                    pct=_format_percent(trade.pnl_percent),
+                    d="   " if i == last_idx else "│  ",
+                    ex=_exchange_name(trade.exchange),
+                    pair=trade.pair,
+                    tf=trade.timeframe,
+                    n=trade.pyramids_count,
                 )
+                for i, trade in enumerate(data.trades)
+            ]
 
         # By exchange breakdown
         if data.by_exchange:
-            lines.extend(["", "By Exchange:"])
-            exchanges = list(data.by_exchange.items())
-            for i, (exchange, stats) in enumerate(exchanges):
-                is_last = i == len(exchanges) - 1
-                prefix = "└─" if is_last else "├─"
-                pnl = stats.get("pnl", 0)
-                trades = stats.get("trades", 0)
-                lines.append(
-                    f"{prefix} {exchange.capitalize()}: {self._format_pnl(pnl)} ({trades} trades)"
+            lines += _BY_EXCHANGE_HEADER
+            last_idx = len(data.by_exchange) - 1
+            lines += [
+                _BREAKDOWN_ROW.format(
+                    p="└─" if i == last_idx else "├─",
+                    name=_exchange_name(exchange),
+                    pnl=_format_pnl(stats.get("pnl", 0)),
+                    n=stats.get("trades", 0),
                 )
+                for i, (exchange, stats) in enumerate(data.by_exchange.items())
+            ]
 
         # By timeframe breakdown
         if data.by_timeframe:
-            lines.extend(["", "By Timeframe:"])
-            timeframes = list(data.by_timeframe.items())
-            for i, (timeframe, stats) in enumerate(timeframes):
-                is_last = i == len(timeframes) - 1
-                prefix = "└─" if is_last else "├─"
-                pnl = stats.get("pnl", 0)
-                trades = stats.get("trades", 0)
-                lines.append(
-                    f"{prefix} {timeframe}: {self._format_pnl(pnl)} ({trades} trades)"
+            lines += _BY_TIMEFRAME_HEADER
+            last_idx = len(data.by_timeframe) - 1
+            lines += [
+                _BREAKDOWN_ROW.format(
+                    p="└─" if i == last_idx else "├─",
+                    name=timeframe,
+                    pnl=_format_pnl(stats.get("pnl", 0)),
+                    n=stats.get("trades", 0),
                 )
+                for i, (timeframe, stats) in enumerate(data.by_timeframe.items())
+            ]
 
-        # By pair breakdown
+        # By pair breakdown, biggest movers by absolute PnL
         if data.by_pair:
-            lines.extend(["", "By Pair:"])
-            # Sort by absolute PnL
-            sorted_pairs = sorted(
-                data.by_pair.items(), key=lambda x: abs(x[1]), reverse=True
-            )
-            for i, (pair, pnl) in enumerate(sorted_pairs):
-                is_last = i == len(sorted_pairs) - 1
-                prefix = "└─" if is_last else "├─"
-                lines.append(f"{prefix} {pair}: {self._format_pnl(pnl)}")
+            lines += _BY_PAIR_HEADER
+            top_pairs = _top_pairs_by_abs_pnl(data.by_pair)
+            last_idx = len(top_pairs) - 1
+            lines += [
+                _PAIR_ROW.format(p="└─" if i == last_idx else "├─", pair=pair, pnl=_format_pnl(pnl))
+                for i, (pair, pnl) in enumerate(top_pairs)
+            ]
 
         return "\n".join(lines)
 
@@ -321,8 +482,9 @@ class TelegramService:
         self,
         equity_points: list[EquityPoint],
         date: str,
-        chart_stats: ChartStats | None = None
-    ) -> io.BytesIO | None:
+        chart_stats: ChartStats | None = None,
+        out: IO[bytes] | None = None
+    ) -> IO[bytes] | None:
         """
         Generate a professional equity curve chart image with stats footer.
 
@@ -330,57 +492,80 @@ class TelegramService:
             equity_points: List of equity curve data points
             date: Report date for the title
             chart_stats: Optional statistics for the footer
+            out: Optional writable binary stream to write the PNG into
+                instead of a new in-memory buffer
 
         Returns:
-            BytesIO buffer containing the PNG image, or None if not enough data
+            BytesIO buffer containing the PNG image (or ``out`` when given),
+            or None if not enough data
         """
         if len(equity_points) < 2:
             return None
 
-        try:
-            import matplotlib.pyplot as plt
-            import matplotlib.dates as mdates
-            from matplotlib.ticker import FuncFormatter
-            from matplotlib.patches import FancyBboxPatch
-            import matplotlib.gridspec as gridspec
-            from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-            from PIL import Image
-            import os
-        except ImportError:
+        with _CHART_LOCK:
+            return self._render_equity_curve(equity_points, date, chart_stats, out)
+
+    def _render_equity_curve(
+        self,
+        equity_points: list[EquityPoint],
+        date: str,
+        chart_stats: ChartStats | None,
+        out: IO[bytes] | None = None
+    ) -> IO[bytes] | None:
+        """Draw the equity curve chart; callers must hold _CHART_LOCK."""
+        if plt is None:
             logger.warning("matplotlib not installed, skipping equity curve")
             return None
 
         # Extract data and convert timestamps to configured timezone
         tz = pytz.timezone(settings.timezone)
-        timestamps = [self._get_local_time(p.timestamp) for p in equity_points]
-        cumulative_pnls = [p.cumulative_pnl for p in equity_points]
+        # Plot UTC datetime64 values; the locator and formatter below apply the timezone
+        timestamps = np.array(
+            [
+                p.timestamp.astimezone(UTC).replace(tzinfo=None) if p.timestamp.tzinfo
+                else p.timestamp
+                for p in equity_points
+            ],
+            dtype="datetime64[us]",
+        )
+        cumulative_pnls = np.fromiter(
+            (p.cumulative_pnl for p in equity_points), dtype=np.float64, count=len(equity_points)
+        )
 
         # Determine if single day or period report for dynamic labels
-        is_single_date = bool(re.match(r"^\d{4}-\d{2}-\d{2}$", date))
+        is_single_date = bool(_SINGLE_DATE_RE.match(date))
         pnl_label = "Today's PnL" if is_single_date else "Period PnL"
         progression_label = "Today's PnL Progression" if is_single_date else "PnL Progression"
-        final_pnl = cumulative_pnls[-1]
+        final_pnl = float(cumulative_pnls[-1])
 
         # Determine color based on final PnL
         line_color = '#00C853' if final_pnl >= 0 else '#FF1744'  # Green or Red
 
         # Create figure with dark theme
-        plt.style.use('dark_background')
+        plt.style.use(['dark_background', _CHART_RC])
 
         # Figure with stats footer - add extra space at top for header
         # Background color matching logo
         bg_color = '#1c1520'  # Dark purple-black matching logo
         chart_bg = '#16213e'  # Slightly different for chart area
 
+        # Allocating the figure and its canvas is the expensive part, so reuse it,
+        # but clear it and rebuild the grid so nothing survives from the last chart
+        fig = _FIGURE_POOL.get(bool(chart_stats))
+        if fig is not None:
+            fig.clf()
+        elif chart_stats:
+            fig = _FIGURE_POOL[True] = plt.figure(figsize=(12, 11), dpi=150)
+        else:
+            fig = _FIGURE_POOL[False] = plt.figure(figsize=(10, 7), dpi=150)
+
         if chart_stats:
-            fig = plt.figure(figsize=(12, 11), dpi=150)
-            gs = gridspec.GridSpec(3, 1, height_ratios=[0.7, 3, 1.1], hspace=0.18)
+            gs = gridspec.GridSpec(3, 1, figure=fig, height_ratios=[0.7, 3, 1.1], hspace=0.18)
             ax_header = fig.add_subplot(gs[0])
             ax = fig.add_subplot(gs[1])
             ax_footer = fig.add_subplot(gs[2])
         else:
-            fig = plt.figure(figsize=(10, 7), dpi=150)
-            gs = gridspec.GridSpec(2, 1, height_ratios=[0.8, 4], hspace=0.12)
+            gs = gridspec.GridSpec(2, 1, figure=fig, height_ratios=[0.8, 4], hspace=0.12)
             ax_header = fig.add_subplot(gs[0])
             ax = fig.add_subplot(gs[1])
 
@@ -402,24 +587,19 @@ class TelegramService:
         ax.axhline(y=0, color='#ffffff', linewidth=0.8, linestyle='--', alpha=0.4)
 
         # Format x-axis (time) - use configured timezone
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator(tz=tz))
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M', tz=tz))
         plt.sca(ax)
         plt.xticks(rotation=45, ha='right')
 
         # Format y-axis (currency)
-        def currency_formatter(x, p):
-            if x >= 0:
-                return f'+${x:,.0f}'
-            return f'-${abs(x):,.0f}'
-        ax.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
+        ax.yaxis.set_major_formatter(FuncFormatter(_format_currency_tick))
 
         # Add logo and title in header area
-        logo_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logo.jpg')
         try:
-            if os.path.exists(logo_path):
-                logo_img = Image.open(logo_path)
-                # Resize logo to fit nicely
-                logo_img.thumbnail((120, 120), Image.Resampling.LANCZOS)
+            if os.path.exists(_LOGO_PATH):
+                # Resized once and reused until the file changes
+                logo_img = _load_logo(_LOGO_PATH, os.path.getmtime(_LOGO_PATH))
                 imagebox = OffsetImage(logo_img, zoom=0.6)
                 ab = AnnotationBbox(imagebox, (0.08, 0.5), frameon=False,
                                     xycoords=ax_header.transAxes, box_alignment=(0.5, 0.5))
@@ -543,17 +723,17 @@ class TelegramService:
                         ha='center', va='center'
                     )
 
-        # Tight layout
-        plt.tight_layout()
-
-        # Save to BytesIO buffer
-        buf = io.BytesIO()
+        # No tight_layout: it refuses grids with their own hspace and only warns.
+        # bbox_inches='tight' below trims the margins instead.
+        # Save to BytesIO buffer; the figure stays open for the next render.
+        # Fast zlib level: a somewhat larger PNG in a fraction of the encode time.
+        buf = io.BytesIO() if out is None else out
         fig.savefig(buf, format='png', facecolor=fig.get_facecolor(),
-                    edgecolor='none', bbox_inches='tight', pad_inches=0.2)
-        buf.seek(0)
-
-        # Close figure to free memory
-        plt.close(fig)
+                    edgecolor='none', bbox_inches='tight', pad_inches=0.2,
+                    pil_kwargs={'compress_level': 1})
+        # A caller-supplied stream may not be seekable; rewind only our own buffer
+        if out is None:
+            buf.seek(0)
 
         return buf
 
@@ -610,11 +790,12 @@ class TelegramService:
             all_succeeded = True
             for i, chunk in enumerate(chunks):
                 try:
-                    await self.bot.send_message(
-                        chat_id=settings.telegram_channel_id,
-                        text=chunk,
-                        parse_mode=None,  # Plain text for better formatting
-                    )
+                    async with self._send_limiter():
+                        await self.bot.send_message(
+                            chat_id=settings.telegram_channel_id,
+                            text=chunk,
+                            parse_mode=None,  # Plain text for better formatting
+                        )
                     # Add delay between chunks to avoid Telegram rate limiting
                     if i < len(chunks) - 1:
                         await asyncio.sleep(0.5)
@@ -654,11 +835,12 @@ class TelegramService:
             all_succeeded = True
             for i, chunk in enumerate(chunks):
                 try:
-                    await self.bot.send_message(
-                        chat_id=signals_channel_id,
-                        text=chunk,
-                        parse_mode=None,
-                    )
+                    async with self._send_limiter():
+                        await self.bot.send_message(
+                            chat_id=signals_channel_id,
+                            text=chunk,
+                            parse_mode=None,
+                        )
                     # Add delay between chunks to avoid Telegram rate limiting
                     if i < len(chunks) - 1:
                         await asyncio.sleep(0.5)
@@ -685,10 +867,33 @@ class TelegramService:
         Returns:
             True if sent to at least one channel successfully
         """
-        main_result = await self.send_message(text)
-        signals_result = await self.send_to_signals_channel(text)
+        # Both sends are independent round trips, so run them concurrently
+        results = await asyncio.gather(
+            self.send_message(text),
+            self.send_to_signals_channel(text),
+            return_exceptions=True,
+        )
+        main_result, signals_result = (r is True for r in results)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Unexpected error sending signal message: {result}")
         return main_result or signals_result
 
+    async def send_many(self, texts: list[str]) -> list[bool]:
+        """
+        Send several signal messages concurrently.
+
+        Bot calls are throttled by the shared send semaphore, so large batches
+        stay under Telegram's rate limit.
+
+        Args:
+            texts: Message texts
+
+        Returns:
+            Per-message result of send_signal_message, in input order
+        """
+        return list(await asyncio.gather(*(self.send_signal_message(t) for t in texts)))
+
     async def send_trade_closed(self, data: TradeClosedData) -> bool:
         """
         Send trade closed notification to both channels.
@@ -730,11 +935,12 @@ class TelegramService:
             return False
 
         try:
-            await self.bot.send_photo(
-                chat_id=settings.telegram_channel_id,
-                photo=photo,
-                caption=caption,
-            )
+            async with self._send_limiter():
+                await self.bot.send_photo(
+                    chat_id=settings.telegram_channel_id,
+                    photo=photo,
+                    caption=caption,
+                )
             return True
         except TelegramError as e:
             logger.error(f"Failed to send photo: {e}")
@@ -759,11 +965,12 @@ class TelegramService:
             return False
 
         try:
-            await self.bot.send_photo(
-                chat_id=signals_channel_id,
-                photo=photo,
-                caption=caption,
-            )
+            async with self._send_limiter():
+                await self.bot.send_photo(
+                    chat_id=signals_channel_id,
+                    photo=photo,
+                    caption=caption,
+                )
             return True
         except TelegramError as e:
             logger.error(f"Failed to send photo to signals channel: {e}")
@@ -785,7 +992,9 @@ class TelegramService:
 
         # Generate and send equity curve if enabled and has data
         if settings.equity_curve_enabled and data.equity_points:
-            chart_image = self.generate_equity_curve_image(
+            # Rendering is CPU-bound; keep it off the event loop
+            chart_image = await asyncio.to_thread(
+                self.generate_equity_curve_image,
                 data.equity_points, data.date, data.chart_stats
             )
             if chart_image:
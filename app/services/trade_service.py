@@ -4,21 +4,64 @@ Trade Service
 Core business logic for handling pyramid entries and exits.
 """
 
+import asyncio
 import logging
-import sqlite3
-import uuid
+import secrets
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
+
 from ..config import settings, exchange_config
 from ..database import db
 from ..models import TradingViewAlert, TradeClosedData, PyramidEntryData
+from .error_notifier import error_notifier
 from .exchange_service import exchange_service
 from .symbol_normalizer import normalize_exchange, parse_symbol, ParsedSymbol
 
 logger = logging.getLogger(__name__)
 
+# Strong references to fire-and-forget tasks so they aren't collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _new_id() -> str:
+    """Generate an opaque 32-char hex ID for trades, pyramids and exits."""
+    return secrets.token_hex(16)
+
+
+def _compute_pnl(
+    entry_prices: np.ndarray,
+    sizes: np.ndarray,
+    capitals: np.ndarray,
+    entry_fees: np.ndarray,
+    exit_price: float,
+    fee_rate: float,
+) -> tuple[np.ndarray, np.ndarray, float, float, float, float]:
+    """Per-pyramid net PnL and percent plus totals (gross, entry fees, exit fees, capital)."""
+    gross_pnls = (exit_price - entry_prices) * sizes
+    exit_fees = exit_price * sizes * fee_rate
+    net_pnls = gross_pnls - entry_fees - exit_fees
+    pnl_percents = np.divide(
+        net_pnls, capitals, out=np.zeros(len(capitals)), where=capitals > 0
+    ) * 100
+    return (
+        net_pnls,
+        pnl_percents,
+        gross_pnls.sum(),
+        entry_fees.sum(),
+        exit_fees.sum(),
+        capitals.sum(),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _group_prefix(base: str, exchange: str, timeframe: str) -> str:
+    """Build the "{BASE}_{Exchange}_{Timeframe}_" part of a group ID."""
+    return f"{base}_{exchange.capitalize()}_{timeframe}_"
+
 
 def generate_group_id(base: str, exchange: str, timeframe: str, sequence: int) -> str:
     """
@@ -26,12 +69,10 @@ def generate_group_id(base: str, exchange: str, timeframe: str, sequence: int) -
     Format: {BASE}_{Exchange}_{Timeframe}_{SequentialNumber}
     Example: ETH_Kucoin_1h_001
     """
-    exchange_formatted = exchange.capitalize()
-    seq_formatted = f"{sequence:03d}"
-    return f"{base}_{exchange_formatted}_{timeframe}_{seq_formatted}"
+    return f"{_group_prefix(base, exchange, timeframe)}{sequence:03d}"
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeResult:
     """Result of a trade operation."""
     success: bool
@@ -92,20 +133,25 @@ class TradeService:
 
         # Determine if entry or exit
         if alert.is_entry():
-            logger.info(f"Processing ENTRY signal for {parsed.base}/{parsed.quote} on {exchange}")
+            logger.info(
+                "Processing ENTRY signal for %s/%s on %s", parsed.base, parsed.quote, exchange
+            )
             return await cls._process_entry(
                 alert, exchange, parsed, received_timestamp
             )
         elif alert.is_exit():
-            logger.info(f"Processing EXIT signal for {parsed.base}/{parsed.quote} on {exchange}")
+            logger.info(
+                "Processing EXIT signal for %s/%s on %s", parsed.base, parsed.quote, exchange
+            )
             return await cls._process_exit(
                 alert, exchange, parsed, received_timestamp
             )
         else:
             # Neither clear entry nor exit - log and skip
             logger.info(
-                f"Ambiguous signal ignored: action={alert.action}, "
-                f"position_side={alert.position_side}"
+                "Ambiguous signal ignored: action=%s, position_side=%s",
+                alert.action,
+                alert.position_side,
             )
             await db.mark_alert_processed(alert.order_id)
             return TradeResult(
@@ -125,28 +171,31 @@ class TradeService:
 
         # Use price from TradingView payload
         current_price = alert.close
-        logger.info(f"Using price from payload: ${current_price}")
+        logger.info("Using price from payload: $%s", current_price)
+
+        # Precision only depends on the symbol, so fetch it while the DB lookups run
+        qty_precision_task = asyncio.create_task(
+            cls._get_qty_precision(exchange, parsed.base, parsed.quote)
+        )
 
         # Check for existing trade (but don't create yet - validate first)
-        trade = await db.get_open_trade_by_group(
+        trade = await db.get_open_trade_with_pyramid_count(
             exchange, parsed.base, parsed.quote, alert.timeframe
         )
 
         if trade:
             trade_id = trade["id"]
             group_id = trade["group_id"]
-            existing_pyramids = await db.get_pyramids_for_trade(trade_id)
-            pyramid_index = len(existing_pyramids)
+            pyramid_index = trade["pyramid_count"]
             is_new_trade = False
 
             # Enforce pyramid limit
             if pyramid_index >= settings.max_pyramids:
                 logger.warning(
-                    f"Max pyramids ({settings.max_pyramids}) reached for {group_id}"
+                    "Max pyramids (%s) reached for %s", settings.max_pyramids, group_id
                 )
+                qty_precision_task.cancel()
                 # Notify via Telegram
-                from .error_notifier import error_notifier
-
                 await error_notifier.notify_pyramid_limit(
                     pair=f"{parsed.base}/{parsed.quote}",
                     exchange=exchange,
@@ -166,36 +215,34 @@ class TradeService:
             group_id = generate_group_id(
                 parsed.base, exchange, alert.timeframe, sequence
             )
-            trade_id = str(uuid.uuid4())
+            trade_id = _new_id()
             pyramid_index = 0
             is_new_trade = True
 
         # Get capital setting for this specific pyramid (exact match or default $1000)
-        capital_usd = await db.get_pyramid_capital(
-            pyramid_index,
-            exchange=exchange,
-            base=parsed.base,
-            quote=parsed.quote,
-            timeframe=alert.timeframe,
+        # alongside the symbol precision fetched above
+        capital_usd, qty_precision = await asyncio.gather(
+            db.get_pyramid_capital(
+                pyramid_index,
+                exchange=exchange,
+                base=parsed.base,
+                quote=parsed.quote,
+                timeframe=alert.timeframe,
+            ),
+            qty_precision_task,
         )
 
-        # Get symbol info for precision rounding
-        try:
-            symbol_info = await exchange_service.get_symbol_info(
-                exchange, parsed.base, parsed.quote
-            )
-            qty_precision = symbol_info.qty_precision
-        except Exception as e:
-            logger.warning(f"Could not get symbol info for precision: {e}, using default 4")
-            qty_precision = 4
-
         # Calculate position size from capital / price, rounded to exchange precision
         position_size = capital_usd / current_price
         position_size = exchange_service.round_quantity(position_size, qty_precision)
         notional = position_size * current_price  # Actual notional after rounding
         logger.info(
-            f"Using capital for Pyramid #{pyramid_index}: ${capital_usd} -> "
-            f"{position_size} {parsed.base} (precision: {qty_precision})"
+            "Using capital for Pyramid #%s: $%s -> %s %s (precision: %s)",
+            pyramid_index,
+            capital_usd,
+            position_size,
+            parsed.base,
+            qty_precision,
         )
 
         # Validate order BEFORE creating trade (prevents orphan trades with 0 pyramids)
@@ -204,17 +251,22 @@ class TradeService:
                 exchange, parsed.base, parsed.quote, position_size, current_price
             )
             if not is_valid:
-                logger.warning(f"Order validation failed: {error_msg}")
+                logger.warning("Order validation failed: %s", error_msg)
                 return TradeResult(
                     success=False,
                     message=error_msg,
                     error="VALIDATION_FAILED",
                 ), None
 
-        # NOW create trade if it's new (validation passed)
-        if is_new_trade:
-            try:
-                await db.create_trade_with_group(
+        # Calculate fees
+        fee_rate = exchange_config.get_fee_rate(exchange)
+        fee_usdt = notional * fee_rate
+
+        # Trade (if new), pyramid and processed-alert mark commit together
+        async with db.transaction():
+            # NOW create trade if it's new (validation passed)
+            if is_new_trade:
+                created = await db.create_trade_with_group(
                     trade_id=trade_id,
                     group_id=group_id,
                     exchange=exchange,
@@ -223,50 +275,47 @@ class TradeService:
                     timeframe=alert.timeframe,
                     position_side=alert.position_side,
                 )
-                logger.info(f"Created new trade {trade_id} with group {group_id}")
-            except sqlite3.IntegrityError:
-                # Race condition: another request created the trade first
-                # Re-fetch the existing trade and add pyramid to it
-                logger.warning(
-                    f"Race condition detected for {parsed.base}/{parsed.quote} "
-                    f"({alert.timeframe}), adding to existing trade"
-                )
-                trade = await db.get_open_trade_by_group(
-                    exchange, parsed.base, parsed.quote, alert.timeframe
-                )
-                if not trade:
-                    # Extremely rare: trade was created and closed between our attempts
-                    return TradeResult(
-                        success=False,
-                        message="Race condition: trade created and closed by another request",
-                        error="RACE_CONDITION",
-                    ), None
-                trade_id = trade["id"]
-                group_id = trade["group_id"]
-                existing_pyramids = await db.get_pyramids_for_trade(trade_id)
-                pyramid_index = len(existing_pyramids)
-
-        # Calculate fees
-        fee_rate = exchange_config.get_fee_rate(exchange)
-        fee_usdt = notional * fee_rate
-
-        # Add pyramid with timestamps
-        pyramid_id = str(uuid.uuid4())
-        await db.add_pyramid(
-            pyramid_id=pyramid_id,
-            trade_id=trade_id,
-            pyramid_index=pyramid_index,
-            entry_price=current_price,
-            position_size=position_size,
-            capital_usdt=notional,  # Actual capital after precision rounding
-            fee_rate=fee_rate,
-            fee_usdt=fee_usdt,
-            exchange_timestamp=alert.timestamp,
-            received_timestamp=received_timestamp.isoformat(),
-        )
+                if created:
+                    logger.info("Created new trade %s with group %s", trade_id, group_id)
+                else:
+                    # Race condition: another request created the trade first
+                    # Re-fetch the existing trade and add pyramid to it
+                    logger.warning(
+                        "Race condition detected for %s/%s (%s), adding to existing trade",
+                        parsed.base,
+                        parsed.quote,
+                        alert.timeframe,
+                    )
+                    trade = await db.get_open_trade_with_pyramid_count(
+                        exchange, parsed.base, parsed.quote, alert.timeframe
+                    )
+                    if not trade:
+                        # Extremely rare: trade was created and closed between our attempts
+                        return TradeResult(
+                            success=False,
+                            message="Race condition: trade created and closed by another request",
+                            error="RACE_CONDITION",
+                        ), None
+                    trade_id = trade["id"]
+                    group_id = trade["group_id"]
+                    pyramid_index = trade["pyramid_count"]
+
+            # Add pyramid with timestamps
+            await db.add_pyramid(
+                pyramid_id=_new_id(),
+                trade_id=trade_id,
+                pyramid_index=pyramid_index,
+                entry_price=current_price,
+                position_size=position_size,
+                capital_usdt=notional,  # Actual capital after precision rounding
+                fee_rate=fee_rate,
+                fee_usdt=fee_usdt,
+                exchange_timestamp=alert.timestamp,
+                received_timestamp=received_timestamp.isoformat(),
+            )
 
-        # Mark alert as processed
-        await db.mark_alert_processed(alert.order_id)
+            # Mark alert as processed
+            await db.mark_alert_processed(alert.order_id)
 
         # Prepare entry notification data
         entry_data = PyramidEntryData(
@@ -285,8 +334,12 @@ class TradeService:
         )
 
         logger.info(
-            f"Recorded pyramid {pyramid_index} for group {group_id}: "
-            f"{position_size:.6f} {parsed.base} @ ${current_price:.2f}"
+            "Recorded pyramid %s for group %s: %.6f %s @ $%.2f",
+            pyramid_index,
+            group_id,
+            position_size,
+            parsed.base,
+            current_price,
         )
 
         return TradeResult(
@@ -298,6 +351,31 @@ class TradeService:
             entry_data=entry_data,
         ), entry_data
 
+    @classmethod
+    async def _get_qty_precision(cls, exchange: str, base: str, quote: str) -> int:
+        """Get quantity precision for a symbol, defaulting to 4 if unavailable."""
+        qty_precision = exchange_config.get_qty_precision(exchange, base, quote)
+        if qty_precision is None:
+            return await cls._fetch_qty_precision(exchange, base, quote)
+
+        # Serve the known precision now and refresh it off the request path
+        if exchange_config.is_qty_precision_stale(exchange, base, quote):
+            task = asyncio.create_task(cls._fetch_qty_precision(exchange, base, quote))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return qty_precision
+
+    @staticmethod
+    async def _fetch_qty_precision(exchange: str, base: str, quote: str) -> int:
+        """Fetch quantity precision from the exchange and remember it."""
+        try:
+            symbol_info = await exchange_service.get_symbol_info(exchange, base, quote)
+        except Exception as e:
+            logger.warning("Could not get symbol info for precision: %s, using default 4", e)
+            return 4
+        exchange_config.set_qty_precision(exchange, base, quote, symbol_info.qty_precision)
+        return symbol_info.qty_precision
+
     @classmethod
     async def _process_exit(
         cls,
@@ -308,15 +386,18 @@ class TradeService:
     ) -> tuple[TradeResult, TradeClosedData | None]:
         """Process an exit signal."""
 
-        # Find open trade (timeframe-aware)
-        trade = await db.get_open_trade_by_group(
+        # Find open trade (timeframe-aware) along with how many pyramids it holds
+        trade = await db.get_open_trade_with_pyramid_count(
             exchange, parsed.base, parsed.quote, alert.timeframe
         )
 
         if not trade:
             logger.warning(
-                f"Exit signal ignored: No open trade for {parsed.base}/{parsed.quote} "
-                f"({alert.timeframe}) on {exchange}"
+                "Exit signal ignored: No open trade for %s/%s (%s) on %s",
+                parsed.base,
+                parsed.quote,
+                alert.timeframe,
+                exchange,
             )
             return TradeResult(
                 success=False,
@@ -331,8 +412,10 @@ class TradeService:
         group_id = trade.get("group_id") or trade_id[:8]
         timeframe = trade.get("timeframe") or alert.timeframe
 
-        # Get all pyramids
-        pyramids = await db.get_pyramids_for_trade(trade_id)
+        # Skip the pyramid fetch entirely when the count says there are none
+        pyramids = (
+            await db.get_pyramids_for_trade(trade_id) if trade["pyramid_count"] else []
+        )
         if not pyramids:
             return TradeResult(
                 success=False,
@@ -342,42 +425,33 @@ class TradeService:
 
         # Use price from TradingView payload
         exit_price = alert.close
-        logger.info(f"Using exit price from payload: ${exit_price}")
+        logger.info("Using exit price from payload: $%s", exit_price)
 
-        # Calculate PnL for each pyramid
+        # Calculate PnL for all pyramids at once (LONG only)
         fee_rate = exchange_config.get_fee_rate(exchange)
-        total_gross_pnl = 0.0
-        total_entry_fees = 0.0
-        total_exit_fees = 0.0
-        total_capital = 0.0
-        pyramid_details = []
-
-        for pyramid in pyramids:
-            entry_price = pyramid["entry_price"]
-            size = pyramid["position_size"]
-            capital = pyramid["capital_usdt"]
-
-            # Calculate PnL (LONG only)
-            gross_pnl = (exit_price - entry_price) * size
-            entry_fee = pyramid["fee_usdt"]
-            exit_fee = exit_price * size * fee_rate
-            net_pnl = gross_pnl - entry_fee - exit_fee
-            pnl_percent = (net_pnl / capital) * 100 if capital > 0 else 0
-
-            # Update pyramid PnL
-            await db.update_pyramid_pnl(pyramid["id"], net_pnl, pnl_percent)
-
-            total_gross_pnl += gross_pnl
-            total_entry_fees += entry_fee
-            total_exit_fees += exit_fee
-            total_capital += capital
+        count = len(pyramids)
+        entry_prices = np.fromiter((p["entry_price"] for p in pyramids), dtype=np.float64, count=count)
+        sizes = np.fromiter((p["position_size"] for p in pyramids), dtype=np.float64, count=count)
+        capitals = np.fromiter((p["capital_usdt"] for p in pyramids), dtype=np.float64, count=count)
+        entry_fees = np.fromiter((p["fee_usdt"] for p in pyramids), dtype=np.float64, count=count)
+
+        net_pnls, pnl_percents, *totals = _compute_pnl(
+            entry_prices, sizes, capitals, entry_fees, float(exit_price), float(fee_rate)
+        )
+        total_gross_pnl, total_entry_fees, total_exit_fees, total_capital = map(float, totals)
 
+        pnl_updates = []
+        pyramid_details = []
+        for pyramid, net_pnl, pnl_percent in zip(
+            pyramids, net_pnls.tolist(), pnl_percents.tolist()
+        ):
+            pnl_updates.append((net_pnl, pnl_percent, pyramid["id"]))
             pyramid_details.append({
                 "index": pyramid["pyramid_index"],
-                "entry_price": entry_price,
+                "entry_price": pyramid["entry_price"],
                 "entry_time": pyramid["entry_time"],
                 "exchange_timestamp": pyramid.get("exchange_timestamp", ""),
-                "size": size,
+                "size": pyramid["position_size"],
                 "pnl_usdt": net_pnl,
                 "pnl_percent": pnl_percent,
             })
@@ -389,37 +463,46 @@ class TradeService:
             (total_net_pnl / total_capital) * 100 if total_capital > 0 else 0
         )
 
-        # Add exit record with timestamps (returns False if race condition detected)
-        exit_id = str(uuid.uuid4())
-        exit_added = await db.add_exit(
-            exit_id,
-            trade_id,
-            exit_price,
-            total_exit_fees,
-            exchange_timestamp=alert.timestamp,
-            received_timestamp=received_timestamp.isoformat(),
-        )
-
-        if not exit_added:
-            # Race condition: another request already closed this trade
-            logger.warning(
-                f"Race condition detected: trade {group_id} already has exit record, "
-                f"skipping duplicate exit signal"
+        # Exit record, pyramid PnLs, trade close and processed-alert mark
+        # commit together
+        async with db.transaction():
+            # Add exit record with timestamps (returns False if race condition detected)
+            exit_added = await db.add_exit(
+                _new_id(),
+                trade_id,
+                exit_price,
+                total_exit_fees,
+                exchange_timestamp=alert.timestamp,
+                received_timestamp=received_timestamp.isoformat(),
             )
-            return TradeResult(
-                success=True,
-                message="Trade already closed by another request (duplicate signal)",
-            ), None
 
-        # Close trade
-        await db.close_trade(trade_id, total_net_pnl, total_pnl_percent)
+            if not exit_added:
+                # Race condition: another request already closed this trade
+                logger.warning(
+                    "Race condition detected: trade %s already has exit record, "
+                    "skipping duplicate exit signal",
+                    group_id,
+                )
+                return TradeResult(
+                    success=True,
+                    message="Trade already closed by another request (duplicate signal)",
+                ), None
 
-        # Mark alert as processed
-        await db.mark_alert_processed(alert.order_id)
+            # Write all pyramid PnLs in one batch
+            await db.update_pyramid_pnl_bulk(pnl_updates)
+
+            # Close trade
+            await db.close_trade(trade_id, total_net_pnl, total_pnl_percent)
+
+            # Mark alert as processed
+            await db.mark_alert_processed(alert.order_id)
 
         logger.info(
-            f"Closed trade {group_id}: {len(pyramids)} pyramids, "
-            f"exit @ ${exit_price:.2f}, net PnL: ${total_net_pnl:.2f}"
+            "Closed trade %s: %d pyramids, exit @ $%.2f, net PnL: $%.2f",
+            group_id,
+            len(pyramids),
+            exit_price,
+            total_net_pnl,
         )
 
         # Prepare notification data
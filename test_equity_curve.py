@@ -41,6 +41,8 @@ def generate_equity_curve_image(
         return None
 
     try:
+        import matplotlib
+        matplotlib.use("Agg")  # Charts are written to files; no GUI backend needed
         import matplotlib.pyplot as plt
         import matplotlib.dates as mdates
         from matplotlib.ticker import FuncFormatter
@@ -2,12 +2,10 @@
 Pytest fixtures and configuration for the test suite.
 """
 
-import asyncio
 import os
-import tempfile
 from datetime import datetime, timedelta
 from typing import AsyncGenerator, Generator
-from unittest.mock import AsyncMock, MagicMock, patch, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
 import pytest_asyncio
@@ -18,194 +16,166 @@ os.environ["TELEGRAM_BOT_TOKEN"] = "test_token"
 os.environ["TELEGRAM_CHAT_ID"] = "-1001234567890"
 os.environ["TIMEZONE"] = "UTC"  # Use UTC for predictable date calculations
 
+# Sample data dates, computed once per session rather than per fixture call
+_NOW = datetime.now()
+TODAY = _NOW.strftime("%Y-%m-%d")
+YESTERDAY = (_NOW - timedelta(days=1)).strftime("%Y-%m-%d")
+WEEK_AGO = (_NOW - timedelta(days=7)).strftime("%Y-%m-%d")
+
+# Sample trades as (id, exchange, base, quote, status, timeframe, group_id,
+# total_pnl_usdt, total_pnl_percent, created_at, closed_at). Timestamps are ISO
+# format to match real app behavior (datetime.isoformat()).
+SAMPLE_TRADE_ROWS = (
+    # Today's trades
+    (
+        "trade_1", "binance", "BTC", "USDT", "closed", "1h", "group_1",
+        100.50, 5.25,
+        TODAY + "T09:00:00", TODAY + "T10:00:00",
+    ),
+    (
+        "trade_2", "binance", "ETH", "USDT", "closed", "1h", "group_2",
+        -30.25, -2.15,
+        TODAY + "T11:00:00", TODAY + "T12:00:00",
+    ),
+    (
+        "trade_3", "bybit", "SOL", "USDT", "closed", "4h", "group_3",
+        50.00, 3.50,
+        TODAY + "T13:00:00", TODAY + "T14:00:00",
+    ),
+    # Yesterday's trades
+    (
+        "trade_4", "binance", "BTC", "USDT", "closed", "1h", "group_4",
+        200.00, 10.00,
+        YESTERDAY + "T09:00:00", YESTERDAY + "T10:00:00",
+    ),
+    (
+        "trade_5", "bybit", "DOGE", "USDT", "closed", "15m", "group_5",
+        -75.50, -5.50,
+        YESTERDAY + "T14:00:00", YESTERDAY + "T15:00:00",
+    ),
+    # Week-old trade
+    (
+        "trade_6", "binance", "XRP", "USDT", "closed", "1d", "group_6",
+        150.00, 7.50,
+        WEEK_AGO + "T09:00:00", WEEK_AGO + "T18:00:00",
+    ),
+    # Open trade (still active)
+    (
+        "trade_7", "binance", "LINK", "USDT", "open", "1h", "group_7",
+        None, None,
+        TODAY + "T15:00:00", None,
+    ),
+)
+
+# Sample pyramids as (id, trade_id, pyramid_index, entry_price, position_size,
+# capital_usdt, entry_time, fee_rate, fee_usdt)
+SAMPLE_PYRAMID_ROWS = (
+    ("pyr_1", "trade_1", 1, 50000.0, 0.02, 1000.0, TODAY + "T09:00:00", 0.001, 1.0),
+    ("pyr_2", "trade_1", 2, 49500.0, 0.02, 990.0, TODAY + "T09:30:00", 0.001, 0.99),
+    ("pyr_3", "trade_2", 1, 3000.0, 0.5, 1500.0, TODAY + "T11:00:00", 0.001, 1.5),
+    ("pyr_4", "trade_3", 1, 100.0, 10.0, 1000.0, TODAY + "T13:00:00", 0.001, 1.0),
+    ("pyr_5", "trade_4", 1, 48000.0, 0.025, 1200.0, YESTERDAY + "T09:00:00", 0.001, 1.2),
+    ("pyr_6", "trade_7", 1, 15.0, 100.0, 1500.0, TODAY + "T15:00:00", 0.001, 1.5),
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_symbol_info_cache():
+    """Keep in-process symbol info, price, in-flight fetch and precision caches from leaking between tests."""
+    from app.config import exchange_config
+    from app.services.exchange_service import ExchangeService
+
+    ExchangeService._symbol_info_cache.clear()
+    ExchangeService._price_cache.clear()
+    ExchangeService._price_inflight.clear()
+    exchange_config.precisions.clear()
+    yield
+    ExchangeService._symbol_info_cache.clear()
+    ExchangeService._price_cache.clear()
+    ExchangeService._price_inflight.clear()
+    exchange_config.precisions.clear()
+
+
+async def _seed_sample_data(db) -> None:
+    """Insert the sample trades and pyramids, one batch per table."""
+    async with db.transaction() as conn:
+        await conn.executemany(
+            """
+            INSERT INTO trades (id, exchange, base, quote, status, timeframe, group_id,
+                              total_pnl_usdt, total_pnl_percent, created_at, closed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            SAMPLE_TRADE_ROWS,
+        )
+        await conn.executemany(
+            """
+            INSERT INTO pyramids (id, trade_id, pyramid_index, entry_price, position_size,
+                                capital_usdt, entry_time, fee_rate, fee_usdt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            SAMPLE_PYRAMID_ROWS,
+        )
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an event loop for the test session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
 
+async def _copy_database(template):
+    """Open a private in-memory Database holding a copy of template.
 
-@pytest_asyncio.fixture
-async def test_db():
-    """Create an isolated in-memory database for testing."""
+    SQLite's backup API copies the template's pages directly, which is far
+    cheaper than replaying the schema, migrations and seed inserts per test.
+    """
+    import aiosqlite
     from app.database import Database
 
-    # Use a temporary file for the test database
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        temp_db_path = f.name
+    db = Database(db_path=":memory:")
+    db._connection = await aiosqlite.connect(":memory:")
+    db._connection.row_factory = aiosqlite.Row
+    await template.connection.backup(db.connection)
+
+    # Throwaway database: skip fsyncs and journals entirely (one round trip)
+    await db.connection.executescript(
+        "PRAGMA journal_mode=MEMORY;"
+        "PRAGMA synchronous=OFF;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA locking_mode=EXCLUSIVE;"
+    )
 
-    # Create database instance with temp path
-    db = Database(db_path=temp_db_path)
+    return db
 
-    # Patch ensure_data_directory to do nothing (we're using temp file)
-    with patch("app.database.ensure_data_directory"):
-        await db.connect()
 
-    yield db
+@pytest_asyncio.fixture(scope="session")
+async def _schema_template():
+    """Migrated, empty database built once per session; only ever copied."""
+    from app.database import Database
 
+    db = Database(db_path=":memory:")
+    await db.connect()
+    yield db
     await db.disconnect()
 
-    # Clean up temp file
-    if os.path.exists(temp_db_path):
-        os.unlink(temp_db_path)
-
-
-@pytest_asyncio.fixture
-async def populated_db(test_db):
-    """Create a database with sample trade data."""
-    # Insert sample trades for testing
-    # Use ISO format timestamps to match real app behavior (datetime.isoformat())
-    today = datetime.now().strftime("%Y-%m-%d")
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    week_ago = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-
-    # Sample trades
-    trades = [
-        # Today's trades
-        {
-            "id": "trade_1",
-            "exchange": "binance",
-            "base": "BTC",
-            "quote": "USDT",
-            "status": "closed",
-            "timeframe": "1h",
-            "group_id": "group_1",
-            "total_pnl_usdt": 100.50,
-            "total_pnl_percent": 5.25,
-            "created_at": f"{today}T09:00:00",
-            "closed_at": f"{today}T10:00:00",
-        },
-        {
-            "id": "trade_2",
-            "exchange": "binance",
-            "base": "ETH",
-            "quote": "USDT",
-            "status": "closed",
-            "timeframe": "1h",
-            "group_id": "group_2",
-            "total_pnl_usdt": -30.25,
-            "total_pnl_percent": -2.15,
-            "created_at": f"{today}T11:00:00",
-            "closed_at": f"{today}T12:00:00",
-        },
-        {
-            "id": "trade_3",
-            "exchange": "bybit",
-            "base": "SOL",
-            "quote": "USDT",
-            "status": "closed",
-            "timeframe": "4h",
-            "group_id": "group_3",
-            "total_pnl_usdt": 50.00,
-            "total_pnl_percent": 3.50,
-            "created_at": f"{today}T13:00:00",
-            "closed_at": f"{today}T14:00:00",
-        },
-        # Yesterday's trades
-        {
-            "id": "trade_4",
-            "exchange": "binance",
-            "base": "BTC",
-            "quote": "USDT",
-            "status": "closed",
-            "timeframe": "1h",
-            "group_id": "group_4",
-            "total_pnl_usdt": 200.00,
-            "total_pnl_percent": 10.00,
-            "created_at": f"{yesterday}T09:00:00",
-            "closed_at": f"{yesterday}T10:00:00",
-        },
-        {
-            "id": "trade_5",
-            "exchange": "bybit",
-            "base": "DOGE",
-            "quote": "USDT",
-            "status": "closed",
-            "timeframe": "15m",
-            "group_id": "group_5",
-            "total_pnl_usdt": -75.50,
-            "total_pnl_percent": -5.50,
-            "created_at": f"{yesterday}T14:00:00",
-            "closed_at": f"{yesterday}T15:00:00",
-        },
-        # Week-old trade
-        {
-            "id": "trade_6",
-            "exchange": "binance",
-            "base": "XRP",
-            "quote": "USDT",
-            "status": "closed",
-            "timeframe": "1d",
-            "group_id": "group_6",
-            "total_pnl_usdt": 150.00,
-            "total_pnl_percent": 7.50,
-            "created_at": f"{week_ago}T09:00:00",
-            "closed_at": f"{week_ago}T18:00:00",
-        },
-        # Open trade (still active)
-        {
-            "id": "trade_7",
-            "exchange": "binance",
-            "base": "LINK",
-            "quote": "USDT",
-            "status": "open",
-            "timeframe": "1h",
-            "group_id": "group_7",
-            "total_pnl_usdt": None,
-            "total_pnl_percent": None,
-            "created_at": f"{today}T15:00:00",
-            "closed_at": None,
-        },
-    ]
 
-    # Insert trades
-    for trade in trades:
-        await test_db.connection.execute(
-            """
-            INSERT INTO trades (id, exchange, base, quote, status, timeframe, group_id,
-                              total_pnl_usdt, total_pnl_percent, created_at, closed_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                trade["id"],
-                trade["exchange"],
-                trade["base"],
-                trade["quote"],
-                trade["status"],
-                trade["timeframe"],
-                trade["group_id"],
-                trade["total_pnl_usdt"],
-                trade["total_pnl_percent"],
-                trade["created_at"],
-                trade["closed_at"],
-            ),
-        )
+@pytest_asyncio.fixture(scope="session")
+async def _populated_template(_schema_template):
+    """Schema template plus the sample data, built once per session."""
+    db = await _copy_database(_schema_template)
+    await _seed_sample_data(db)
+    yield db
+    await db.disconnect()
 
-    # Insert sample pyramids (using ISO format timestamps)
-    pyramids = [
-        ("pyr_1", "trade_1", 1, 50000.0, 0.02, 1000.0, f"{today}T09:00:00", 0.001, 1.0),
-        ("pyr_2", "trade_1", 2, 49500.0, 0.02, 990.0, f"{today}T09:30:00", 0.001, 0.99),
-        ("pyr_3", "trade_2", 1, 3000.0, 0.5, 1500.0, f"{today}T11:00:00", 0.001, 1.5),
-        ("pyr_4", "trade_3", 1, 100.0, 10.0, 1000.0, f"{today}T13:00:00", 0.001, 1.0),
-        ("pyr_5", "trade_4", 1, 48000.0, 0.025, 1200.0, f"{yesterday}T09:00:00", 0.001, 1.2),
-        ("pyr_6", "trade_7", 1, 15.0, 100.0, 1500.0, f"{today}T15:00:00", 0.001, 1.5),
-    ]
 
-    for pyr in pyramids:
-        await test_db.connection.execute(
-            """
-            INSERT INTO pyramids (id, trade_id, pyramid_index, entry_price, position_size,
-                                capital_usdt, entry_time, fee_rate, fee_usdt)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            pyr,
-        )
+@pytest_asyncio.fixture
+async def test_db(_schema_template):
+    """Create an isolated in-memory database for testing."""
+    db = await _copy_database(_schema_template)
+    yield db
+    await db.disconnect()
 
-    await test_db.connection.commit()
 
-    yield test_db
+@pytest_asyncio.fixture
+async def populated_db(_populated_template):
+    """Create an isolated database with sample trade data."""
+    db = await _copy_database(_populated_template)
+    yield db
+    await db.disconnect()
 
 
 @pytest.fixture
@@ -218,15 +188,27 @@ def mock_telegram_bot():
     return bot
 
 
+class _AsyncChildMock(MagicMock):
+    """MagicMock whose unset attributes are AsyncMocks, built on first access.
+
+    Telegram message/query methods are all coroutines, and AsyncMock is
+    costly to construct, so only the ones a test actually touches get built.
+    """
+
+    def _get_child_mock(self, **kw):
+        # Magic methods (__bool__, __iter__, ...) must stay synchronous
+        if kw.get("_new_name", "").startswith("__"):
+            return MagicMock(**kw)
+        return AsyncMock(**kw)
+
+
 @pytest.fixture
 def mock_update():
     """Create a mock Telegram Update object."""
     update = MagicMock()
     update.effective_chat.id = -1001234567890
-    update.message.reply_text = AsyncMock()
-    update.message.reply_photo = AsyncMock()
-    update.message.reply_document = AsyncMock()
-    update.message.chat_id = -1001234567890
+    # reply_text / reply_photo / reply_document are created lazily as AsyncMocks
+    update.message = _AsyncChildMock(chat_id=-1001234567890)
     return update
 
 
@@ -243,19 +225,20 @@ def mock_context():
 @pytest.fixture
 def mock_callback_query():
     """Create a mock callback query for menu tests."""
-    query = MagicMock()
-    query.data = "menu_main"
-    query.message.chat_id = -1001234567890
-    query.message.chat = MagicMock(id=-1001234567890)
-    query.answer = AsyncMock()
-    query.edit_message_text = AsyncMock()
-    query.message.reply_text = AsyncMock()
+    # answer / edit_message_text / message.reply_text are created lazily as AsyncMocks
+    query = _AsyncChildMock(data="menu_main")
+    query.message = _AsyncChildMock(
+        chat_id=-1001234567890, chat=MagicMock(id=-1001234567890)
+    )
     return query
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_equity_points():
-    """Create sample equity points for chart testing."""
+    """Create sample equity points for chart testing.
+
+    Session-scoped and shared: build a new list instead of mutating this one.
+    """
     from app.models import EquityPoint
 
     base_time = datetime(2026, 1, 20, 9, 0, 0)
@@ -268,9 +251,12 @@ def sample_equity_points():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_chart_stats():
-    """Create sample chart stats for testing."""
+    """Create sample chart stats for testing.
+
+    Session-scoped and shared: use model_copy(update=...) instead of assigning.
+    """
     from app.models import ChartStats
 
     return ChartStats(
@@ -287,9 +273,12 @@ def sample_chart_stats():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_daily_report_data(sample_equity_points, sample_chart_stats):
-    """Create sample daily report data for testing."""
+    """Create sample daily report data for testing.
+
+    Session-scoped and shared: use model_copy(update=...) instead of assigning.
+    """
     from app.models import DailyReportData, TradeHistoryItem
 
     return DailyReportData(
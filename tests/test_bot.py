@@ -4,129 +4,114 @@ Tests for Telegram bot in app/bot/bot.py
 Tests the bot initialization and validation.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.bot import bot as bot_module
+from app.bot.bot import BOT_COMMANDS, TelegramBot, telegram_bot
+
+_BOT_COMMAND_NAMES = frozenset(cmd.command for cmd in BOT_COMMANDS)
+
+
+@pytest.fixture
+def settings_patch(monkeypatch):
+    """Set fields on the real settings object used by app.bot.bot for one test."""
+
+    def _set(**fields):
+        for name, value in fields.items():
+            monkeypatch.setattr(bot_module.settings, name, value)
+
+    return _set
+
+
+@pytest.fixture
+def fresh_bot():
+    """Create an uninitialized TelegramBot."""
+    return TelegramBot()
+
 
 class TestTelegramBot:
     """Tests for TelegramBot class."""
 
     def test_init(self):
         """Test TelegramBot initialization."""
-        from app.bot.bot import TelegramBot
-
         bot = TelegramBot()
         assert bot._app is None
         assert bot._running is False
 
-    def test_is_running_property(self):
+    def test_is_running_property(self, fresh_bot):
         """Test is_running property."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
-        assert bot.is_running is False
+        assert fresh_bot.is_running is False
 
-        bot._running = True
-        assert bot.is_running is True
+        fresh_bot._running = True
+        assert fresh_bot.is_running is True
 
-    def test_app_property_raises_without_init(self):
+    def test_app_property_raises_without_init(self, fresh_bot):
         """Test that app property raises when not initialized."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
         with pytest.raises(RuntimeError, match="not initialized"):
-            _ = bot.app
+            _ = fresh_bot.app
 
-    def test_app_property_returns_app(self):
+    def test_app_property_returns_app(self, fresh_bot):
         """Test that app property returns the application."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
         mock_app = MagicMock()
-        bot._app = mock_app
+        fresh_bot._app = mock_app
 
-        assert bot.app is mock_app
+        assert fresh_bot.app is mock_app
 
-    def test_is_valid_chat_no_effective_chat(self):
+    def test_is_valid_chat_no_effective_chat(self, fresh_bot):
         """Test is_valid_chat returns False when no effective chat."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
         mock_update = MagicMock()
         mock_update.effective_chat = None
 
-        assert bot.is_valid_chat(mock_update) is False
+        assert fresh_bot.is_valid_chat(mock_update) is False
 
-    def test_is_valid_chat_wrong_chat_id(self):
+    def test_is_valid_chat_wrong_chat_id(self, fresh_bot, settings_patch):
         """Test is_valid_chat returns False for wrong chat ID."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
         mock_update = MagicMock()
         mock_update.effective_chat.id = 12345
 
-        with patch("app.bot.bot.settings") as mock_settings:
-            mock_settings.telegram_channel_id = "99999"
-            assert bot.is_valid_chat(mock_update) is False
+        settings_patch(telegram_channel_id="99999")
+        assert fresh_bot.is_valid_chat(mock_update) is False
 
-    def test_is_valid_chat_correct_chat_id(self):
+    def test_is_valid_chat_correct_chat_id(self, fresh_bot, settings_patch):
         """Test is_valid_chat returns True for correct chat ID."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
         mock_update = MagicMock()
         mock_update.effective_chat.id = 12345
 
-        with patch("app.bot.bot.settings") as mock_settings:
-            mock_settings.telegram_channel_id = "12345"
-            assert bot.is_valid_chat(mock_update) is True
+        settings_patch(telegram_channel_id="12345")
+        assert fresh_bot.is_valid_chat(mock_update) is True
 
     @pytest.mark.asyncio
-    async def test_initialize_without_token(self):
+    async def test_initialize_without_token(self, fresh_bot, settings_patch):
         """Test initialize logs warning when no token."""
-        from app.bot.bot import TelegramBot
+        settings_patch(telegram_bot_token="")
+        await fresh_bot.initialize()
 
-        bot = TelegramBot()
-
-        with patch("app.bot.bot.settings") as mock_settings:
-            mock_settings.telegram_bot_token = ""
-
-            await bot.initialize()
-
-            assert bot._app is None
+        assert fresh_bot._app is None
 
     @pytest.mark.asyncio
-    async def test_start_without_app(self):
+    async def test_start_without_app(self, fresh_bot):
         """Test start does nothing when app not initialized."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
         # Should not raise
-        await bot.start()
-        assert bot._running is False
+        await fresh_bot.start()
+        assert fresh_bot._running is False
 
     @pytest.mark.asyncio
-    async def test_stop_without_app(self):
+    async def test_stop_without_app(self, fresh_bot):
         """Test stop does nothing when app not initialized."""
-        from app.bot.bot import TelegramBot
-
-        bot = TelegramBot()
         # Should not raise
-        await bot.stop()
-        assert bot._running is False
+        await fresh_bot.stop()
+        assert fresh_bot._running is False
 
     @pytest.mark.asyncio
-    async def test_stop_when_not_running(self):
+    async def test_stop_when_not_running(self, fresh_bot):
         """Test stop does nothing when not running."""
-        from app.bot.bot import TelegramBot
+        fresh_bot._app = MagicMock()
+        fresh_bot._running = False
 
-        bot = TelegramBot()
-        bot._app = MagicMock()
-        bot._running = False
-
-        await bot.stop()
-        assert bot._running is False
+        await fresh_bot.stop()
+        assert fresh_bot._running is False
 
 
 class TestBotCommands:
@@ -134,26 +119,14 @@ class TestBotCommands:
 
     def test_bot_commands_defined(self):
         """Test that BOT_COMMANDS is properly defined."""
-        from app.bot.bot import BOT_COMMANDS
-
         assert len(BOT_COMMANDS) > 0
 
-    def test_bot_commands_have_menu(self):
-        """Test that menu command is in BOT_COMMANDS."""
-        from app.bot.bot import BOT_COMMANDS
-
-        commands = [cmd.command for cmd in BOT_COMMANDS]
-        assert "menu" in commands
-
-    def test_bot_commands_have_required_commands(self):
-        """Test that all required commands are defined."""
-        from app.bot.bot import BOT_COMMANDS
-
-        commands = [cmd.command for cmd in BOT_COMMANDS]
-        required = ["menu", "ping", "status", "stats", "pnl", "help"]
-
-        for cmd in required:
-            assert cmd in commands, f"Missing command: {cmd}"
+    @pytest.mark.parametrize(
+        "name", ["menu", "ping", "status", "stats", "pnl", "help"]
+    )
+    def test_required_command(self, name):
+        """Test that each required command is defined."""
+        assert name in _BOT_COMMAND_NAMES, f"Missing command: {name}"
 
 
 class TestGlobalBotInstance:
@@ -161,12 +134,8 @@ class TestGlobalBotInstance:
 
     def test_global_instance_exists(self):
         """Test that global telegram_bot instance exists."""
-        from app.bot.bot import telegram_bot
-
         assert telegram_bot is not None
 
     def test_global_instance_is_telegram_bot(self):
         """Test that global instance is TelegramBot."""
-        from app.bot.bot import telegram_bot, TelegramBot
-
         assert isinstance(telegram_bot, TelegramBot)
@@ -7,14 +7,51 @@ Bug categories prevented:
 - Percentage conversion errors (0.1% stored as 0.1 vs 0.001)
 """
 
+import copy
 import pytest
 import tempfile
-import yaml
 from pathlib import Path
 
 from app.config import ExchangeFees, ExchangeConfig
 
 
+@pytest.fixture(scope="module")
+def temp_config_file():
+    """Create a temporary config file shared by every test in this module."""
+    # JSON is valid YAML, so safe_load reads it and no emitter is needed
+    config_text = (
+        '{"default_fee_type": "taker", "exchanges": {'
+        '"binance": {"maker_fee": 0.1, "taker_fee": 0.1}, '
+        '"bybit": {"maker_fee": 0.075, "taker_fee": 0.1}, '
+        '"okx": {"maker_fee": 0.08, "taker_fee": 0.1}}}'
+    )
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".yaml", delete=False
+    ) as f:
+        f.write(config_text)
+        temp_path = f.name
+
+    yield temp_path
+
+    # Cleanup
+    Path(temp_path).unlink(missing_ok=True)
+
+
+@pytest.fixture(scope="module")
+def shared_config(temp_config_file):
+    """ExchangeConfig parsed once per module; treat as read-only."""
+    return ExchangeConfig(config_path=temp_config_file)
+
+
+@pytest.fixture
+def config_copy(shared_config):
+    """Per-test copy of shared_config for tests that mutate it."""
+    config = copy.copy(shared_config)
+    config.precisions = {}
+    return config
+
+
 class TestExchangeFees:
     """
     Tests for ExchangeFees class.
@@ -36,18 +73,11 @@ class TestExchangeFees:
     @pytest.mark.parametrize(
         "maker_pct,taker_pct,expected_maker,expected_taker",
         [
-            (0.1, 0.1, 0.001, 0.001),  # Standard 0.1%
-            (0.075, 0.1, 0.00075, 0.001),  # VIP maker, regular taker
-            (0.02, 0.04, 0.0002, 0.0004),  # VIP tier
-            (0.0, 0.1, 0.0, 0.001),  # Zero maker rebate
-            (1.0, 1.0, 0.01, 0.01),  # 1% fees (rare but possible)
-        ],
-        ids=[
-            "standard-0.1%",
-            "vip-maker",
-            "vip-tier",
-            "zero-maker",
-            "high-1%",
+            pytest.param(0.1, 0.1, 0.001, 0.001, id="standard-0.1%"),
+            pytest.param(0.075, 0.1, 0.00075, 0.001, id="vip-maker"),  # VIP maker, regular taker
+            pytest.param(0.02, 0.04, 0.0002, 0.0004, id="vip-tier"),
+            pytest.param(0.0, 0.1, 0.0, 0.001, id="zero-maker"),  # Zero maker rebate
+            pytest.param(1.0, 1.0, 0.01, 0.01, id="high-1%"),  # Rare but possible
         ],
     )
     def test_various_fee_tiers(self, maker_pct, taker_pct, expected_maker, expected_taker):
@@ -86,48 +116,25 @@ class TestExchangeConfig:
     or exchange not in config returns wrong default.
     """
 
-    @pytest.fixture
-    def temp_config_file(self):
-        """Create a temporary config file for testing."""
-        config_data = {
-            "default_fee_type": "taker",
-            "exchanges": {
-                "binance": {"maker_fee": 0.1, "taker_fee": 0.1},
-                "bybit": {"maker_fee": 0.075, "taker_fee": 0.1},
-                "okx": {"maker_fee": 0.08, "taker_fee": 0.1},
-            },
-        }
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".yaml", delete=False
-        ) as f:
-            yaml.dump(config_data, f)
-            temp_path = f.name
-
-        yield temp_path
-
-        # Cleanup
-        Path(temp_path).unlink(missing_ok=True)
-
-    def test_load_config_from_yaml(self, temp_config_file):
+    def test_load_config_from_yaml(self, shared_config):
         """Verify config loads correctly from YAML file."""
-        config = ExchangeConfig(config_path=temp_config_file)
+        config = shared_config
 
         assert "binance" in config.exchanges
         assert "bybit" in config.exchanges
         assert "okx" in config.exchanges
 
-    def test_get_exchange_fees(self, temp_config_file):
+    def test_get_exchange_fees(self, shared_config):
         """Verify get_exchange_fees returns correct ExchangeFees object."""
-        config = ExchangeConfig(config_path=temp_config_file)
+        config = shared_config
 
         fees = config.get_exchange_fees("binance")
         assert fees is not None
         assert fees.taker_fee == pytest.approx(0.001, abs=1e-10)
 
-    def test_get_exchange_fees_case_insensitive(self, temp_config_file):
+    def test_get_exchange_fees_case_insensitive(self, shared_config):
         """Verify exchange name lookup is case-insensitive."""
-        config = ExchangeConfig(config_path=temp_config_file)
+        config = shared_config
 
         fees_lower = config.get_exchange_fees("binance")
         fees_upper = config.get_exchange_fees("BINANCE")
@@ -138,16 +145,16 @@ class TestExchangeConfig:
         assert fees_mixed is not None
         assert fees_lower.taker_fee == fees_upper.taker_fee == fees_mixed.taker_fee
 
-    def test_get_exchange_fees_unknown_exchange(self, temp_config_file):
+    def test_get_exchange_fees_unknown_exchange(self, shared_config):
         """Verify unknown exchange returns None."""
-        config = ExchangeConfig(config_path=temp_config_file)
+        config = shared_config
 
         fees = config.get_exchange_fees("unknown_exchange")
         assert fees is None
 
-    def test_get_fee_rate_uses_default_fee_type(self, temp_config_file):
+    def test_get_fee_rate_uses_default_fee_type(self, shared_config):
         """Verify get_fee_rate uses default_fee_type when not specified."""
-        config = ExchangeConfig(config_path=temp_config_file)
+        config = shared_config
 
         # Config has default_fee_type: "taker"
         rate = config.get_fee_rate("bybit")
@@ -155,9 +162,9 @@ class TestExchangeConfig:
         # Bybit taker: 0.1% = 0.001
         assert rate == pytest.approx(0.001, abs=1e-10)
 
-    def test_get_fee_rate_with_explicit_type(self, temp_config_file):
+    def test_get_fee_rate_with_explicit_type(self, shared_config):
         """Verify get_fee_rate uses explicit fee_type when provided."""
-        config = ExchangeConfig(config_path=temp_config_file)
+        config = shared_config
 
         maker_rate = config.get_fee_rate("bybit", fee_type="maker")
         taker_rate = config.get_fee_rate("bybit", fee_type="taker")
@@ -167,19 +174,49 @@ class TestExchangeConfig:
         # Bybit taker: 0.1% = 0.001
         assert taker_rate == pytest.approx(0.001, abs=1e-10)
 
-    def test_get_fee_rate_unknown_exchange_returns_default(self, temp_config_file):
+    def test_get_fee_rate_unknown_exchange_returns_default(self, shared_config):
         """
         Verify unknown exchange returns default fee rate (0.1%).
 
         Bug prevented: App crashes or uses 0 fees for unknown exchange.
         """
-        config = ExchangeConfig(config_path=temp_config_file)
+        config = shared_config
 
         rate = config.get_fee_rate("unknown_exchange")
 
         # Default is 0.001 (0.1%)
         assert rate == pytest.approx(0.001, abs=1e-10)
 
+    def test_get_fee_rate_per_instance(self, shared_config, tmp_path):
+        """
+        Verify each ExchangeConfig answers from its own fee table.
+
+        Bug prevented: A class-wide fee cache keeping configs alive or mixing
+        up rates between instances.
+        """
+        other_path = tmp_path / "config.yaml"
+        other_path.write_text(
+            '{"exchanges": {"bybit": {"maker_fee": 0.02, "taker_fee": 0.055}}}'
+        )
+        other = ExchangeConfig(config_path=str(other_path))
+
+        assert other.get_fee_rate("Bybit") == pytest.approx(0.00055, abs=1e-10)
+        assert shared_config.get_fee_rate("bybit") == pytest.approx(0.001, abs=1e-10)
+        assert other.get_fee_rate("bybit", fee_type="maker") == pytest.approx(0.0002, abs=1e-10)
+
+    def test_qty_precision_remembered_per_symbol(self, config_copy):
+        """Verify stored precisions are returned case-insensitively and misses are None."""
+        config = config_copy
+
+        assert config.get_qty_precision("binance", "BTC", "USDT") is None
+        assert config.is_qty_precision_stale("binance", "BTC", "USDT") is True
+
+        config.set_qty_precision("Binance", "btc", "usdt", 5)
+
+        assert config.get_qty_precision("binance", "BTC", "USDT") == 5
+        assert config.is_qty_precision_stale("binance", "BTC", "USDT") is False
+        assert config.get_qty_precision("bybit", "BTC", "USDT") is None
+
     def test_missing_config_file_raises(self):
         """Verify missing config file raises FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
@@ -191,27 +228,7 @@ class TestFeeCalculationIntegration:
     Integration tests for fee calculations in trade scenarios.
     """
 
-    @pytest.fixture
-    def config(self):
-        """Create config with test data."""
-        config_data = {
-            "default_fee_type": "taker",
-            "exchanges": {
-                "binance": {"maker_fee": 0.1, "taker_fee": 0.1},
-            },
-        }
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".yaml", delete=False
-        ) as f:
-            yaml.dump(config_data, f)
-            temp_path = f.name
-
-        yield ExchangeConfig(config_path=temp_path)
-
-        Path(temp_path).unlink(missing_ok=True)
-
-    def test_fee_on_trade(self, config):
+    def test_fee_on_trade(self, shared_config):
         """
         Verify fee calculation on a trade.
 
@@ -220,12 +237,12 @@ class TestFeeCalculationIntegration:
         Expected fee: $5.00
         """
         notional = 50000.0 * 0.1  # $5,000
-        fee_rate = config.get_fee_rate("binance")
+        fee_rate = shared_config.get_fee_rate("binance")
         fee = notional * fee_rate
 
         assert fee == pytest.approx(5.0, abs=0.01)
 
-    def test_fee_total_for_round_trip(self, config):
+    def test_fee_total_for_round_trip(self, shared_config):
         """
         Verify total fees for entry + exit (round trip).
 
@@ -237,7 +254,7 @@ class TestFeeCalculationIntegration:
         Exit fee: $5.10
         Total fees: $10.10
         """
-        fee_rate = config.get_fee_rate("binance")
+        fee_rate = shared_config.get_fee_rate("binance")
 
         entry_notional = 50000.0 * 0.1
         exit_notional = 51000.0 * 0.1
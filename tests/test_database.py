@@ -4,11 +4,17 @@ Tests for database operations in app/database.py
 Covers all period-based query methods for consistency across commands.
 """
 
-from datetime import datetime, timedelta
-
 import pytest
 import pytest_asyncio
 
+from .conftest import TODAY, YESTERDAY
+
+
+async def _fetch_one(conn, sql, params=()):
+    """Run a query and return its first row, in one aiosqlite round trip."""
+    rows = await conn.execute_fetchall(sql, params)
+    return rows[0] if rows else None
+
 
 class TestDatabaseConnection:
     """Tests for database connection and initialization."""
@@ -21,60 +27,147 @@ class TestDatabaseConnection:
     @pytest.mark.asyncio
     async def test_tables_created(self, test_db):
         """Test that all required tables are created."""
-        cursor = await test_db.connection.execute(
+        tables = await test_db.connection.execute_fetchall(
             "SELECT name FROM sqlite_master WHERE type='table'"
         )
-        tables = await cursor.fetchall()
         table_names = [row["name"] for row in tables]
 
         assert "trades" in table_names
         assert "pyramids" in table_names
         assert "daily_reports" in table_names
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", [
+        "get_period_aggregates", "get_best_pairs_for_period", "get_worst_pairs_for_period",
+    ])
+    @pytest.mark.parametrize("period", [
+        pytest.param((TODAY, TODAY), id="range"),
+        pytest.param((None, None), id="all-time"),
+    ])
+    async def test_period_queries_use_covering_index(self, test_db, method, period):
+        """Test the SQL period methods issue is answered from the index alone."""
+        statements = []
+        await test_db.connection.set_trace_callback(statements.append)
+        try:
+            await getattr(test_db, method)(*period)
+        finally:
+            await test_db.connection.set_trace_callback(None)
 
-class TestGetRealizedPnlForPeriod:
-    """Tests for get_realized_pnl_for_period method."""
+        queries = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+        assert len(queries) == 1
+
+        rows = await test_db.connection.execute_fetchall("EXPLAIN QUERY PLAN " + queries[0])
+        plan = " ".join(row["detail"] for row in rows)
+
+        assert "USING COVERING INDEX idx_trades_closed_period" in plan
 
     @pytest.mark.asyncio
-    async def test_all_time_pnl(self, populated_db):
-        """Test getting all-time realized PnL."""
-        pnl, count = await populated_db.get_realized_pnl_for_period(None, None)
+    async def test_connect_in_memory_skips_data_directory(self):
+        """Test that an in-memory database never creates the data directory."""
+        from unittest.mock import patch
+        from app.database import Database
 
-        # 6 closed trades total
-        assert count == 6
-        # Sum: 100.50 - 30.25 + 50 + 200 - 75.50 + 150 = 394.75
-        assert abs(pnl - 394.75) < 0.01
+        db = Database(db_path=":memory:")
+        with patch("app.database.ensure_data_directory") as mock_ensure:
+            await db.connect()
+        try:
+            mock_ensure.assert_not_called()
+        finally:
+            await db.disconnect()
 
     @pytest.mark.asyncio
-    async def test_today_pnl(self, populated_db):
-        """Test getting today's realized PnL."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        pnl, count = await populated_db.get_realized_pnl_for_period(today, today)
+    async def test_connect_enables_wal(self, tmp_path):
+        """Test that connect switches the database to WAL with NORMAL sync."""
+        from unittest.mock import patch
+        from app.database import Database
+
+        # test_db overrides these PRAGMAs for speed, so connect a fresh database
+        db = Database(db_path=str(tmp_path / "wal.db"))
+        with patch("app.database.ensure_data_directory"):
+            await db.connect()
+        try:
+            row = await _fetch_one(db.connection, "PRAGMA journal_mode")
+            assert row[0] == "wal"
 
-        # 3 trades closed today
-        assert count == 3
-        # Sum: 100.50 - 30.25 + 50 = 120.25
-        assert abs(pnl - 120.25) < 0.01
+            row = await _fetch_one(db.connection, "PRAGMA synchronous")
+            assert row[0] == 1  # NORMAL
+        finally:
+            await db.disconnect()
+
+
+class TestGetPeriodAggregates:
+    """Tests for get_period_aggregates method."""
 
     @pytest.mark.asyncio
-    async def test_yesterday_pnl(self, populated_db):
-        """Test getting yesterday's realized PnL."""
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        pnl, count = await populated_db.get_realized_pnl_for_period(yesterday, yesterday)
+    async def test_all_time_aggregates(self, populated_db):
+        """Test every aggregate over all closed trades."""
+        agg = await populated_db.get_period_aggregates(None, None)
 
-        # 2 trades closed yesterday
-        assert count == 2
-        # Sum: 200 - 75.50 = 124.50
-        assert abs(pnl - 124.50) < 0.01
+        assert agg["total_trades"] == 6
+        assert agg["total_pnl"] == pytest.approx(394.75, abs=0.01)
+        # Wins: 100.50 + 50 + 200 + 150; losses: -30.25 - 75.50
+        assert agg["win_count"] == 4
+        assert agg["loss_count"] == 2
+        assert agg["win_sum"] == pytest.approx(500.50, abs=0.01)
+        assert agg["loss_sum"] == pytest.approx(-105.75, abs=0.01)
+        assert agg["best_trade"] == 200.0
+        assert agg["worst_trade"] == -75.50
 
     @pytest.mark.asyncio
-    async def test_no_trades_period(self, populated_db):
-        """Test getting PnL for period with no trades."""
-        far_future = "2030-01-01"
-        pnl, count = await populated_db.get_realized_pnl_for_period(far_future, far_future)
+    async def test_no_trades_aggregates(self, populated_db):
+        """Test aggregates for a period with no trades are all zero."""
+        agg = await populated_db.get_period_aggregates("2030-01-01", "2030-01-01")
 
-        assert count == 0
-        assert pnl == 0.0
+        assert agg["total_trades"] == 0
+        assert agg["total_pnl"] == 0.0
+        assert agg["best_trade"] == 0.0
+        assert agg["worst_trade"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_null_pnl_counted_as_flat_trade(self, test_db):
+        """Test a closed trade without PnL counts as a flat trade."""
+        await test_db.connection.execute(
+            """
+            INSERT INTO trades (id, exchange, base, quote, status, timeframe,
+                               total_pnl_usdt, created_at, closed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            ("null_pnl", "binance", "BTC", "USDT", "closed", "1h",
+             None, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
+        )
+        await test_db.connection.commit()
+
+        pnl, count = await test_db.get_realized_pnl_for_period(None, None)
+        stats = await test_db.get_statistics_for_period(None, None)
+
+        assert (pnl, count) == (0.0, 1)
+        assert stats["total_trades"] == 1
+        assert stats["win_rate"] == 0
+        assert stats["best_trade"] == 0.0
+
+
+class TestGetRealizedPnlForPeriod:
+    """Tests for get_realized_pnl_for_period method."""
+
+    @pytest.mark.parametrize(
+        "start,end,expected_count,expected_pnl",
+        [
+            # 6 closed trades: 100.50 - 30.25 + 50 + 200 - 75.50 + 150
+            pytest.param(None, None, 6, 394.75, id="all-time"),
+            # 3 closed today: 100.50 - 30.25 + 50
+            pytest.param(TODAY, TODAY, 3, 120.25, id="today"),
+            # 2 closed yesterday: 200 - 75.50
+            pytest.param(YESTERDAY, YESTERDAY, 2, 124.50, id="yesterday"),
+            pytest.param("2030-01-01", "2030-01-01", 0, 0.0, id="no-trades"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_period_pnl(self, populated_db, start, end, expected_count, expected_pnl):
+        """Test realized PnL and trade count for a period."""
+        pnl, count = await populated_db.get_realized_pnl_for_period(start, end)
+
+        assert count == expected_count
+        assert pnl == pytest.approx(expected_pnl, abs=0.01)
 
 
 class TestGetStatisticsForPeriod:
@@ -87,19 +180,18 @@ class TestGetStatisticsForPeriod:
 
         assert stats["total_trades"] == 6
         assert stats["win_rate"] > 0  # 4 wins out of 6
-        assert abs(stats["total_pnl"] - 394.75) < 0.01
+        assert stats["total_pnl"] == pytest.approx(394.75, abs=0.01)
         assert stats["best_trade"] == 200.0
         assert stats["worst_trade"] == -75.50
 
     @pytest.mark.asyncio
     async def test_today_stats(self, populated_db):
         """Test getting today's statistics."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        stats = await populated_db.get_statistics_for_period(today, today)
+        stats = await populated_db.get_statistics_for_period(TODAY, TODAY)
 
         assert stats["total_trades"] == 3
         # 2 wins, 1 loss = 66.67% win rate
-        assert abs(stats["win_rate"] - 66.67) < 1
+        assert stats["win_rate"] == pytest.approx(66.67, abs=1)
 
     @pytest.mark.asyncio
     async def test_no_trades_stats(self, populated_db):
@@ -115,8 +207,7 @@ class TestGetStatisticsForPeriod:
     @pytest.mark.asyncio
     async def test_profit_factor_calculation(self, populated_db):
         """Test profit factor is calculated correctly."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        stats = await populated_db.get_statistics_for_period(today, today)
+        stats = await populated_db.get_statistics_for_period(TODAY, TODAY)
 
         # Profit factor = total wins / total losses
         # Wins: 100.50 + 50 = 150.50
@@ -127,14 +218,13 @@ class TestGetStatisticsForPeriod:
     @pytest.mark.asyncio
     async def test_avg_win_loss(self, populated_db):
         """Test average win and loss calculations."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        stats = await populated_db.get_statistics_for_period(today, today)
+        stats = await populated_db.get_statistics_for_period(TODAY, TODAY)
 
         # 2 wins: (100.50 + 50) / 2 = 75.25
-        assert abs(stats["avg_win"] - 75.25) < 0.01
+        assert stats["avg_win"] == pytest.approx(75.25, abs=0.01)
 
         # 1 loss: -30.25
-        assert abs(stats["avg_loss"] - (-30.25)) < 0.01
+        assert stats["avg_loss"] == pytest.approx(-30.25, abs=0.01)
 
 
 class TestGetBestPairsForPeriod:
@@ -149,18 +239,17 @@ class TestGetBestPairsForPeriod:
         # Best pair should be BTC/USDT with highest total PnL
         assert pairs[0]["pair"] == "BTC/USDT"
         # BTC/USDT: 100.50 + 200 = 300.50
-        assert abs(pairs[0]["pnl"] - 300.50) < 0.01
+        assert pairs[0]["pnl"] == pytest.approx(300.50, abs=0.01)
 
     @pytest.mark.asyncio
     async def test_today_best_pairs(self, populated_db):
         """Test getting today's best pairs."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        pairs = await populated_db.get_best_pairs_for_period(today, today, limit=5)
+        pairs = await populated_db.get_best_pairs_for_period(TODAY, TODAY, limit=5)
 
         assert len(pairs) == 3
         # Best today: BTC/USDT with 100.50
         assert pairs[0]["pair"] == "BTC/USDT"
-        assert abs(pairs[0]["pnl"] - 100.50) < 0.01
+        assert pairs[0]["pnl"] == pytest.approx(100.50, abs=0.01)
 
     @pytest.mark.asyncio
     async def test_limit_respected(self, populated_db):
@@ -180,37 +269,85 @@ class TestGetWorstPairsForPeriod:
         assert len(pairs) > 0
         # Worst pair should be DOGE/USDT with -75.50
         assert pairs[0]["pair"] == "DOGE/USDT"
-        assert abs(pairs[0]["pnl"] - (-75.50)) < 0.01
+        assert pairs[0]["pnl"] == pytest.approx(-75.50, abs=0.01)
 
     @pytest.mark.asyncio
     async def test_today_worst_pairs(self, populated_db):
         """Test getting today's worst pairs."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        pairs = await populated_db.get_worst_pairs_for_period(today, today, limit=5)
+        pairs = await populated_db.get_worst_pairs_for_period(TODAY, TODAY, limit=5)
 
         assert len(pairs) == 3
         # Worst today: ETH/USDT with -30.25
         assert pairs[0]["pair"] == "ETH/USDT"
-        assert abs(pairs[0]["pnl"] - (-30.25)) < 0.01
+        assert pairs[0]["pnl"] == pytest.approx(-30.25, abs=0.01)
 
 
-class TestGetTradesForPeriod:
-    """Tests for get_trades_for_period method."""
+class TestPeriodQueryCache:
+    """Tests for caching of period statistics and pair rankings."""
 
     @pytest.mark.asyncio
-    async def test_all_time_trades(self, populated_db):
-        """Test getting all closed trades."""
-        trades = await populated_db.get_trades_for_period(None, None, limit=50)
+    async def test_repeat_call_served_from_cache(self, populated_db):
+        """Test that a repeated period query is answered from the cache."""
+        first = await populated_db.get_statistics_for_period(TODAY, TODAY)
+        await populated_db.get_best_pairs_for_period(TODAY, TODAY, limit=5)
+        assert len(populated_db._query_cache) == 2
 
-        assert len(trades) == 6  # All closed trades
+        second = await populated_db.get_statistics_for_period(TODAY, TODAY)
+        assert second == first
 
     @pytest.mark.asyncio
-    async def test_today_trades(self, populated_db):
-        """Test getting today's trades."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        trades = await populated_db.get_trades_for_period(today, today, limit=50)
+    async def test_write_invalidates_cache(self, populated_db):
+        """Test that writes on the raw connection invalidate cached results."""
+        stats = await populated_db.get_statistics_for_period(None, None)
+        worst = await populated_db.get_worst_pairs_for_period(None, None, limit=1)
+        assert worst[0]["pair"] == "DOGE/USDT"
 
-        assert len(trades) == 3
+        await populated_db.connection.execute(
+            """
+            INSERT INTO trades (id, exchange, base, quote, status, timeframe,
+                               total_pnl_usdt, created_at, closed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            ("cache_trade", "binance", "XRP", "USDT", "closed", "1h",
+             -500.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
+        )
+        await populated_db.connection.commit()
+
+        updated = await populated_db.get_statistics_for_period(None, None)
+        assert updated["total_trades"] == stats["total_trades"] + 1
+        worst = await populated_db.get_worst_pairs_for_period(None, None, limit=1)
+        assert worst[0]["pair"] == "XRP/USDT"
+
+    @pytest.mark.asyncio
+    async def test_returned_results_are_copies(self, populated_db):
+        """Test that mutating a returned result does not alter the cache."""
+        stats = await populated_db.get_statistics_for_period(None, None)
+        stats["total_trades"] = -1
+        pairs = await populated_db.get_best_pairs_for_period(None, None, limit=5)
+        pairs[0]["pnl"] = 0.0
+
+        stats = await populated_db.get_statistics_for_period(None, None)
+        pairs = await populated_db.get_best_pairs_for_period(None, None, limit=5)
+        assert stats["total_trades"] == 6
+        assert pairs[0]["pnl"] == pytest.approx(300.50, abs=0.01)
+
+
+class TestGetTradesForPeriod:
+    """Tests for get_trades_for_period method."""
+
+    @pytest.mark.parametrize(
+        "start,end,expected",
+        [
+            pytest.param(None, None, 6, id="all-time"),  # All closed trades
+            pytest.param(TODAY, TODAY, 3, id="today"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_period_trades(self, populated_db, start, end, expected):
+        """Test getting the closed trades for a period."""
+        trades = await populated_db.get_trades_for_period(start, end, limit=50)
+
+        assert len(trades) == expected
 
     @pytest.mark.asyncio
     async def test_trades_sorted_by_date(self, populated_db):
@@ -243,8 +380,7 @@ class TestGetDrawdownForPeriod:
     @pytest.mark.asyncio
     async def test_today_drawdown(self, populated_db):
         """Test getting today's drawdown."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        dd_data = await populated_db.get_drawdown_for_period(today, today)
+        dd_data = await populated_db.get_drawdown_for_period(TODAY, TODAY)
 
         assert dd_data["trade_count"] == 3
 
@@ -266,12 +402,11 @@ class TestGetDrawdownForPeriod:
     @pytest.mark.asyncio
     async def test_drawdown_calculation(self, populated_db):
         """Test that drawdown is calculated as peak - current."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        dd_data = await populated_db.get_drawdown_for_period(today, today)
+        dd_data = await populated_db.get_drawdown_for_period(TODAY, TODAY)
 
         # Current drawdown = peak - current equity
         expected_current_dd = dd_data["peak"] - dd_data["current_equity"]
-        assert abs(dd_data["current_drawdown"] - expected_current_dd) < 0.01
+        assert dd_data["current_drawdown"] == pytest.approx(expected_current_dd, abs=0.01)
 
 
 class TestGetStreakForPeriod:
@@ -289,8 +424,7 @@ class TestGetStreakForPeriod:
     @pytest.mark.asyncio
     async def test_today_streak(self, populated_db):
         """Test getting today's streak data."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        streak_data = await populated_db.get_streak_for_period(today, today)
+        streak_data = await populated_db.get_streak_for_period(TODAY, TODAY)
 
         # Today has: win, loss, win - current streak should be 1 win
         # (assuming trades are ordered by time)
@@ -324,8 +458,7 @@ class TestGetExchangeStatsForPeriod:
     @pytest.mark.asyncio
     async def test_today_exchange_stats(self, populated_db):
         """Test getting today's exchange statistics."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        stats = await populated_db.get_exchange_stats_for_period(today, today)
+        stats = await populated_db.get_exchange_stats_for_period(TODAY, TODAY)
 
         assert len(stats) == 2
         # Binance today: 100.50 - 30.25 = 70.25 (2 trades)
@@ -334,71 +467,51 @@ class TestGetExchangeStatsForPeriod:
         for stat in stats:
             if stat["exchange"] == "binance":
                 assert stat["trades"] == 2
-                assert abs(stat["pnl"] - 70.25) < 0.01
+                assert stat["pnl"] == pytest.approx(70.25, abs=0.01)
             elif stat["exchange"] == "bybit":
                 assert stat["trades"] == 1
-                assert abs(stat["pnl"] - 50.0) < 0.01
+                assert stat["pnl"] == pytest.approx(50.0, abs=0.01)
 
 
 class TestGetTradeCountsForDate:
     """Tests for get_trade_counts_for_date method."""
 
+    @pytest.mark.parametrize(
+        "date,expected_opened,expected_closed",
+        [
+            # 4 created today (3 closed + 1 open), 3 closed today
+            pytest.param(TODAY, 4, 3, id="today"),
+            pytest.param(YESTERDAY, 2, 2, id="yesterday"),
+        ],
+    )
     @pytest.mark.asyncio
-    async def test_today_trade_counts(self, populated_db):
-        """Test getting today's trade count breakdown."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        counts = await populated_db.get_trade_counts_for_date(today)
-
-        assert "opened_today" in counts
-        assert "closed_today" in counts
-
-        # 4 trades created today (3 closed + 1 open)
-        assert counts["opened_today"] == 4
-        # 3 trades closed today
-        assert counts["closed_today"] == 3
-
-    @pytest.mark.asyncio
-    async def test_yesterday_trade_counts(self, populated_db):
-        """Test getting yesterday's trade count breakdown."""
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        counts = await populated_db.get_trade_counts_for_date(yesterday)
+    async def test_trade_counts(self, populated_db, date, expected_opened, expected_closed):
+        """Test getting the opened/closed trade count breakdown for a date."""
+        counts = await populated_db.get_trade_counts_for_date(date)
 
-        # 2 trades created yesterday
-        assert counts["opened_today"] == 2
-        # 2 trades closed yesterday
-        assert counts["closed_today"] == 2
+        assert counts["opened_today"] == expected_opened
+        assert counts["closed_today"] == expected_closed
 
 
 class TestGetCumulativePnlBeforeDate:
     """Tests for get_cumulative_pnl_before_date method."""
 
+    @pytest.mark.parametrize(
+        "date,expected",
+        [
+            # Yesterday (200 - 75.50) + week ago (150)
+            pytest.param(TODAY, 274.50, id="before-today"),
+            # Only the week-old trade
+            pytest.param(YESTERDAY, 150.0, id="before-yesterday"),
+            pytest.param("2020-01-01", 0.0, id="before-first-trade"),
+        ],
+    )
     @pytest.mark.asyncio
-    async def test_cumulative_before_today(self, populated_db):
-        """Test getting cumulative PnL before today."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        cumulative = await populated_db.get_cumulative_pnl_before_date(today)
-
-        # Yesterday: 200 - 75.50 = 124.50
-        # Week ago: 150
-        # Total before today: 274.50
-        assert abs(cumulative - 274.50) < 0.01
-
-    @pytest.mark.asyncio
-    async def test_cumulative_before_yesterday(self, populated_db):
-        """Test getting cumulative PnL before yesterday."""
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        cumulative = await populated_db.get_cumulative_pnl_before_date(yesterday)
-
-        # Only week-old trade: 150
-        assert abs(cumulative - 150.0) < 0.01
-
-    @pytest.mark.asyncio
-    async def test_cumulative_before_first_trade(self, populated_db):
-        """Test cumulative PnL before any trades."""
-        very_old = "2020-01-01"
-        cumulative = await populated_db.get_cumulative_pnl_before_date(very_old)
+    async def test_cumulative_before(self, populated_db, date, expected):
+        """Test cumulative PnL of trades closed before a date."""
+        cumulative = await populated_db.get_cumulative_pnl_before_date(date)
 
-        assert cumulative == 0.0
+        assert cumulative == pytest.approx(expected, abs=0.01)
 
 
 class TestGetEquityCurveData:
@@ -407,8 +520,7 @@ class TestGetEquityCurveData:
     @pytest.mark.asyncio
     async def test_today_equity_curve(self, populated_db):
         """Test getting today's equity curve data."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        data = await populated_db.get_equity_curve_data(today)
+        data = await populated_db.get_equity_curve_data(TODAY)
 
         # 3 closed trades today
         assert len(data) == 3
@@ -475,14 +587,15 @@ class TestSaveDailyReport:
         )
 
         # Verify it was saved
-        cursor = await test_db.connection.execute(
-            "SELECT * FROM daily_reports WHERE date = ?", (date,)
+        row = await _fetch_one(
+            test_db.connection,
+            "SELECT total_trades, total_pnl_usdt FROM daily_reports WHERE date = ?",
+            (date,),
         )
-        row = await cursor.fetchone()
 
         assert row is not None
         assert row["total_trades"] == 5
-        assert abs(row["total_pnl_usdt"] - 250.0) < 0.01
+        assert row["total_pnl_usdt"] == pytest.approx(250.0, abs=0.01)
 
     @pytest.mark.asyncio
     async def test_update_existing_report(self, test_db):
@@ -510,18 +623,15 @@ class TestSaveDailyReport:
         )
 
         # Verify only one record exists with updated values
-        cursor = await test_db.connection.execute(
-            "SELECT COUNT(*) as count FROM daily_reports WHERE date = ?", (date,)
+        rows = await test_db.connection.execute_fetchall(
+            "SELECT total_trades, total_pnl_usdt FROM daily_reports WHERE date = ?",
+            (date,),
         )
-        row = await cursor.fetchone()
-        assert row["count"] == 1
+        assert len(rows) == 1
 
-        cursor = await test_db.connection.execute(
-            "SELECT * FROM daily_reports WHERE date = ?", (date,)
-        )
-        row = await cursor.fetchone()
+        row = rows[0]
         assert row["total_trades"] == 5
-        assert abs(row["total_pnl_usdt"] - 200.0) < 0.01
+        assert row["total_pnl_usdt"] == pytest.approx(200.0, abs=0.01)
 
 
 class TestGetRecentTrades:
@@ -602,6 +712,23 @@ class TestAlertIdempotency:
         is_processed = await test_db.is_alert_processed("test_alert_2")
         assert is_processed is True
 
+    @pytest.mark.asyncio
+    async def test_mark_alerts_processed_batch(self, test_db):
+        """Test marking several alerts at once, ignoring repeats."""
+        await test_db.mark_alert_processed("batch_alert_1")
+        await test_db.mark_alerts_processed(
+            ["batch_alert_1", "batch_alert_2", "batch_alert_2"]
+        )
+
+        rows = await test_db.connection.execute_fetchall(
+            "SELECT alert_id FROM processed_alerts WHERE alert_id IN (?, ?)",
+            ("batch_alert_1", "batch_alert_2"),
+        )
+        assert sorted(row["alert_id"] for row in rows) == [
+            "batch_alert_1",
+            "batch_alert_2",
+        ]
+
 
 class TestCreateTrade:
     """Tests for create_trade method."""
@@ -637,15 +764,32 @@ class TestCloseTrade:
         assert trade is None  # Should not find open trade
 
         # Verify in database
-        cursor = await test_db.connection.execute(
-            "SELECT * FROM trades WHERE id = ?", ("trade_to_close",)
+        row = await _fetch_one(
+            test_db.connection,
+            "SELECT status, total_pnl_usdt, total_pnl_percent FROM trades WHERE id = ?",
+            ("trade_to_close",),
         )
-        row = await cursor.fetchone()
         assert row["status"] == "closed"
-        assert abs(row["total_pnl_usdt"] - 100.50) < 0.01
-        assert abs(row["total_pnl_percent"] - 5.25) < 0.01
+        assert row["total_pnl_usdt"] == pytest.approx(100.50, abs=0.01)
+        assert row["total_pnl_percent"] == pytest.approx(5.25, abs=0.01)
+
 
 
+    @pytest.mark.asyncio
+    async def test_force_close_trade(self, test_db):
+        """Test force-closing a trade leaves no PnL recorded."""
+        await test_db.create_trade("trade_to_force_close", "binance", "ETH", "USDT")
+
+        await test_db.force_close_trade("trade_to_force_close")
+
+        row = await _fetch_one(
+            test_db.connection,
+            "SELECT status, total_pnl_usdt FROM trades WHERE id = ?",
+            ("trade_to_force_close",),
+        )
+        assert row["status"] == "closed"
+        assert row["total_pnl_usdt"] is None
+
 class TestGetTradeWithPyramids:
     """Tests for get_trade_with_pyramids method."""
 
@@ -714,6 +858,92 @@ class TestTransaction:
         is_processed = await test_db.is_alert_processed("tx_test_2")
         assert is_processed is False
 
+    @pytest.mark.asyncio
+    async def test_transaction_defers_method_commits(self, test_db):
+        """Test write methods inside a transaction roll back together."""
+        with pytest.raises(RuntimeError):
+            async with test_db.transaction():
+                await test_db.mark_alert_processed("tx_test_3")
+                await test_db.mark_alert_processed("tx_test_4")
+                raise RuntimeError("Simulated error")
+
+        assert await test_db.is_alert_processed("tx_test_3") is False
+        assert await test_db.is_alert_processed("tx_test_4") is False
+
+        # Methods commit on their own again after the block
+        await test_db.mark_alert_processed("tx_test_5")
+        await test_db.connection.rollback()
+        assert await test_db.is_alert_processed("tx_test_5") is True
+
+    @pytest.mark.asyncio
+    async def test_concurrent_write_not_absorbed_by_rollback(self, test_db):
+        """Test another task's write survives a rolled-back transaction."""
+        import asyncio
+
+        in_transaction = asyncio.Event()
+        release = asyncio.Event()
+
+        async def failing_transaction():
+            with pytest.raises(RuntimeError):
+                async with test_db.transaction():
+                    await test_db.mark_alert_processed("tx_test_6")
+                    in_transaction.set()
+                    await release.wait()
+                    raise RuntimeError("Simulated error")
+
+        task = asyncio.create_task(failing_transaction())
+        await in_transaction.wait()
+        writer = asyncio.create_task(test_db.set_setting("k", "v"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(task, writer)
+
+        assert await test_db.is_alert_processed("tx_test_6") is False
+        assert await test_db.get_setting("k") == "v"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_write_waits_for_open_transaction(self, test_db):
+        """Test another task's write cannot commit half of an open transaction."""
+        import asyncio
+
+        await test_db.create_trade("tx_trade", "binance", "BTC", "USDT")
+        in_transaction = asyncio.Event()
+        release = asyncio.Event()
+
+        async def failing_exit():
+            with pytest.raises(RuntimeError):
+                async with test_db.transaction():
+                    await test_db.add_exit("tx_exit", "tx_trade", 50000.0, 1.0)
+                    in_transaction.set()
+                    await release.wait()
+                    raise RuntimeError("Simulated error")
+
+        task = asyncio.create_task(failing_exit())
+        await in_transaction.wait()
+        writer = asyncio.create_task(test_db.set_setting("paused", "true"))
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        # The write is parked on the lock rather than committing the exit
+        assert not writer.done()
+
+        release.set()
+        await asyncio.gather(task, writer)
+
+        assert await test_db.has_exit("tx_trade") is False
+        assert await test_db.is_paused() is True
+
+    @pytest.mark.asyncio
+    async def test_nested_transaction_joins_outer(self, test_db):
+        """Test a nested transaction block joins the outer one."""
+        with pytest.raises(RuntimeError):
+            async with test_db.transaction():
+                async with test_db.transaction():
+                    await test_db.mark_alert_processed("tx_test_7")
+                raise RuntimeError("Simulated error")
+
+        assert await test_db.is_alert_processed("tx_test_7") is False
+
 
 class TestAddPyramid:
     """Tests for add_pyramid method."""
@@ -750,24 +980,17 @@ class TestAddPyramid:
         """Test adding multiple pyramids to a trade."""
         await test_db.create_trade("multi_pyr_trade", "binance", "ETH", "USDT")
 
-        # Add 3 pyramids
-        for i in range(3):
-            await test_db.add_pyramid(
-                pyramid_id=f"pyr_{i}",
-                trade_id="multi_pyr_trade",
-                pyramid_index=i,
-                entry_price=3000.0 - (i * 100),  # Decreasing prices
-                position_size=0.1,
-                capital_usdt=300.0,
-                fee_rate=0.001,
-                fee_usdt=0.3,
-            )
+        # Add 3 pyramids in one batch, at decreasing prices
+        await test_db.add_pyramids_bulk([
+            (f"pyr_{i}", "multi_pyr_trade", i, 3000.0 - (i * 100), 0.1, 300.0, 0.001, 0.3)
+            for i in range(3)
+        ])
 
         pyramids = await test_db.get_pyramids_for_trade("multi_pyr_trade")
-        assert len(pyramids) == 3
         # Should be ordered by pyramid_index
-        for i, p in enumerate(pyramids):
-            assert p["pyramid_index"] == i
+        assert [p["pyramid_index"] for p in pyramids] == [0, 1, 2]
+        assert [p["entry_price"] for p in pyramids] == [3000.0, 2900.0, 2800.0]
+        assert all(p["entry_time"] and p["received_timestamp"] for p in pyramids)
 
 
 class TestAddExit:
@@ -788,10 +1011,11 @@ class TestAddExit:
         )
 
         # Verify it was added
-        cursor = await test_db.connection.execute(
-            "SELECT * FROM exits WHERE trade_id = ?", ("exit_test_trade",)
+        row = await _fetch_one(
+            test_db.connection,
+            "SELECT exit_price, fee_usdt FROM exits WHERE trade_id = ?",
+            ("exit_test_trade",),
         )
-        row = await cursor.fetchone()
         assert row is not None
         assert row["exit_price"] == 51000.0
         assert row["fee_usdt"] == 1.0
@@ -819,13 +1043,44 @@ class TestUpdatePyramidPnl:
         await test_db.update_pyramid_pnl("pnl_pyr_1", 50.0, 5.0)
 
         # Verify update
-        cursor = await test_db.connection.execute(
+        row = await _fetch_one(
+            test_db.connection,
             "SELECT pnl_usdt, pnl_percent FROM pyramids WHERE id = ?", ("pnl_pyr_1",)
         )
-        row = await cursor.fetchone()
         assert row["pnl_usdt"] == 50.0
         assert row["pnl_percent"] == 5.0
 
+    @pytest.mark.asyncio
+    async def test_update_pyramid_pnl_bulk(self, test_db):
+        """Test updating several pyramid PnLs in one batch."""
+        await test_db.create_trade("pnl_bulk_trade", "binance", "BTC", "USDT")
+        for i in range(3):
+            await test_db.add_pyramid(
+                pyramid_id=f"pnl_bulk_{i}",
+                trade_id="pnl_bulk_trade",
+                pyramid_index=i,
+                entry_price=50000.0,
+                position_size=0.02,
+                capital_usdt=1000.0,
+                fee_rate=0.001,
+                fee_usdt=1.0,
+            )
+
+        await test_db.update_pyramid_pnl_bulk(
+            [(10.0 * i, 1.0 * i, f"pnl_bulk_{i}") for i in range(3)]
+        )
+
+        rows = await test_db.connection.execute_fetchall(
+            "SELECT id, pnl_usdt, pnl_percent FROM pyramids "
+            "WHERE trade_id = ? ORDER BY pyramid_index",
+            ("pnl_bulk_trade",),
+        )
+        assert [(r["id"], r["pnl_usdt"], r["pnl_percent"]) for r in rows] == [
+            ("pnl_bulk_0", 0.0, 0.0),
+            ("pnl_bulk_1", 10.0, 1.0),
+            ("pnl_bulk_2", 20.0, 2.0),
+        ]
+
 
 class TestSymbolRules:
     """Tests for symbol rules cache methods."""
@@ -907,6 +1162,14 @@ class TestSettings:
         value = await test_db.get_setting("update_key")
         assert value == "value2"
 
+    @pytest.mark.asyncio
+    async def test_delete_setting(self, test_db):
+        """Test deleting a setting."""
+        await test_db.set_setting("delete_key", "value")
+        await test_db.delete_setting("delete_key")
+
+        assert await test_db.get_setting("delete_key") is None
+
 
 class TestIsPaused:
     """Tests for is_paused method."""
@@ -1018,6 +1281,45 @@ class TestGetOpenTradeByGroup:
         )
         assert trade is None
 
+    @pytest.mark.asyncio
+    async def test_get_open_trade_with_pyramid_count(self, test_db):
+        """Test open trade lookup includes the number of pyramids."""
+        await test_db.create_trade_with_group(
+            trade_id="count_trade_1",
+            group_id="ETH_Binance_4h_001",
+            exchange="binance",
+            base="ETH",
+            quote="USDT",
+            timeframe="4h",
+        )
+        for i in range(2):
+            await test_db.add_pyramid(
+                pyramid_id=f"count_pyr_{i}",
+                trade_id="count_trade_1",
+                pyramid_index=i,
+                entry_price=3000.0,
+                position_size=0.5,
+                capital_usdt=1500.0,
+                fee_rate=0.001,
+                fee_usdt=1.5,
+            )
+
+        trade = await test_db.get_open_trade_with_pyramid_count(
+            "binance", "ETH", "USDT", "4h"
+        )
+
+        assert trade["id"] == "count_trade_1"
+        assert trade["group_id"] == "ETH_Binance_4h_001"
+        assert trade["pyramid_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_open_trade_with_pyramid_count_not_found(self, test_db):
+        """Test get_open_trade_with_pyramid_count returns None when not found."""
+        trade = await test_db.get_open_trade_with_pyramid_count(
+            "binance", "NONEXISTENT", "USDT", "1h"
+        )
+        assert trade is None
+
 
 class TestCreateTradeWithGroup:
     """Tests for create_trade_with_group method."""
@@ -1036,10 +1338,11 @@ class TestCreateTradeWithGroup:
         )
 
         # Verify
-        cursor = await test_db.connection.execute(
-            "SELECT * FROM trades WHERE id = ?", ("grouped_trade",)
+        row = await _fetch_one(
+            test_db.connection,
+            "SELECT group_id, timeframe, position_side, status FROM trades WHERE id = ?",
+            ("grouped_trade",),
         )
-        row = await cursor.fetchone()
 
         assert row is not None
         assert row["group_id"] == "ETH_Binance_4h_001"
@@ -1047,6 +1350,22 @@ class TestCreateTradeWithGroup:
         assert row["position_side"] == "long"
         assert row["status"] == "open"
 
+    @pytest.mark.asyncio
+    async def test_create_trade_with_group_conflict_returns_false(self, test_db):
+        """Test a second open trade for the same group is ignored, not raised."""
+        kwargs = dict(
+            exchange="binance", base="ETH", quote="USDT", timeframe="4h"
+        )
+        assert await test_db.create_trade_with_group(
+            trade_id="first", group_id="ETH_Binance_4h_001", **kwargs
+        ) is True
+        assert await test_db.create_trade_with_group(
+            trade_id="second", group_id="ETH_Binance_4h_002", **kwargs
+        ) is False
+
+        trade = await test_db.get_open_trade_by_group("binance", "ETH", "USDT", "4h")
+        assert trade["id"] == "first"
+
 
 class TestPyramidCapital:
     """Tests for pyramid capital methods."""
@@ -1146,12 +1465,10 @@ class TestResetMethods:
         assert counts["pyramids"] > 0
 
         # Verify data was cleared
-        cursor = await populated_db.connection.execute("SELECT COUNT(*) FROM trades")
-        row = await cursor.fetchone()
+        row = await _fetch_one(populated_db.connection, "SELECT COUNT(*) FROM trades")
         assert row[0] == 0
 
-        cursor = await populated_db.connection.execute("SELECT COUNT(*) FROM pyramids")
-        row = await cursor.fetchone()
+        row = await _fetch_one(populated_db.connection, "SELECT COUNT(*) FROM pyramids")
         assert row[0] == 0
 
     @pytest.mark.asyncio
@@ -1202,14 +1519,14 @@ class TestResetMethods:
         assert "symbol_rules" in counts
 
         # Verify everything is empty
-        cursor = await populated_db.connection.execute("SELECT COUNT(*) FROM trades")
-        assert (await cursor.fetchone())[0] == 0
+        row = await _fetch_one(populated_db.connection, "SELECT COUNT(*) FROM trades")
+        assert row[0] == 0
 
-        cursor = await populated_db.connection.execute("SELECT COUNT(*) FROM settings")
-        assert (await cursor.fetchone())[0] == 0
+        row = await _fetch_one(populated_db.connection, "SELECT COUNT(*) FROM settings")
+        assert row[0] == 0
 
-        cursor = await populated_db.connection.execute("SELECT COUNT(*) FROM symbol_rules")
-        assert (await cursor.fetchone())[0] == 0
+        row = await _fetch_one(populated_db.connection, "SELECT COUNT(*) FROM symbol_rules")
+        assert row[0] == 0
 
 
 class TestFullTradeWorkflow:
@@ -1275,10 +1592,10 @@ class TestFullTradeWorkflow:
         await test_db.update_pyramid_pnl("pyr_int_2", 40.0, 4.08)
 
         # Verify PnL updates
-        cursor = await test_db.connection.execute(
+        row = await _fetch_one(
+            test_db.connection,
             "SELECT pnl_usdt FROM pyramids WHERE id = ?", ("pyr_int_1",)
         )
-        row = await cursor.fetchone()
         assert row["pnl_usdt"] == 20.0
 
         # 5. Add exit
@@ -1296,12 +1613,12 @@ class TestFullTradeWorkflow:
         trade = await test_db.get_open_trade_by_group("binance", "BTC", "USDT", "1h")
         assert trade is None  # No open trade now
 
-        cursor = await test_db.connection.execute(
+        closed_trade = await _fetch_one(
+            test_db.connection,
             "SELECT status, total_pnl_usdt FROM trades WHERE id = ?", (trade_id,)
         )
-        closed_trade = await cursor.fetchone()
         assert closed_trade["status"] == "closed"
-        assert abs(closed_trade["total_pnl_usdt"] - 56.98) < 0.01
+        assert closed_trade["total_pnl_usdt"] == pytest.approx(56.98, abs=0.01)
 
     @pytest.mark.asyncio
     async def test_multiple_concurrent_trades(self, test_db):
@@ -1342,7 +1659,6 @@ class TestFullTradeWorkflow:
     @pytest.mark.asyncio
     async def test_statistics_calculation_accuracy(self, test_db):
         """Test that statistics are calculated correctly from real data."""
-        today = datetime.now().strftime("%Y-%m-%d")
 
         # Create and close trades with known PnLs
         trades_data = [
@@ -1361,43 +1677,41 @@ class TestFullTradeWorkflow:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (trade_id, "binance", "BTC", "USDT", "closed", "1h",
-                 pnl, pct, f"{today}T09:00:00", f"{today}T10:00:00")
+                 pnl, pct, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
             )
         await test_db.connection.commit()
 
         # Calculate statistics
-        stats = await test_db.get_statistics_for_period(today, today)
+        stats = await test_db.get_statistics_for_period(TODAY, TODAY)
 
         # Verify counts
         assert stats["total_trades"] == 5
 
         # Verify PnL sum: 100 - 50 + 75 - 25 + 200 = 300
-        assert abs(stats["total_pnl"] - 300.0) < 0.01
+        assert stats["total_pnl"] == pytest.approx(300.0, abs=0.01)
 
         # Verify win rate: 3 wins out of 5 = 60%
-        assert abs(stats["win_rate"] - 60.0) < 0.01
+        assert stats["win_rate"] == pytest.approx(60.0, abs=0.01)
 
         # Verify best/worst trades
         assert stats["best_trade"] == 200.0
         assert stats["worst_trade"] == -50.0
 
         # Verify average win: (100 + 75 + 200) / 3 = 125
-        assert abs(stats["avg_win"] - 125.0) < 0.01
+        assert stats["avg_win"] == pytest.approx(125.0, abs=0.01)
 
         # Verify average loss: (-50 + -25) / 2 = -37.5
-        assert abs(stats["avg_loss"] - (-37.5)) < 0.01
+        assert stats["avg_loss"] == pytest.approx(-37.5, abs=0.01)
 
         # Verify profit factor: 375 / 75 = 5.0
         total_wins = 100 + 75 + 200  # 375
         total_losses = 50 + 25  # 75
         expected_pf = total_wins / total_losses
-        assert abs(stats["profit_factor"] - expected_pf) < 0.01
+        assert stats["profit_factor"] == pytest.approx(expected_pf, abs=0.01)
 
     @pytest.mark.asyncio
     async def test_period_filtering_accuracy(self, test_db):
         """Test that date filtering works correctly for all period methods."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
         # Create trades for different days (using ISO format timestamps)
         await test_db.connection.execute(
@@ -1407,7 +1721,7 @@ class TestFullTradeWorkflow:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("today_trade", "binance", "BTC", "USDT", "closed", "1h",
-             100.0, f"{today}T09:00:00", f"{today}T10:00:00")
+             100.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
         )
         await test_db.connection.execute(
             """
@@ -1416,24 +1730,24 @@ class TestFullTradeWorkflow:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("yesterday_trade", "binance", "ETH", "USDT", "closed", "1h",
-             50.0, f"{yesterday}T09:00:00", f"{yesterday}T10:00:00")
+             50.0, f"{YESTERDAY}T09:00:00", f"{YESTERDAY}T10:00:00")
         )
         await test_db.connection.commit()
 
         # Test today only
-        pnl_today, count_today = await test_db.get_realized_pnl_for_period(today, today)
+        pnl_today, count_today = await test_db.get_realized_pnl_for_period(TODAY, TODAY)
         assert count_today == 1
-        assert abs(pnl_today - 100.0) < 0.01
+        assert pnl_today == pytest.approx(100.0, abs=0.01)
 
         # Test yesterday only
-        pnl_yesterday, count_yesterday = await test_db.get_realized_pnl_for_period(yesterday, yesterday)
+        pnl_yesterday, count_yesterday = await test_db.get_realized_pnl_for_period(YESTERDAY, YESTERDAY)
         assert count_yesterday == 1
-        assert abs(pnl_yesterday - 50.0) < 0.01
+        assert pnl_yesterday == pytest.approx(50.0, abs=0.01)
 
         # Test both days
-        pnl_both, count_both = await test_db.get_realized_pnl_for_period(yesterday, today)
+        pnl_both, count_both = await test_db.get_realized_pnl_for_period(YESTERDAY, TODAY)
         assert count_both == 2
-        assert abs(pnl_both - 150.0) < 0.01
+        assert pnl_both == pytest.approx(150.0, abs=0.01)
 
     @pytest.mark.asyncio
     async def test_pyramid_ordering(self, test_db):
@@ -1463,7 +1777,6 @@ class TestFullTradeWorkflow:
     @pytest.mark.asyncio
     async def test_null_pnl_handling(self, test_db):
         """Test that NULL PnL values are handled correctly in statistics."""
-        today = datetime.now().strftime("%Y-%m-%d")
 
         # Create trades - some with NULL PnL (open trades) using ISO format
         await test_db.connection.execute(
@@ -1473,7 +1786,7 @@ class TestFullTradeWorkflow:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("null_pnl_1", "binance", "BTC", "USDT", "closed", "1h",
-             100.0, f"{today}T09:00:00", f"{today}T10:00:00")
+             100.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
         )
         await test_db.connection.execute(
             """
@@ -1482,14 +1795,14 @@ class TestFullTradeWorkflow:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("null_pnl_2", "binance", "ETH", "USDT", "open", "1h",
-             None, f"{today}T11:00:00", None)  # Open trade with NULL PnL
+             None, f"{TODAY}T11:00:00", None)  # Open trade with NULL PnL
         )
         await test_db.connection.commit()
 
         # Statistics should only include closed trades
-        stats = await test_db.get_statistics_for_period(today, today)
+        stats = await test_db.get_statistics_for_period(TODAY, TODAY)
         assert stats["total_trades"] == 1  # Only the closed trade
-        assert abs(stats["total_pnl"] - 100.0) < 0.01
+        assert stats["total_pnl"] == pytest.approx(100.0, abs=0.01)
 
 
 class TestDataIntegrity:
@@ -1569,7 +1882,6 @@ class TestDataIntegrity:
     @pytest.mark.asyncio
     async def test_exchange_stats_accuracy(self, test_db):
         """Test exchange breakdown statistics accuracy."""
-        today = datetime.now().strftime("%Y-%m-%d")
 
         # Create trades on different exchanges (using ISO format timestamps)
         exchanges = [
@@ -1587,23 +1899,23 @@ class TestDataIntegrity:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (f"ex_stat_{i}", exchange, "BTC", "USDT", "closed", "1h",
-                 pnl, f"{today}T{9+i:02d}:00:00", f"{today}T{10+i:02d}:00:00")
+                 pnl, f"{TODAY}T{9+i:02d}:00:00", f"{TODAY}T{10+i:02d}:00:00")
             )
         await test_db.connection.commit()
 
-        stats_list = await test_db.get_exchange_stats_for_period(today, today)
+        stats_list = await test_db.get_exchange_stats_for_period(TODAY, TODAY)
 
         # Convert list to dict by exchange for easier assertions
         stats = {row["exchange"]: {"pnl": row["pnl"], "trades": row["trades"]} for row in stats_list}
 
         # Binance: 100 - 30 = 70, 2 trades
         assert "binance" in stats
-        assert abs(stats["binance"]["pnl"] - 70.0) < 0.01
+        assert stats["binance"]["pnl"] == pytest.approx(70.0, abs=0.01)
         assert stats["binance"]["trades"] == 2
 
         # Bybit: 50 + 75 = 125, 2 trades
         assert "bybit" in stats
-        assert abs(stats["bybit"]["pnl"] - 125.0) < 0.01
+        assert stats["bybit"]["pnl"] == pytest.approx(125.0, abs=0.01)
         assert stats["bybit"]["trades"] == 2
 
 
@@ -1617,7 +1929,6 @@ class TestGetTradesForDate:
 
         Bug prevented: API returns open trades or wrong date's trades.
         """
-        today = datetime.now().strftime("%Y-%m-%d")
 
         # Create one closed trade for today
         await test_db.connection.execute(
@@ -1627,7 +1938,7 @@ class TestGetTradesForDate:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("date_test_1", "binance", "BTC", "USDT", "closed", "1h",
-             50.0, f"{today}T09:00:00", f"{today}T10:00:00")
+             50.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
         )
 
         # Create one open trade for today (should NOT be returned)
@@ -1636,11 +1947,11 @@ class TestGetTradesForDate:
             INSERT INTO trades (id, exchange, base, quote, status, timeframe, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            ("date_test_2", "binance", "ETH", "USDT", "open", "1h", f"{today}T09:00:00")
+            ("date_test_2", "binance", "ETH", "USDT", "open", "1h", f"{TODAY}T09:00:00")
         )
         await test_db.connection.commit()
 
-        trades = await test_db.get_trades_for_date(today)
+        trades = await test_db.get_trades_for_date(TODAY)
 
         assert len(trades) == 1
         assert trades[0]["id"] == "date_test_1"
@@ -1657,7 +1968,6 @@ class TestGetEquityCurveDataForPeriod:
 
         Bug prevented: Report shows wrong period's equity curve.
         """
-        today = datetime.now().strftime("%Y-%m-%d")
 
         # Create trades with different close times
         await test_db.connection.execute(
@@ -1667,7 +1977,7 @@ class TestGetEquityCurveDataForPeriod:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("eq_curve_1", "binance", "BTC", "USDT", "closed", "1h",
-             100.0, f"{today}T09:00:00", f"{today}T10:00:00")
+             100.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
         )
         await test_db.connection.execute(
             """
@@ -1676,12 +1986,12 @@ class TestGetEquityCurveDataForPeriod:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("eq_curve_2", "binance", "ETH", "USDT", "closed", "1h",
-             -25.0, f"{today}T11:00:00", f"{today}T12:00:00")
+             -25.0, f"{TODAY}T11:00:00", f"{TODAY}T12:00:00")
         )
         await test_db.connection.commit()
 
         # Test with specific date range
-        curve = await test_db.get_equity_curve_data_for_period(today, today)
+        curve = await test_db.get_equity_curve_data_for_period(TODAY, TODAY)
 
         assert len(curve) == 2
         assert curve[0]["total_pnl_usdt"] == 100.0
@@ -1694,7 +2004,6 @@ class TestGetEquityCurveDataForPeriod:
 
         Bug prevented: All-time view missing historical data.
         """
-        today = datetime.now().strftime("%Y-%m-%d")
 
         await test_db.connection.execute(
             """
@@ -1703,7 +2012,7 @@ class TestGetEquityCurveDataForPeriod:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("eq_all_1", "binance", "BTC", "USDT", "closed", "1h",
-             50.0, f"{today}T09:00:00", f"{today}T10:00:00")
+             50.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
         )
         await test_db.connection.commit()
 
@@ -1725,7 +2034,6 @@ class TestGetTradeCountsForPeriod:
 
         Bug prevented: Report shows wrong open/closed counts.
         """
-        today = datetime.now().strftime("%Y-%m-%d")
 
         # 2 trades opened today, 1 closed today
         await test_db.connection.execute(
@@ -1735,18 +2043,18 @@ class TestGetTradeCountsForPeriod:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("count_1", "binance", "BTC", "USDT", "closed", "1h",
-             100.0, f"{today}T09:00:00", f"{today}T10:00:00")
+             100.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
         )
         await test_db.connection.execute(
             """
             INSERT INTO trades (id, exchange, base, quote, status, timeframe, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            ("count_2", "binance", "ETH", "USDT", "open", "1h", f"{today}T11:00:00")
+            ("count_2", "binance", "ETH", "USDT", "open", "1h", f"{TODAY}T11:00:00")
         )
         await test_db.connection.commit()
 
-        counts = await test_db.get_trade_counts_for_period(today, today)
+        counts = await test_db.get_trade_counts_for_period(TODAY, TODAY)
 
         assert counts["opened_in_period"] == 2
         assert counts["closed_in_period"] == 1
@@ -1758,7 +2066,6 @@ class TestGetTradeCountsForPeriod:
 
         Bug prevented: All-time statistics query fails.
         """
-        today = datetime.now().strftime("%Y-%m-%d")
 
         await test_db.connection.execute(
             """
@@ -1767,7 +2074,7 @@ class TestGetTradeCountsForPeriod:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             ("count_all_1", "binance", "BTC", "USDT", "closed", "1h",
-             50.0, f"{today}T09:00:00", f"{today}T10:00:00")
+             50.0, f"{TODAY}T09:00:00", f"{TODAY}T10:00:00")
         )
         await test_db.connection.commit()
 
@@ -1788,7 +2095,6 @@ class TestCleanupOrphanTrades:
 
         Bug prevented: Orphan trades accumulate causing data inconsistency.
         """
-        today = datetime.now().strftime("%Y-%m-%d")
 
         # Create orphan trade (open, no pyramids)
         await test_db.connection.execute(
@@ -1796,7 +2102,7 @@ class TestCleanupOrphanTrades:
             INSERT INTO trades (id, exchange, base, quote, status, timeframe, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            ("orphan_1", "binance", "BTC", "USDT", "open", "1h", f"{today}T09:00:00")
+            ("orphan_1", "binance", "BTC", "USDT", "open", "1h", f"{TODAY}T09:00:00")
         )
 
         # Create valid trade with pyramid (using correct column names)
@@ -1805,7 +2111,7 @@ class TestCleanupOrphanTrades:
             INSERT INTO trades (id, exchange, base, quote, status, timeframe, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            ("valid_1", "binance", "ETH", "USDT", "open", "1h", f"{today}T09:00:00")
+            ("valid_1", "binance", "ETH", "USDT", "open", "1h", f"{TODAY}T09:00:00")
         )
         await test_db.connection.execute(
             """
@@ -1813,7 +2119,7 @@ class TestCleanupOrphanTrades:
                                  capital_usdt, entry_time, fee_rate, fee_usdt)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            ("pyr_1", "valid_1", 0, 3000.0, 0.1, 300.0, f"{today}T09:00:00", 0.001, 0.3)
+            ("pyr_1", "valid_1", 0, 3000.0, 0.1, 300.0, f"{TODAY}T09:00:00", 0.001, 0.3)
         )
         await test_db.connection.commit()
 
@@ -1822,16 +2128,16 @@ class TestCleanupOrphanTrades:
         assert deleted_count == 1
 
         # Verify orphan is gone
-        cursor = await test_db.connection.execute(
-            "SELECT id FROM trades WHERE id = 'orphan_1'"
+        row = await _fetch_one(
+            test_db.connection, "SELECT id FROM trades WHERE id = 'orphan_1'"
         )
-        assert await cursor.fetchone() is None
+        assert row is None
 
         # Verify valid trade still exists
-        cursor = await test_db.connection.execute(
-            "SELECT id FROM trades WHERE id = 'valid_1'"
+        row = await _fetch_one(
+            test_db.connection, "SELECT id FROM trades WHERE id = 'valid_1'"
         )
-        assert await cursor.fetchone() is not None
+        assert row is not None
 
     @pytest.mark.asyncio
     async def test_cleanup_orphan_trades_none_found(self, test_db):
@@ -111,6 +111,77 @@ class TestExchangeService:
 
             assert price_data.price == 50000.0
 
+    @pytest.mark.asyncio
+    async def test_get_price_coalesces_concurrent_calls(self):
+        """Test concurrent and repeat price lookups share one exchange request."""
+        import asyncio
+        from app.services.exchange_service import ExchangeService
+        from app.exchanges.base import PriceData
+
+        with patch.object(ExchangeService, "get_exchange_adapter") as mock_get:
+            mock_adapter = MagicMock()
+            mock_adapter_instance = MagicMock()
+            mock_adapter_instance.get_price = AsyncMock(return_value=PriceData(
+                price=50000.0,
+                timestamp=1705762800000
+            ))
+            mock_adapter.return_value.__aenter__ = AsyncMock(return_value=mock_adapter_instance)
+            mock_adapter.return_value.__aexit__ = AsyncMock(return_value=None)
+            mock_get.return_value = mock_adapter
+
+            first, second = await asyncio.gather(
+                ExchangeService.get_price("binance", "BTC", "USDT"),
+                ExchangeService.get_price("binance", "btc", "usdt"),
+            )
+            third = await ExchangeService.get_price("binance", "BTC", "USDT")
+
+            assert first is second is third
+            mock_adapter_instance.get_price.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_price_failure_after_callers_cancelled(self):
+        """Test a shared fetch failing with no callers left is retrieved and forgotten."""
+        import asyncio
+        import gc
+        from app.services.exchange_service import ExchangeService
+
+        release = asyncio.Event()
+
+        async def failing_get_price(base, quote):
+            await release.wait()
+            raise RuntimeError("exchange down")
+
+        loop = asyncio.get_running_loop()
+        errors = []
+        loop.set_exception_handler(lambda _loop, context: errors.append(context))
+        try:
+            with patch.object(ExchangeService, "get_exchange_adapter") as mock_get:
+                mock_adapter = MagicMock()
+                mock_adapter_instance = MagicMock()
+                mock_adapter_instance.get_price = failing_get_price
+                mock_adapter.return_value.__aenter__ = AsyncMock(return_value=mock_adapter_instance)
+                mock_adapter.return_value.__aexit__ = AsyncMock(return_value=None)
+                mock_get.return_value = mock_adapter
+
+                caller = asyncio.create_task(
+                    ExchangeService.get_price("binance", "FAIL", "USDT")
+                )
+                # Let the caller start the fetch and the fetch park on release
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+                fetch = ExchangeService._price_inflight[("binance", "FAIL", "USDT")]
+
+                caller.cancel()
+                release.set()
+                await asyncio.wait([caller, fetch])
+                del caller, fetch
+                gc.collect()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert ("binance", "FAIL", "USDT") not in ExchangeService._price_inflight
+        assert errors == []
+
     @pytest.mark.asyncio
     async def test_get_price_unknown_exchange(self):
         """Test price fetch for unknown exchange raises error."""
@@ -119,6 +190,33 @@ class TestExchangeService:
         with pytest.raises(ValueError, match="Unknown exchange"):
             await ExchangeService.get_price("unknown", "BTC", "USDT")
 
+    @pytest.mark.asyncio
+    async def test_get_symbol_info_memoized(self):
+        """Test repeat symbol info lookups are served from the in-process cache."""
+        from datetime import datetime, timezone
+        from app.services.exchange_service import ExchangeService
+
+        cached_row = {
+            "base": "BTC",
+            "quote": "USDT",
+            "price_precision": 2,
+            "qty_precision": 5,
+            "min_qty": 0.0001,
+            "min_notional": 10.0,
+            "tick_size": 0.01,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        with patch("app.services.exchange_service.db") as mock_db:
+            mock_db.get_symbol_rules = AsyncMock(return_value=cached_row)
+
+            first = await ExchangeService.get_symbol_info("binance", "btc", "usdt")
+            second = await ExchangeService.get_symbol_info("binance", "BTC", "USDT")
+
+            assert first is second
+            assert first.qty_precision == 5
+            mock_db.get_symbol_rules.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_validate_order_success(self):
         """Test successful order validation."""
@@ -867,14 +867,10 @@ class TestCmdSetfee:
 
         mock_context.args = ["binance", "0.1"]
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_setfee(mock_update, mock_context)
 
@@ -882,6 +878,7 @@ class TestCmdSetfee:
             assert "Updated" in call_args
             assert "binance" in call_args
             assert "0.1" in call_args
+            mock_db.set_setting.assert_awaited_once_with("fee_binance_taker", "0.1")
 
     @pytest.mark.asyncio
     async def test_setfee_unknown_exchange(self, mock_update, mock_context):
@@ -952,17 +949,18 @@ class TestCmdTimezone:
 
         mock_connection = MagicMock()
         mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
 
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
             mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_timezone(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "America/New_York" in call_args
+            mock_db.set_setting.assert_awaited_once_with("timezone", "America/New_York")
 
     @pytest.mark.asyncio
     async def test_timezone_set_invalid(self, mock_update, mock_context):
@@ -1016,19 +1014,16 @@ class TestCmdReporttime:
 
         mock_context.args = ["14:30"]
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_reporttime(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "14:30" in call_args
+            mock_db.set_setting.assert_awaited_once_with("daily_report_time", "14:30")
 
     @pytest.mark.asyncio
     async def test_reporttime_set_invalid(self, mock_update, mock_context):
@@ -1054,38 +1049,32 @@ class TestCmdPauseResume:
         """Test /pause command sets paused state."""
         from app.bot.handlers import cmd_pause
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_pause(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "paused" in call_args.lower()
+            mock_db.set_setting.assert_awaited_once_with("paused", "true")
 
     @pytest.mark.asyncio
     async def test_resume_command(self, mock_update, mock_context):
         """Test /resume command clears paused state."""
         from app.bot.handlers import cmd_resume
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_resume(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "resumed" in call_args.lower()
+            mock_db.set_setting.assert_awaited_once_with("paused", "false")
 
 
 class TestCmdIgnoreUnignore:
@@ -1118,18 +1107,19 @@ class TestCmdIgnoreUnignore:
 
         mock_connection = MagicMock()
         mock_connection.execute = AsyncMock(return_value=mock_cursor)
-        mock_connection.commit = AsyncMock()
 
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
             mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_ignore(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "ignoring" in call_args.lower()
             assert "BTC/USDT" in call_args
+            mock_db.set_setting.assert_awaited_once_with("ignored_pairs", "BTC/USDT")
 
     @pytest.mark.asyncio
     async def test_unignore_no_args_shows_usage(self, mock_update, mock_context):
@@ -1158,18 +1148,19 @@ class TestCmdIgnoreUnignore:
 
         mock_connection = MagicMock()
         mock_connection.execute = AsyncMock(return_value=mock_cursor)
-        mock_connection.commit = AsyncMock()
 
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
             mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_unignore(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "Resumed" in call_args
             assert "BTC/USDT" in call_args
+            mock_db.set_setting.assert_awaited_once_with("ignored_pairs", "ETH/USDT")
 
 
 class TestCmdSetCapital:
@@ -1352,19 +1343,16 @@ class TestCmdSignalsChannel:
 
         mock_context.args = ["off"]
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.delete_setting = AsyncMock()
 
             await cmd_signals_channel(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "disabled" in call_args.lower()
+            mock_db.delete_setting.assert_awaited_once_with("signals_channel_id")
 
     @pytest.mark.asyncio
     async def test_signals_channel_invalid_id(self, mock_update, mock_context):
@@ -1832,14 +1820,10 @@ class TestInputValidationEdgeCases:
 
         mock_context.args = ["binance", "100"]  # 100% fee is unreasonable
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_setfee(mock_update, mock_context)
 
@@ -1855,19 +1839,16 @@ class TestInputValidationEdgeCases:
 
         mock_context.args = ["binance", "0"]
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_setfee(mock_update, mock_context)
 
             call_args = mock_update.message.reply_text.call_args[0][0]
             assert "Updated" in call_args
+            mock_db.set_setting.assert_awaited_once_with("fee_binance_taker", "0.0")
 
     @pytest.mark.asyncio
     async def test_set_capital_zero_value(self, mock_update, mock_context):
@@ -1911,14 +1892,10 @@ class TestInputValidationEdgeCases:
         # Test midnight
         mock_context.args = ["00:00"]
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_reporttime(mock_update, mock_context)
 
@@ -1932,14 +1909,10 @@ class TestInputValidationEdgeCases:
 
         mock_context.args = ["23:59"]
 
-        mock_connection = MagicMock()
-        mock_connection.execute = AsyncMock()
-        mock_connection.commit = AsyncMock()
-
         with patch("app.bot.handlers._bot") as mock_bot, \
              patch("app.bot.handlers.db") as mock_db:
             mock_bot.is_valid_chat.return_value = True
-            mock_db.connection = mock_connection
+            mock_db.set_setting = AsyncMock()
 
             await cmd_reporttime(mock_update, mock_context)
 
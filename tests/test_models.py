@@ -581,3 +581,41 @@ class TestAppValidationError:
         )
 
         assert error.value is None
+
+
+class TestTradeClosedData:
+    """Tests for TradeClosedData model."""
+
+    def _make(self, entry_time):
+        return TradeClosedData(
+            trade_id="trade_1",
+            group_id="group_1",
+            exchange="binance",
+            base="BTC",
+            quote="USDT",
+            timeframe="1h",
+            pyramids=[{"index": 0, "entry_price": 50000.0, "size": 0.1, "entry_time": entry_time}],
+            exit_price=51000.0,
+            exit_time=datetime(2026, 1, 20, 12, 0, 0),
+            gross_pnl=100.0,
+            total_fees=1.0,
+            net_pnl=99.0,
+            net_pnl_percent=1.98,
+            exchange_timestamp="2026-01-20T12:00:00Z",
+            received_timestamp=datetime(2026, 1, 20, 12, 0, 0),
+        )
+
+    @pytest.mark.parametrize("entry_time", ["2026-01-20T10:00:00", "2026-01-20T10:00:00Z"])
+    def test_iso_entry_time_parsed_to_datetime(self, entry_time):
+        """Verify ISO entry_time strings become datetimes at construction."""
+        data = self._make(entry_time)
+
+        parsed = data.pyramids[0]["entry_time"]
+        assert isinstance(parsed, datetime)
+        assert (parsed.hour, parsed.minute) == (10, 0)
+
+    def test_unparseable_entry_time_kept(self):
+        """Verify non-ISO entry_time strings are kept for display as-is."""
+        data = self._make("bad")
+
+        assert data.pyramids[0]["entry_time"] == "bad"
@@ -4,6 +4,7 @@ Tests for Telegram service in app/services/telegram_service.py
 Tests the notification formatting and sending logic.
 """
 
+import asyncio
 from datetime import datetime, UTC
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -14,31 +15,83 @@ import pytz
 class TestTelegramServiceProperties:
     """Tests for TelegramService properties."""
 
-    def test_bot_creates_instance(self):
-        """Test that bot property creates Bot instance."""
+    def test_bot_created_at_init(self):
+        """Test that Bot instance is built eagerly when a token is configured."""
         from app.services.telegram_service import TelegramService
 
-        service = TelegramService()
-
         with patch("app.services.telegram_service.settings") as mock_settings, \
              patch("app.services.telegram_service.Bot") as mock_bot_class:
 
             mock_settings.telegram_bot_token = "test_token"
             mock_bot_class.return_value = MagicMock()
 
+            service = TelegramService()
+
+            mock_bot_class.assert_called_once()
+            assert mock_bot_class.call_args.kwargs["token"] == "test_token"
+            assert service.bot is mock_bot_class.return_value
+            mock_bot_class.assert_called_once()
+
+    def test_bot_shares_one_request(self):
+        """Test that sends and get_updates share one HTTPX request object."""
+        from app.services.telegram_service import TelegramService
+
+        with patch("app.services.telegram_service.settings") as mock_settings, \
+             patch("app.services.telegram_service.Bot") as mock_bot_class:
+
+            mock_settings.telegram_bot_token = "test_token"
+
+            TelegramService()
+
+            kwargs = mock_bot_class.call_args.kwargs
+            assert kwargs["request"] is kwargs["get_updates_request"]
+
+    def test_request_pool_covers_concurrent_sends(self):
+        """Test the HTTP pool has a connection for every concurrent send."""
+        import inspect
+        from telegram.request import HTTPXRequest
+        from app.services.telegram_service import TelegramService, _MAX_CONCURRENT_SENDS
+
+        default_pool = inspect.signature(HTTPXRequest).parameters["connection_pool_size"].default
+
+        with patch("app.services.telegram_service.settings") as mock_settings, \
+             patch("app.services.telegram_service.Bot"), \
+             patch("app.services.telegram_service.HTTPXRequest") as mock_request_class:
+
+            mock_settings.telegram_bot_token = "test_token"
+
+            TelegramService()
+
+            kwargs = mock_request_class.call_args.kwargs
+            assert kwargs.get("connection_pool_size", default_pool) >= _MAX_CONCURRENT_SENDS
+
+    def test_bot_creates_instance_lazily(self):
+        """Test that bot property creates Bot instance if init could not."""
+        from app.services.telegram_service import TelegramService
+
+        with patch("app.services.telegram_service.settings") as mock_settings, \
+             patch("app.services.telegram_service.Bot") as mock_bot_class:
+
+            mock_settings.telegram_bot_token = "test_token"
+            mock_bot_class.side_effect = [RuntimeError("boom"), MagicMock()]
+
+            service = TelegramService()
+            assert service._bot is None
+
             bot = service.bot
 
-            mock_bot_class.assert_called_once_with(token="test_token")
+            assert bot is not None
+            assert mock_bot_class.call_count == 2
 
     def test_bot_raises_without_token(self):
         """Test that bot property raises without token."""
         from app.services.telegram_service import TelegramService
 
-        service = TelegramService()
-
         with patch("app.services.telegram_service.settings") as mock_settings:
             mock_settings.telegram_bot_token = ""
 
+            service = TelegramService()
+
             with pytest.raises(ValueError, match="not configured"):
                 _ = service.bot
 
@@ -158,6 +211,15 @@ class TestTelegramServiceFormatters:
         assert service._format_quantity(1.5) == "1.5"
         assert service._format_quantity(100) == "100"
 
+    def test_format_quantity_below_precision(self):
+        """Test quantities smaller than 8 decimals collapse to zero."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        assert service._format_quantity(0.000000001) == "0"
+        assert service._format_quantity(-0.000000001) == "0"
+
     def test_format_quantity_with_commas_large(self):
         """Test formatting large quantities with commas."""
         from app.services.telegram_service import TelegramService
@@ -258,6 +320,15 @@ class TestTelegramServiceTimeFormatters:
         result = service._parse_exchange_timestamp("")
         assert result == "N/A"
 
+    @pytest.mark.parametrize("timestamp", [None, 1737367200])
+    def test_parse_exchange_timestamp_non_string(self, timestamp):
+        """Test non-string exchange timestamps are shown as N/A."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        assert service._parse_exchange_timestamp(timestamp) == "N/A"
+
 
 class TestFormatPyramidEntryMessage:
     """Tests for format_pyramid_entry_message method."""
@@ -295,6 +366,35 @@ class TestFormatPyramidEntryMessage:
             assert "BTC/USDT" in message
             assert "50,000" in message
 
+    @pytest.mark.parametrize("exchange,expected", [
+        ("okx", "🏦 Exchange: OKX"),
+        ("kucoin", "🏦 Exchange: KuCoin"),
+        ("newex", "🏦 Exchange: Newex"),
+    ])
+    def test_exchange_display_name(self, exchange, expected):
+        """Test known exchanges use their display name, others are capitalized."""
+        from app.services.telegram_service import TelegramService
+        from app.models import PyramidEntryData
+
+        service = TelegramService()
+
+        entry_data = PyramidEntryData(
+            group_id="BTC_Okx_1h_001",
+            pyramid_index=0,
+            exchange=exchange,
+            base="BTC",
+            quote="USDT",
+            timeframe="1h",
+            entry_price=50000.0,
+            position_size=0.02,
+            capital_usdt=1000.0,
+            exchange_timestamp="2026-01-20T10:00:00Z",
+            received_timestamp=datetime.now(UTC),
+            total_pyramids=1
+        )
+
+        assert expected in service.format_pyramid_entry_message(entry_data)
+
 
 class TestSignalsChannelEnabled:
     """Tests for signals_channel_enabled property."""
@@ -564,6 +664,33 @@ class TestFormatDailyReportMessage:
         assert "BTC/USDT" in message
         assert "ETH/USDT" in message
 
+    def test_format_daily_report_many_pairs_sorted(self):
+        """Test large pair breakdowns keep the top pairs by absolute PnL, ties in order."""
+        from app.services.telegram_service import TelegramService, _PAIR_REPORT_LIMIT
+        from app.models import DailyReportData
+
+        service = TelegramService()
+        by_pair = {f"C{i}/USDT": float((i * 37) % 101 - 50) for i in range(400)}
+
+        data = DailyReportData(
+            date="2026-01-20",
+            total_trades=400,
+            total_pyramids=400,
+            total_pnl_usdt=0.0,
+            total_pnl_percent=0.0,
+            trades=[],
+            by_exchange={},
+            by_timeframe={},
+            by_pair=by_pair,
+        )
+
+        message = service.format_daily_report_message(data)
+
+        pair_lines = message.split("By Pair:\n", 1)[1].split("\n")
+        expected = sorted(by_pair.items(), key=lambda x: abs(x[1]), reverse=True)[:_PAIR_REPORT_LIMIT]
+        assert [line.split(" ")[1][:-1] for line in pair_lines] == [p for p, _ in expected]
+        assert pair_lines[-1].startswith("└─")
+
     def test_format_daily_report_with_trades(self):
         """Test formatting daily report with trade details."""
         from app.services.telegram_service import TelegramService
@@ -653,6 +780,106 @@ class TestGenerateEquityCurveImage:
         result = service.generate_equity_curve_image([], "2026-01-20")
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_generate_equity_curve_concurrent_renders(
+        self, sample_equity_points, sample_chart_stats
+    ):
+        """Test charts rendered from worker threads at once are all valid PNGs."""
+        pytest.importorskip("matplotlib")
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        charts = await asyncio.gather(*(
+            asyncio.to_thread(
+                service.generate_equity_curve_image,
+                sample_equity_points, "2026-01-20", sample_chart_stats
+            )
+            for _ in range(3)
+        ))
+
+        for chart in charts:
+            assert chart.getvalue().startswith(b"\x89PNG")
+
+    @pytest.mark.filterwarnings("error")
+    def test_generate_equity_curve_reused_figure_matches(
+        self, sample_equity_points, sample_chart_stats
+    ):
+        """Test a render on a reused figure leaves nothing behind from the previous chart."""
+        pytest.importorskip("matplotlib")
+        from app.services.telegram_service import TelegramService
+        from app.models import EquityPoint
+
+        service = TelegramService()
+        other_points = [
+            EquityPoint(timestamp=p.timestamp, cumulative_pnl=-p.cumulative_pnl)
+            for p in sample_equity_points
+        ]
+
+        first = service.generate_equity_curve_image(
+            sample_equity_points, "2026-01-20", sample_chart_stats
+        ).getvalue()
+        service.generate_equity_curve_image(other_points, "2026-01-19", sample_chart_stats)
+        again = service.generate_equity_curve_image(
+            sample_equity_points, "2026-01-20", sample_chart_stats
+        ).getvalue()
+
+        assert again == first
+
+    def test_generate_equity_curve_without_matplotlib(
+        self, sample_equity_points, sample_chart_stats
+    ):
+        """Test the chart is skipped, not raised, when matplotlib is unavailable."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        with patch("app.services.telegram_service.plt", None):
+            result = service.generate_equity_curve_image(
+                sample_equity_points, "2026-01-20", sample_chart_stats
+            )
+
+        assert result is None
+
+    def test_generate_equity_curve_writes_to_out(
+        self, sample_equity_points, sample_chart_stats, tmp_path
+    ):
+        """Test the PNG is written straight into a caller-supplied stream."""
+        pytest.importorskip("matplotlib")
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+        path = tmp_path / "chart.png"
+
+        with open(path, "wb") as out:
+            result = service.generate_equity_curve_image(
+                sample_equity_points, "2026-01-20", sample_chart_stats, out=out
+            )
+            assert result is out
+
+        assert path.read_bytes().startswith(b"\x89PNG")
+
+    def test_currency_tick_format(self):
+        """Test y-axis ticks render as signed whole dollars."""
+        from app.services.telegram_service import _format_currency_tick
+
+        assert _format_currency_tick(0) == "+$0"
+        assert _format_currency_tick(1250.4) == "+$1,250"
+        assert _format_currency_tick(-300) == "-$300"
+
+    def test_logo_loaded_once_per_mtime(self, tmp_path):
+        """Test the header logo is resized once and reloaded only when the file changes."""
+        from PIL import Image
+        from app.services.telegram_service import _load_logo
+
+        path = tmp_path / "logo.jpg"
+        Image.new("RGB", (400, 300), "purple").save(path)
+
+        first = _load_logo(str(path), 1.0)
+        assert first is _load_logo(str(path), 1.0)
+        assert max(first.size) <= 120
+        assert _load_logo(str(path), 2.0) is not first
+
 
 class TestIsEnabledNoChannelId:
     """Tests for is_enabled when channel_id is missing."""
@@ -802,6 +1029,56 @@ class TestTimestampEdgeCases:
             result = service._parse_exchange_timestamp("2026-01-20T14:30:00.123Z")
             assert "14:30" in result
 
+    def test_parse_exchange_timestamp_with_offset(self):
+        """Test parsing timestamp with explicit UTC offset."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        with patch("app.services.telegram_service.settings") as mock_settings:
+            mock_settings.timezone = "UTC"
+
+            result = service._parse_exchange_timestamp("2026-01-20T14:30:00-05:00")
+            assert result == "19:30:00"
+
+    @pytest.mark.parametrize("timestamp,expected", [
+        pytest.param("2026-01-20", "00:00:00", id="date-only"),
+        pytest.param("2026-01-20T14:30", "14:30:00", id="no-seconds"),
+        pytest.param("2026-01-20 14:30Z", "14:30:00", id="no-seconds-z"),
+        pytest.param("2026-01-20T14:30+02:00", "12:30:00", id="no-seconds-offset"),
+    ])
+    def test_parse_exchange_timestamp_partial_forms(self, timestamp, expected):
+        """Test date-only and HH:MM timestamps accepted by fromisoformat still parse."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        with patch("app.services.telegram_service.settings") as mock_settings:
+            mock_settings.timezone = "UTC"
+
+            assert service._parse_exchange_timestamp(timestamp) == expected
+
+    @pytest.mark.parametrize("timestamp", [
+        "2024-01-15T10:30:00+99:00",
+        "2024-01-15T10:30:00+23:99",
+    ])
+    def test_parse_exchange_timestamp_out_of_range_offset(self, timestamp):
+        """Test a timestamp with an impossible UTC offset is returned as-is."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        assert service._parse_exchange_timestamp(timestamp) == timestamp
+
+    def test_parse_exchange_timestamp_out_of_range(self):
+        """Test ISO-shaped timestamp with invalid field is returned as-is."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        result = service._parse_exchange_timestamp("2026-13-01T00:00:00Z")
+        assert result == "2026-13-01T00:00:00Z"
+
     def test_get_local_time_different_timezone(self):
         """Test local time conversion with different timezone."""
         from app.services.telegram_service import TelegramService
@@ -1257,6 +1534,54 @@ class TestSendSignalMessage:
 
             assert result is False
 
+    @pytest.mark.asyncio
+    async def test_send_signal_message_one_raises(self):
+        """Test an exception in one channel does not lose the other result."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        with patch.object(service, "send_message", new_callable=AsyncMock) as mock_main, \
+             patch.object(service, "send_to_signals_channel", new_callable=AsyncMock) as mock_signals:
+
+            mock_main.side_effect = RuntimeError("boom")
+            mock_signals.return_value = True
+
+            result = await service.send_signal_message("Test signal")
+
+            assert result is True
+
+
+class TestSendMany:
+    """Tests for send_many method."""
+
+    @pytest.mark.asyncio
+    async def test_send_many_returns_results_in_order(self):
+        """Test each text is sent and results keep input order."""
+        from app.services.telegram_service import TelegramService
+
+        service = TelegramService()
+
+        with patch.object(service, "send_signal_message", new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = [True, False, True]
+
+            results = await service.send_many(["a", "b", "c"])
+
+            assert results == [True, False, True]
+            assert [c.args[0] for c in mock_send.call_args_list] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_send_limiter_reused_within_loop(self):
+        """Test the send semaphore is created once per event loop."""
+        from app.services.telegram_service import TelegramService, _MAX_CONCURRENT_SENDS
+
+        service = TelegramService()
+
+        limiter = service._send_limiter()
+
+        assert service._send_limiter() is limiter
+        assert limiter._value == _MAX_CONCURRENT_SENDS
+
 
 class TestSendTradeClosed:
     """Tests for send_trade_closed method."""
@@ -65,6 +65,51 @@ class TestGenerateGroupId:
         assert generate_group_id("SOL", "BYBIT", "15m", 1) == "SOL_Bybit_15m_001"
 
 
+class TestNewId:
+    """Tests for _new_id helper function."""
+
+    def test_new_id_is_unique_hex(self):
+        """Test IDs are 32 hex characters and do not repeat."""
+        from app.services.trade_service import _new_id
+
+        ids = {_new_id() for _ in range(100)}
+
+        assert len(ids) == 100
+        assert all(len(i) == 32 and int(i, 16) >= 0 for i in ids)
+
+
+class TestComputePnl:
+    """Tests for the exit PnL kernel."""
+
+    def test_kernel_matches_scalar_math(self):
+        """Test the kernel gives the per-pyramid scalar results and totals."""
+        import numpy as np
+        from app.services.trade_service import _compute_pnl
+
+        entry_prices = np.array([50000.0, 48000.0, 52000.0])
+        sizes = np.array([0.02, 0.025, 0.0])
+        capitals = np.array([1000.0, 1200.0, 0.0])
+        entry_fees = np.array([1.0, 1.2, 0.0])
+
+        net, pct, gross, efee, xfee, cap = _compute_pnl(
+            entry_prices, sizes, capitals, entry_fees, 51000.0, 0.001
+        )
+
+        expected_net = [
+            (51000.0 - 50000.0) * 0.02 - 1.0 - 51000.0 * 0.02 * 0.001,
+            (51000.0 - 48000.0) * 0.025 - 1.2 - 51000.0 * 0.025 * 0.001,
+            0.0,
+        ]
+        assert list(net) == pytest.approx(expected_net)
+        assert list(pct) == pytest.approx([
+            expected_net[0] / 1000.0 * 100, expected_net[1] / 1200.0 * 100, 0.0,
+        ])
+        assert gross == pytest.approx(20.0 + 75.0)
+        assert efee == pytest.approx(2.2)
+        assert xfee == pytest.approx(51000.0 * 0.045 * 0.001)
+        assert cap == pytest.approx(2200.0)
+
+
 class TestTradeResult:
     """Tests for TradeResult dataclass."""
 
@@ -100,6 +145,14 @@ class TestTradeResult:
         assert result.group_id == "BTC_Binance_1h_001"
         assert result.price == 50000.0
 
+    def test_uses_slots(self):
+        """Test TradeResult instances carry no per-instance __dict__."""
+        from app.services.trade_service import TradeResult
+
+        result = TradeResult(success=True, message="Test")
+
+        assert not hasattr(result, "__dict__")
+
 
 class TestProcessSignal:
     """Tests for TradeService.process_signal method."""
@@ -133,6 +186,41 @@ class TestProcessSignal:
         assert result.error == "INVALID_SYMBOL"
         assert data is None
 
+    @pytest.mark.asyncio
+    async def test_entry_stores_received_timestamp_once(self):
+        """Test the stored received timestamp matches the notification's."""
+        from app.services.trade_service import TradeService
+
+        alert = create_test_alert()
+
+        with patch("app.services.trade_service.exchange_service") as mock_exchange, \
+             patch("app.services.trade_service.db") as mock_db, \
+             patch("app.services.trade_service.exchange_config") as mock_config, \
+             patch("app.services.trade_service.settings") as mock_settings:
+
+            mock_symbol_info = MagicMock()
+            mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
+            mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
+            mock_exchange.round_quantity = MagicMock(return_value=0.02)
+
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
+            mock_db.get_next_group_sequence = AsyncMock(return_value=1)
+            mock_db.create_trade_with_group = AsyncMock()
+            mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
+            mock_db.add_pyramid = AsyncMock()
+            mock_db.mark_alert_processed = AsyncMock()
+
+            mock_config.get_fee_rate = MagicMock(return_value=0.001)
+            mock_settings.validation_mode = "lenient"
+            mock_settings.max_pyramids = 5
+
+            result, data = await TradeService.process_signal(alert)
+
+        assert result.success is True
+        stored = mock_db.add_pyramid.call_args.kwargs["received_timestamp"]
+        assert stored == data.received_timestamp.isoformat()
+
 
 class TestProcessEntry:
     """Tests for TradeService._process_entry method."""
@@ -155,11 +243,12 @@ class TestProcessEntry:
             # Symbol info for precision
             mock_symbol_info = MagicMock()
             mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
             mock_exchange.round_quantity = MagicMock(side_effect=lambda q, p: round(q, p))
 
             # Database mocks
-            mock_db.get_open_trade_by_group = AsyncMock(return_value=None)
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
             mock_db.get_next_group_sequence = AsyncMock(return_value=1)
             mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
             mock_db.create_trade_with_group = AsyncMock()
@@ -205,6 +294,7 @@ class TestProcessEntry:
             mock_exchange.get_price = AsyncMock(return_value=mock_price)
 
             # Symbol info FAILS - this is the scenario we're testing
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(
                 side_effect=Exception("Exchange API unavailable")
             )
@@ -212,7 +302,7 @@ class TestProcessEntry:
             mock_exchange.round_quantity = MagicMock(return_value=0.02)
 
             # Mock database
-            mock_db.get_open_trade_by_group = AsyncMock(return_value=None)
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
             mock_db.get_next_group_sequence = AsyncMock(return_value=1)
             mock_db.create_trade_with_group = AsyncMock()
             mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
@@ -235,6 +325,86 @@ class TestProcessEntry:
         call_args = mock_exchange.round_quantity.call_args
         assert call_args[0][1] == 4  # Second arg is precision
 
+    @pytest.mark.asyncio
+    async def test_entry_uses_known_qty_precision(self):
+        """Test a remembered precision skips the exchange symbol info lookup."""
+        from app.services.trade_service import TradeService
+        from app.services.symbol_normalizer import ParsedSymbol
+
+        alert = create_test_alert()
+        parsed = ParsedSymbol(base="BTC", quote="USDT")
+
+        with patch("app.services.trade_service.exchange_service") as mock_exchange, \
+             patch("app.services.trade_service.db") as mock_db, \
+             patch("app.services.trade_service.exchange_config") as mock_config, \
+             patch("app.services.trade_service.settings") as mock_settings:
+
+            mock_config.get_qty_precision = MagicMock(return_value=6)
+            mock_config.is_qty_precision_stale = MagicMock(return_value=False)
+            mock_exchange.get_symbol_info = AsyncMock()
+            mock_exchange.round_quantity = MagicMock(return_value=0.02)
+
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
+            mock_db.get_next_group_sequence = AsyncMock(return_value=1)
+            mock_db.create_trade_with_group = AsyncMock()
+            mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
+            mock_db.add_pyramid = AsyncMock()
+            mock_db.mark_alert_processed = AsyncMock()
+
+            mock_config.get_fee_rate = MagicMock(return_value=0.001)
+            mock_settings.validation_mode = "lenient"
+            mock_settings.max_pyramids = 5
+
+            result, data = await TradeService._process_entry(
+                alert, "binance", parsed, datetime.now(UTC)
+            )
+
+        assert result.success is True
+        mock_exchange.get_symbol_info.assert_not_called()
+        assert mock_exchange.round_quantity.call_args[0][1] == 6
+
+    @pytest.mark.asyncio
+    async def test_entry_rejected_at_pyramid_limit(self):
+        """Test an entry past max_pyramids is rejected and reported."""
+        from app.services.trade_service import TradeService
+        from app.services.symbol_normalizer import ParsedSymbol
+
+        alert = create_test_alert()
+        parsed = ParsedSymbol(base="BTC", quote="USDT")
+
+        with patch("app.services.trade_service.exchange_service") as mock_exchange, \
+             patch("app.services.trade_service.db") as mock_db, \
+             patch("app.services.trade_service.exchange_config") as mock_config, \
+             patch("app.services.trade_service.error_notifier") as mock_notifier, \
+             patch("app.services.trade_service.settings") as mock_settings:
+
+            mock_config.get_qty_precision = MagicMock(return_value=4)
+            mock_config.is_qty_precision_stale = MagicMock(return_value=False)
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
+                "id": "trade_123",
+                "group_id": "BTC_Binance_1h_001",
+                "pyramid_count": 5,
+            })
+            mock_db.add_pyramid = AsyncMock()
+            mock_notifier.notify_pyramid_limit = AsyncMock()
+            mock_settings.max_pyramids = 5
+
+            result, data = await TradeService._process_entry(
+                alert, "binance", parsed, datetime.now(UTC)
+            )
+
+        assert result.success is False
+        assert result.error == "MAX_PYRAMIDS_REACHED"
+        assert data is None
+        mock_db.add_pyramid.assert_not_called()
+        mock_exchange.round_quantity.assert_not_called()
+        mock_notifier.notify_pyramid_limit.assert_awaited_once_with(
+            pair="BTC/USDT",
+            exchange="binance",
+            current_pyramids=5,
+            max_pyramids=5,
+        )
+
     @pytest.mark.asyncio
     async def test_new_trade_creation(self):
         """Test creating a new trade with first pyramid."""
@@ -257,11 +427,12 @@ class TestProcessEntry:
             # Mock symbol info
             mock_symbol_info = MagicMock()
             mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
             mock_exchange.round_quantity = MagicMock(return_value=0.02)
 
             # Mock database
-            mock_db.get_open_trade_by_group = AsyncMock(return_value=None)
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
             mock_db.get_next_group_sequence = AsyncMock(return_value=1)
             mock_db.create_trade_with_group = AsyncMock()
             mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
@@ -305,17 +476,16 @@ class TestProcessEntry:
             # Mock symbol info
             mock_symbol_info = MagicMock()
             mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
             mock_exchange.round_quantity = MagicMock(return_value=0.0204)
 
-            # Mock existing trade
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            # Mock existing trade with one pyramid
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_123",
-                "group_id": "BTC_Binance_1h_001"
+                "group_id": "BTC_Binance_1h_001",
+                "pyramid_count": 1,
             })
-            mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
-                {"id": "pyr_1", "pyramid_index": 0}
-            ])
             mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
             mock_db.add_pyramid = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -356,12 +526,13 @@ class TestProcessEntry:
             # Mock symbol info
             mock_symbol_info = MagicMock()
             mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
             mock_exchange.round_quantity = MagicMock(return_value=0.0001)
             mock_exchange.validate_order = AsyncMock(return_value=(False, "Below min notional"))
 
             # Mock database
-            mock_db.get_open_trade_by_group = AsyncMock(return_value=None)
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
             mock_db.get_next_group_sequence = AsyncMock(return_value=1)
             mock_db.create_trade_with_group = AsyncMock()
             mock_db.get_pyramid_capital = AsyncMock(return_value=1.0)  # Very small capital
@@ -392,7 +563,7 @@ class TestProcessExit:
         parsed = ParsedSymbol(base="BTC", quote="USDT")
 
         with patch("app.services.trade_service.db") as mock_db:
-            mock_db.get_open_trade_by_group = AsyncMock(return_value=None)
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
 
             result, data = await TradeService._process_exit(
                 alert, "binance", parsed, datetime.now(UTC)
@@ -412,9 +583,10 @@ class TestProcessExit:
         parsed = ParsedSymbol(base="BTC", quote="USDT")
 
         with patch("app.services.trade_service.db") as mock_db:
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_123",
-                "group_id": "BTC_Binance_1h_001"
+                "group_id": "BTC_Binance_1h_001",
+                "pyramid_count": 0
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[])
 
@@ -424,6 +596,7 @@ class TestProcessExit:
 
         assert result.success is False
         assert result.error == "NO_PYRAMIDS"
+        mock_db.get_pyramids_for_trade.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_successful_exit(self):
@@ -438,10 +611,11 @@ class TestProcessExit:
              patch("app.services.trade_service.exchange_config") as mock_config:
 
             # Mock database
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_123",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 2
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -463,7 +637,7 @@ class TestProcessExit:
                     "entry_time": "2026-01-20T11:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -494,10 +668,11 @@ class TestProcessExit:
         with patch("app.services.trade_service.db") as mock_db, \
              patch("app.services.trade_service.exchange_config") as mock_config:
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_123",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -510,7 +685,7 @@ class TestProcessExit:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock(return_value=True)
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -646,11 +821,12 @@ class TestProcessEntryEdgeCases:
             # Mock symbol info
             mock_symbol_info = MagicMock()
             mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
             mock_exchange.round_quantity = MagicMock(return_value=0)
 
             # Mock database - all async methods need AsyncMock
-            mock_db.get_open_trade_by_group = AsyncMock(return_value=None)
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value=None)
             mock_db.get_next_group_sequence = AsyncMock(return_value=1)
             mock_db.get_pyramid_capital = AsyncMock(return_value=0)
             mock_db.create_trade_with_group = AsyncMock()
@@ -692,10 +868,11 @@ class TestProcessExitEdgeCases:
             mock_exchange.get_price = AsyncMock(return_value=mock_price)
 
             # Mock database
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_123",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -708,7 +885,7 @@ class TestProcessExitEdgeCases:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -756,13 +933,14 @@ class TestProcessExitEdgeCases:
             mock_exchange.get_price = AsyncMock(return_value=mock_price)
 
             # Mock database
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_123",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 5
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=pyramids)
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -801,10 +979,11 @@ class TestPnLCalculationAccuracy:
         with patch("app.services.trade_service.db") as mock_db, \
              patch("app.services.trade_service.exchange_config") as mock_config:
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_pnl_test",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -817,7 +996,7 @@ class TestPnLCalculationAccuracy:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -862,10 +1041,11 @@ class TestPnLCalculationAccuracy:
         with patch("app.services.trade_service.db") as mock_db, \
              patch("app.services.trade_service.exchange_config") as mock_config:
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_loss_test",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -878,7 +1058,7 @@ class TestPnLCalculationAccuracy:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -918,10 +1098,11 @@ class TestPnLCalculationAccuracy:
         with patch("app.services.trade_service.db") as mock_db, \
              patch("app.services.trade_service.exchange_config") as mock_config:
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_multi",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 2
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -943,7 +1124,7 @@ class TestPnLCalculationAccuracy:
                     "entry_time": "2026-01-20T11:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -982,10 +1163,11 @@ class TestPnLCalculationAccuracy:
         with patch("app.services.trade_service.db") as mock_db, \
              patch("app.services.trade_service.exchange_config") as mock_config:
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_pct",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -998,7 +1180,7 @@ class TestPnLCalculationAccuracy:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -1036,10 +1218,11 @@ class TestBoundaryConditions:
             mock_price.price = 50000.0
             mock_exchange.get_price = AsyncMock(return_value=mock_price)
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_small",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             # Very small position - 0.00001 BTC = $0.50 at $50k
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
@@ -1053,7 +1236,7 @@ class TestBoundaryConditions:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -1085,10 +1268,11 @@ class TestBoundaryConditions:
             mock_price.price = 50000.0  # Same as entry
             mock_exchange.get_price = AsyncMock(return_value=mock_price)
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_breakeven",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -1101,7 +1285,7 @@ class TestBoundaryConditions:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -1129,10 +1313,11 @@ class TestBoundaryConditions:
         with patch("app.services.trade_service.db") as mock_db, \
              patch("app.services.trade_service.exchange_config") as mock_config:
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_moon",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -1145,7 +1330,7 @@ class TestBoundaryConditions:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -1178,10 +1363,11 @@ class TestBoundaryConditions:
             mock_price.price = 52000.0
             mock_exchange.get_price = AsyncMock(return_value=mock_price)
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_nofee",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -1194,7 +1380,7 @@ class TestBoundaryConditions:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             mock_db.add_exit = AsyncMock()
             mock_db.close_trade = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -1274,7 +1460,6 @@ class TestRaceConditionHandling:
 
         Bug prevented: Duplicate trade creation fails with IntegrityError.
         """
-        import sqlite3
         from app.services.trade_service import TradeService
         from app.services.symbol_normalizer import ParsedSymbol
 
@@ -1294,25 +1479,25 @@ class TestRaceConditionHandling:
             # Mock symbol info
             mock_symbol_info = MagicMock()
             mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
             mock_exchange.round_quantity = MagicMock(return_value=0.02)
 
             # First call: no trade exists
-            # create_trade_with_group raises IntegrityError (race condition)
+            # create_trade_with_group reports a conflict (race condition)
             # Second call: trade now exists
-            mock_db.get_open_trade_by_group = AsyncMock(
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(
                 side_effect=[
                     None,  # First check: no trade
-                    {"id": "race_trade", "group_id": "BTC_Binance_1h_001"}  # After race
+                    {  # After race
+                        "id": "race_trade",
+                        "group_id": "BTC_Binance_1h_001",
+                        "pyramid_count": 1,
+                    },
                 ]
             )
             mock_db.get_next_group_sequence = AsyncMock(return_value=1)
-            mock_db.create_trade_with_group = AsyncMock(
-                side_effect=sqlite3.IntegrityError("UNIQUE constraint failed")
-            )
-            mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
-                {"id": "pyr_existing", "pyramid_index": 0}
-            ])
+            mock_db.create_trade_with_group = AsyncMock(return_value=False)
             mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
             mock_db.add_pyramid = AsyncMock()
             mock_db.mark_alert_processed = AsyncMock()
@@ -1338,7 +1523,6 @@ class TestRaceConditionHandling:
 
         Bug prevented: Silent failure when race condition causes data loss.
         """
-        import sqlite3
         from app.services.trade_service import TradeService
         from app.services.symbol_normalizer import ParsedSymbol
 
@@ -1356,17 +1540,16 @@ class TestRaceConditionHandling:
 
             mock_symbol_info = MagicMock()
             mock_symbol_info.qty_precision = 4
+            mock_config.get_qty_precision = MagicMock(return_value=None)
             mock_exchange.get_symbol_info = AsyncMock(return_value=mock_symbol_info)
             mock_exchange.round_quantity = MagicMock(return_value=0.02)
 
             # Race condition: trade created and closed before we can add pyramid
-            mock_db.get_open_trade_by_group = AsyncMock(
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(
                 side_effect=[None, None]  # No trade even after race
             )
             mock_db.get_next_group_sequence = AsyncMock(return_value=1)
-            mock_db.create_trade_with_group = AsyncMock(
-                side_effect=sqlite3.IntegrityError("UNIQUE constraint failed")
-            )
+            mock_db.create_trade_with_group = AsyncMock(return_value=False)
             mock_db.get_pyramid_capital = AsyncMock(return_value=1000.0)
 
             mock_config.get_fee_rate = MagicMock(return_value=0.001)
@@ -1402,10 +1585,11 @@ class TestRaceConditionHandling:
             mock_price.price = 52000.0
             mock_exchange.get_price = AsyncMock(return_value=mock_price)
 
-            mock_db.get_open_trade_by_group = AsyncMock(return_value={
+            mock_db.get_open_trade_with_pyramid_count = AsyncMock(return_value={
                 "id": "trade_123",
                 "group_id": "BTC_Binance_1h_001",
-                "timeframe": "1h"
+                "timeframe": "1h",
+                "pyramid_count": 1
             })
             mock_db.get_pyramids_for_trade = AsyncMock(return_value=[
                 {
@@ -1418,7 +1602,7 @@ class TestRaceConditionHandling:
                     "entry_time": "2026-01-20T10:00:00"
                 }
             ])
-            mock_db.update_pyramid_pnl = AsyncMock()
+            mock_db.update_pyramid_pnl_bulk = AsyncMock()
             # add_exit returns False = exit already exists (race condition)
             mock_db.add_exit = AsyncMock(return_value=False)
             mock_config.get_fee_rate = MagicMock(return_value=0.001)
@@ -1431,3 +1615,5 @@ class TestRaceConditionHandling:
         assert result.success is True
         assert "already closed" in result.message.lower()
         assert data is None
+        # Duplicate exit must not overwrite the recorded pyramid PnLs
+        mock_db.update_pyramid_pnl_bulk.assert_not_called()